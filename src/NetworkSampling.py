@@ -1,26 +1,36 @@
 
 from __future__ import annotations
-from littleballoffur.exploration_sampling import (RandomWalkSampler,
-                                                commonneighborawarerandomwalksampler,
-                                                SnowBallSampler,
-                                                CommunityStructureExpansionSampler,
-                                                FrontierSampler)
+import collections
 import copy
 from inspect import signature
 import itertools
-from joblib import Parallel, delayed
-import matplotlib.pyplot as plt
+import json
 import multiprocessing as mp
 import networkx as nx
 import numpy as np
 import os
-import param
-import pandas as pd
+import random
+import re
+import sys
+import time
+import tracemalloc
 # import pdb
 # pdb.disable()
 
-from tqdm import tqdm
 from typing import *
+import weakref
+
+# Heavy dependencies (pandas, tqdm, scipy.stats, littleballoffur and the Gaussian process optimizer) are imported on first use, so
+# importing NSMethod / NetworkSampler, eg. in pool workers and in NetworkSamplingFunctions, stays cheap; see
+# NetworkSamplingBenchmarks.import_cost for the budget.
+if TYPE_CHECKING:
+    import pandas as pd
+
+from NetworkSamplingCSR import CSRGraph
+from NetworkSamplingFingerprint import graph_features, graph_fingerprint, load_parent_statistics, parent_statistics
+from NetworkSamplingIncremental import incremental_scorer
+from NetworkSamplingQueue import DirectoryJobQueue, JobQueue, open_queue, run_worker
+from NetworkSamplingRelabel import relabel_index
 
 # NS = Network Sampling
 #region
@@ -44,6 +54,171 @@ class NSMethod(NamedTuple):
         return f'<NSMethod: func={repr(self.func)}, params={repr(self.params)}>'
 #endregion
 
+#region
+class SamplerAdapter(NamedTuple):
+    """
+    Calling convention of a sampler class, resolved once per class so that every trial dispatches straight to the
+    sampler's 'sample' method.
+
+    Args:
+        kind (str): 'littleballoffur' for littleballoffur samplers, which need an nx.Graph, or 'custom' for samplers such
+            as those in NetworkSamplingFunctions.py, which also accept CSRGraph and other duck-typed graphs
+        takes_start_node (bool): Whether the 'sample' method has a 'start_node' parameter
+        contiguous_ids (bool, optional): Whether the sampler needs nodes labeled 0..n-1; other graphs are then sampled
+            through their cached RelabelIndex and samples are returned with the original node ids. Defaults to False.
+        iterates (bool, optional): Whether the sampler has an anytime 'iter_sample' method yielding nodes in visit order. Defaults to False.
+    """
+    kind: str
+    takes_start_node: bool
+    contiguous_ids: bool = False
+    iterates: bool = False
+
+    def __repr__(self):
+        """
+        Representation of SamplerAdapter object.
+
+        Returns:
+            str: Representation of SamplerAdapter object.
+        """
+        return f'<SamplerAdapter: kind={self.kind}, takes_start_node={self.takes_start_node}, contiguous_ids={self.contiguous_ids}, iterates={self.iterates}>'
+
+    def __call__(self, sampler: Any, graph: nx.Graph, start_node: int=None) -> nx.Graph:
+        """
+        Samples graph with sampler using this calling convention.
+
+        Args:
+            sampler (Any): Sampler instance of the class this adapter was resolved for
+            graph (nx.Graph): Network to sample from
+            start_node (int, optional): Node where sampling starts to spread. Defaults to None.
+
+        Returns:
+            nx.Graph: Sampled network.
+        """
+        index = relabel_index(graph=graph) if self.contiguous_ids else None
+        if index is not None and not index.is_identity:
+            graph = index.csr(graph=graph)
+            start_node = None if start_node is None else index.to_int(nodes=start_node)
+        if self.kind == 'littleballoffur' and not isinstance(graph, nx.Graph):
+            graph = _networkx_view(graph=graph)
+
+        if self.takes_start_node:
+            sample = sampler.sample(graph=graph, start_node=start_node)
+        else:
+            sample = sampler.sample(graph=graph)
+        return sample if index is None else index.relabel_sample(sample=sample)
+
+    def iterate(self, sampler: Any, graph: nx.Graph, start_node: int=None, batch: bool=False) -> Iterator[Union[Any, List[Any]]]:
+        """
+        Nodes of a sample in visit order through the sampler's 'iter_sample' method. Samplers without one are sampled in full and their
+        nodes yielded afterwards.
+
+        Args:
+            sampler (Any): Sampler instance of the class this adapter was resolved for
+            graph (nx.Graph): Network to sample from
+            start_node (int, optional): Node where sampling starts to spread. Defaults to None.
+            batch (bool, optional): Yield lists of nodes as produced by the sampler instead of single nodes. Defaults to False.
+
+        Yields:
+            Union[Any, List[Any]]: Node, or list of nodes, with the original node ids of graph
+        """
+        if not self.iterates:
+            nodes = list(self(sampler=sampler, graph=graph, start_node=start_node).nodes)
+            if batch:
+                yield nodes
+            else:
+                yield from nodes
+            return
+
+        index = relabel_index(graph=graph) if self.contiguous_ids else None
+        if index is not None and index.is_identity:
+            index = None
+        if index is not None:
+            graph = index.csr(graph=graph)
+            start_node = None if start_node is None else index.to_int(nodes=start_node)
+
+        params = {'graph': graph, 'batch': batch}
+        if self.takes_start_node:
+            params['start_node'] = start_node
+        for item in sampler.iter_sample(**params):
+            if index is None:
+                yield item
+            elif batch:
+                yield index.to_ids(labels=item).tolist()
+            else:
+                yield index.to_ids(labels=item)
+
+# sampler class -> SamplerAdapter
+_sampler_adapters: Dict[type, SamplerAdapter] = dict()
+# non-networkx graph -> its networkx copy for littleballoffur samplers, dropped once the graph is garbage collected
+_networkx_views = weakref.WeakKeyDictionary()
+
+def _networkx_view(graph: Any) -> nx.Graph:
+    """
+    networkx copy of a CSRGraph (or any graph with 'to_networkx'), built once per graph.
+    """
+    if graph not in _networkx_views:
+        if not hasattr(graph, 'to_networkx'):
+            raise TypeError(f'littleballoffur samplers need an nx.Graph and {type(graph).__name__} has no \'to_networkx\' method')
+        _networkx_views[graph] = graph.to_networkx()
+    return _networkx_views[graph]
+
+def register_sampler_adapter(sampler_class: type, adapter: SamplerAdapter=None) -> SamplerAdapter:
+    """
+    Registers the calling convention of a sampler class, resolving it from the signature of its 'sample' method if
+    adapter is None. Custom sampler classes needing nodes labeled 0..n-1 declare it with a class attribute
+    'contiguous_ids = True'. Later lookups for instances of the class reuse the adapter.
+
+    Args:
+        sampler_class (type): Sampler class
+        adapter (SamplerAdapter, optional): Calling convention to use. Defaults to None.
+
+    Raises:
+        ValueError: sampler_class does not have a 'sample' callable or its 'sample' method lacks a 'graph' parameter
+
+    Returns:
+        SamplerAdapter: Registered adapter
+    """
+    if adapter is None:
+        if not callable(getattr(sampler_class, 'sample', None)):
+            raise ValueError(f'Sampler class {sampler_class.__name__} does not have a \'sample\' callable')
+        parameters = signature(sampler_class.sample).parameters
+        if 'graph' not in parameters:
+            raise ValueError(f'\'graph\' is not a parameter in \'sample\' method of {sampler_class.__name__}')
+        littleballoffur = _is_littleballoffur(sampler_class=sampler_class)
+        adapter = SamplerAdapter(kind='littleballoffur' if littleballoffur else 'custom',
+                                takes_start_node='start_node' in parameters,
+                                contiguous_ids=littleballoffur or getattr(sampler_class, 'contiguous_ids', False),
+                                iterates=callable(getattr(sampler_class, 'iter_sample', None)))
+
+    _sampler_adapters[sampler_class] = adapter
+
+    if __debug__:
+        print(f'register_sampler_adapter: {sampler_class.__name__} -> {repr(adapter)}')
+
+    return adapter
+
+def _is_littleballoffur(sampler_class: type) -> bool:
+    """
+    Whether sampler_class subclasses littleballoffur's Sampler, without importing littleballoffur: a subclass can only exist once
+    littleballoffur.sampler has been imported by whoever defined it.
+    """
+    module = sys.modules.get('littleballoffur.sampler')
+    return module is not None and issubclass(sampler_class, module.Sampler)
+
+def sampler_adapter(sampler: Any) -> SamplerAdapter:
+    """
+    Cached calling convention of a sampler instance's class.
+
+    Args:
+        sampler (Any): Sampler instance
+
+    Returns:
+        SamplerAdapter: Adapter of the sampler's class
+    """
+    adapter = _sampler_adapters.get(type(sampler))
+    return register_sampler_adapter(sampler_class=type(sampler)) if adapter is None else adapter
+#endregion
+
 #region
 class NetworkSampler:
     """Light-weight, high-level framework used to sample networks with a given algorithm and evalutate the sample according to a given metric."""
@@ -66,6 +241,7 @@ class NetworkSampler:
         self.sampler = sampler
         self.scorer = scorer
         self.prev_sample = None
+        self._adapter = sampler_adapter(sampler=sampler)
 
         # if __debug__:
         print('-' * 20)
@@ -106,14 +282,12 @@ class NetworkSampler:
         """
         if not hasattr(new_sampler, 'sample'):
             raise ValueError('Sampler object must have \'sample\' method.')
-        _sample = getattr(new_sampler, 'sample')
-        sig = signature(_sample)
-        if 'graph' not in sig.parameters:
-            raise ValueError('\'graph\' is not a parameter in \'sample\' method of new sampler')
-        if 'start_node' not in sig.parameters:
+        adapter = sampler_adapter(sampler=new_sampler)
+        if not adapter.takes_start_node:
             raise ValueError('\'start_node\' is not a parameter in \'sample\' method of new sampler')
 
         self.sampler = new_sampler
+        self._adapter = adapter
 
     def set_scorer(self, new_scorer: NSMethod):
         """
@@ -140,7 +314,9 @@ class NetworkSampler:
     # MUTATORS
     def sample(self, graph: nx.Graph, start_node: int=None) -> nx.Graph:
         """
-        Extracts subgraph from network by applying given sampling algorithm and parameters if provided.
+        Extracts subgraph from network by applying given sampling algorithm and parameters if provided. The sampler's
+        calling convention is resolved once per sampler class (see sampler_adapter), so repeated trials skip signature
+        inspection.
 
         Args:
             graph (nx.Graph): Original graph or network to sample from
@@ -149,32 +325,30 @@ class NetworkSampler:
         Returns:
             nx.Graph: Sampled network.
         """
-        print(f'<sample: graph={repr(graph)}, start_node={start_node}>')
-
-        # pdb.set_trace(header='NetworkSampler - sample - Entering sample')
         if __debug__:
-            print('sampler attributes:\n')
-            print(dir(self.sampler))
+            print(f'<sample: graph={repr(graph)}, start_node={start_node}, adapter={repr(self._adapter)}>')
 
-        _sample = getattr(self.sampler, 'sample')
-        if __debug__:
-            print('_sample attributes:\n')
-            print(dir(_sample))
-            sig = signature(_sample)
-            print(f'_sample signature: {sig}')
-            print(f'_sample parameters: {sig.parameters}')
-            print(f'_sample_return_annotation: {sig.return_annotation}')
+        self.prev_sample = self._adapter(sampler=self.sampler, graph=graph, start_node=start_node)
+        return self.prev_sample
 
-        sample_params = dict({'graph': graph})
+    def iter_sample(self, graph: nx.Graph, start_node: int=None, batch: bool=False) -> Iterator[Union[Any, List[Any]]]:
+        """
+        Anytime sampling: yields nodes (or batches of nodes) in the order the sampler visits them, without building the sample subgraph.
+        Callers may stop at any point, score prefixes or pass nodes straight on to downstream consumers. Samplers without an
+        'iter_sample' method (eg. littleballoffur samplers) are sampled in full first. prev_sample is not updated.
 
-        if 'start_node' in signature(self.sampler.sample).parameters:
-            sample_params['start_node'] = start_node
+        Args:
+            graph (nx.Graph): Original graph or network to sample from
+            start_node (int, optional): Node where sampling starts to spread. Defaults to None.
+            batch (bool, optional): Yield lists of nodes, one per layer / step of the sampler, instead of single nodes. Defaults to False.
 
+        Yields:
+            Union[Any, List[Any]]: Visited node, or list of visited nodes
+        """
         if __debug__:
-            print(f'sample_params: {sample_params}')
+            print(f'<iter_sample: graph={repr(graph)}, start_node={start_node}, batch={batch}, adapter={repr(self._adapter)}>')
 
-        self.prev_sample = self.sampler.sample(**sample_params)
-        return self.prev_sample
+        yield from self._adapter.iterate(sampler=self.sampler, graph=graph, start_node=start_node, batch=batch)
 
     def score(self):
         """Evaluates the sample network by the provided metric. Calling the 'sample' method must be done first before calling 'score'.
@@ -203,11 +377,11 @@ class NetworkSampler:
             start_node (int, optional): Node where sampling starts to spread. Defaults to None.
 
         Returns:
-            Tuple[float, nx.Graph]: Tuple of score and corresponding sample of network.
+            Tuple[nx.Graph, float]: Tuple of sample of network and its score.
         """
         # pdb.set_trace(header='NetworkSampler - sample_and_score - Entering sample_and_score')
-        sample_result = self.sampler.sample(graph=graph, start_node=start_node)
-        score_result = score()
+        sample_result = self.sample(graph=graph, start_node=start_node)
+        score_result = self.score()
 
         if __debug__:
             print(f'sample_result: {sample_result}')
@@ -219,14 +393,23 @@ class NetworkSampler:
 #region
 class TunedNetworkSampler(NamedTuple):
     """
-    Network sampler with parameter values specifically tuned for a network and scorer metric.
+    Parameter values of a sampler class tuned for a network and scorer metric. Only the names, values and a fingerprint of the network are
+    kept, so records are small, JSON-serializable and hold no reference to the network or sampler instance.
 
     Args:
-        ns [NetworkSampler]: NetworkSapler object that is tuned.
-        graph [nx.Graph]: Network 'ns' is tuned on.
+        sampler_class [str]: Import path of sampler class, eg. 'NetworkSamplingFunctions.CaterpillarQuotaWalkSampler'
+        params [Dict[str, Any]]: Best parameter values found while tuning
+        score [float]: Mean score of the best parameter values
+        graph_fingerprint [str]: graph_fingerprint() of network the sampler was tuned on
+        scorer [str]: scorer_key() of scoring metric the sampler was tuned for
+        graph_features [List[float]]: graph_features() of network, used to warm-start tuning on similar networks. Defaults to None.
     """
-    ns: NetworkSampler
-    graph: nx.Graph
+    sampler_class: str
+    params: Dict[str, Any]
+    score: float
+    graph_fingerprint: str
+    scorer: str
+    graph_features: List[float] = None
 
     def __repr__(self):
         """
@@ -235,9 +418,255 @@ class TunedNetworkSampler(NamedTuple):
         Returns:
             str: Representation of TunedNetworkSampler object.
         """
-        return f'<TunedNetworkSampler: ns={repr(ns)}, graph={repr(graph)}>'
+        return f'<TunedNetworkSampler: sampler_class={self.sampler_class}, params={self.params}, score={self.score}, graph_fingerprint={self.graph_fingerprint[:12]}, scorer={self.scorer}>'
+
+    def apply(self, sampler: Any) -> Any:
+        """
+        Sets the tuned parameter values on a sampler instance, the same way NetworkSamplerTuner does while tuning.
+
+        Args:
+            sampler (Any): Sampler instance of sampler_class
+
+        Raises:
+            TypeError: sampler is not an instance of sampler_class
+
+        Returns:
+            Any: The same sampler instance
+        """
+        if sampler_class_name(sampler_class=type(sampler)) != self.sampler_class:
+            raise TypeError(f'Sampler of class {type(sampler).__name__} cannot take parameters tuned for {self.sampler_class}')
+        sampler.__dict__.update(self.params)
+        return sampler
+
+def sampler_class_name(sampler_class: type) -> str:
+    """
+    Import path of a sampler class, as stored in TunedNetworkSampler.
+
+    Args:
+        sampler_class (type): Sampler class
+
+    Returns:
+        str: '<module>.<qualified name>'
+    """
+    return f'{sampler_class.__module__}.{sampler_class.__qualname__}'
+
+def scorer_key(scorer: NSMethod) -> str:
+    """
+    Stable identifier of a scoring metric across runs: import path of its function and its parameter values, with graph-valued
+    parameters (eg. 'parent') replaced by their fingerprint.
+
+    Args:
+        scorer (NSMethod): Scoring metric
+
+    Returns:
+        str: Identifier of scorer
+    """
+    def _param(value: Any) -> Any:
+        if isinstance(value, (nx.Graph, CSRGraph)):
+            return f'graph:{graph_fingerprint(graph=value)}'
+        return value
+
+    params = json.dumps(obj={k: _param(v) for k, v in scorer.params.items()}, sort_keys=True, default=repr)
+    return f'{getattr(scorer.func, "__module__", None)}.{getattr(scorer.func, "__qualname__", repr(scorer.func))}{params}'
+
+def _scorer_family(key: str) -> str:
+    """
+    scorer_key() with graph fingerprints blanked out, so the same metric computed against different parent networks compares equal.
+    """
+    return re.sub(pattern=r'graph:[0-9a-f]+', repl='graph', string=key)
+
+def _to_builtin(value: Any) -> Any:
+    """
+    Converts numpy scalars and arrays in tuned values to JSON-serializable builtins.
+    """
+    if isinstance(value, np.generic):
+        return value.item()
+    elif isinstance(value, np.ndarray):
+        return value.tolist()
+    return value
+
+class TunedSamplerRegistry:
+    """
+    Registry of TunedNetworkSampler records keyed by (sampler class, graph fingerprint, scorer), stored as a small JSON file. Tuning
+    results survive across runs and are looked up by network content, so a network is never re-tuned and no network or sampler copy is
+    kept alive to remember its tuning.
+    """
+    def __init__(self, path: str=None):
+        """
+        Initializes a registry, loading existing records from path if the file exists.
+
+        Args:
+            path (str, optional): JSON file to load from and save to; in-memory only if None. Defaults to None.
+        """
+        self.path = path
+        self.records: Dict[Tuple[str, str, str], TunedNetworkSampler] = dict()
+
+        if path is not None and os.path.exists(path=path):
+            with open(file=path, mode='r') as f:
+                for record in json.load(fp=f):
+                    tuned = TunedNetworkSampler(**record)
+                    self.records[(tuned.sampler_class, tuned.graph_fingerprint, tuned.scorer)] = tuned
+
+        if __debug__:
+            print(f'TunedSamplerRegistry: loaded {len(self.records)} records from {path}')
+
+    def __repr__(self):
+        """
+        Representation of TunedSamplerRegistry object.
+
+        Returns:
+            str: Representation of TunedSamplerRegistry object.
+        """
+        return f'<TunedSamplerRegistry: path={self.path}, number_of_records={len(self.records)}>'
+
+    def __len__(self):
+        """
+        Number of records.
+
+        Returns:
+            int: Number of records
+        """
+        return len(self.records)
+
+    def get(self, sampler: Any, graph: nx.Graph, scorer: NSMethod) -> Optional[TunedNetworkSampler]:
+        """
+        Tuning record of a sampler's class on a network for a scorer, if any.
+
+        Args:
+            sampler (Any): Sampler instance or class
+            graph (nx.Graph): Network
+            scorer (NSMethod): Scoring metric
+
+        Returns:
+            Optional[TunedNetworkSampler]: Record, or None if this combination was never tuned
+        """
+        sampler_class = sampler if isinstance(sampler, type) else type(sampler)
+        return self.records.get((sampler_class_name(sampler_class=sampler_class), graph_fingerprint(graph=graph), scorer_key(scorer=scorer)))
+
+    def put(self, sampler: Any, graph: nx.Graph, scorer: NSMethod, params: Dict[str, Any], score: float) -> TunedNetworkSampler:
+        """
+        Records tuned parameter values, replacing any earlier record of the same combination, and saves the registry if it has a path.
+
+        Args:
+            sampler (Any): Sampler instance or class
+            graph (nx.Graph): Network tuned on
+            scorer (NSMethod): Scoring metric tuned for
+            params (Dict[str, Any]): Best parameter values
+            score (float): Mean score of the best parameter values
+
+        Returns:
+            TunedNetworkSampler: New record
+        """
+        sampler_class = sampler if isinstance(sampler, type) else type(sampler)
+        tuned = TunedNetworkSampler(sampler_class=sampler_class_name(sampler_class=sampler_class),
+                                    params={k: _to_builtin(value=v) for k, v in params.items()},
+                                    score=float(score),
+                                    graph_fingerprint=graph_fingerprint(graph=graph),
+                                    scorer=scorer_key(scorer=scorer),
+                                    graph_features=graph_features(graph=graph).tolist())
+        self.records[(tuned.sampler_class, tuned.graph_fingerprint, tuned.scorer)] = tuned
+        if self.path is not None:
+            self.save()
+        return tuned
+
+    def similar(self, sampler: Any, graph: nx.Graph, scorer: NSMethod, k: int=3, max_distance: float=1.0) -> List[TunedNetworkSampler]:
+        """
+        Records of the same sampler class and scoring metric on the networks most similar to graph by graph_features(), nearest first.
+        Scorers match regardless of which parent network a graph-valued parameter refers to.
+
+        Args:
+            sampler (Any): Sampler instance or class
+            graph (nx.Graph): Network about to be tuned
+            scorer (NSMethod): Scoring metric
+            k (int, optional): Maximum number of records. Defaults to 3.
+            max_distance (float, optional): Largest Euclidean feature distance of a returned record. Defaults to 1.0.
+
+        Returns:
+            List[TunedNetworkSampler]: Up to k records
+        """
+        sampler_class = sampler_class_name(sampler_class=sampler if isinstance(sampler, type) else type(sampler))
+        family = _scorer_family(key=scorer_key(scorer=scorer))
+        features = graph_features(graph=graph)
+
+        candidates = [tuned for tuned in self.records.values()
+                        if tuned.sampler_class == sampler_class and tuned.graph_features is not None and _scorer_family(key=tuned.scorer) == family]
+        if len(candidates) == 0:
+            return list()
+        distances = np.linalg.norm(np.asarray(a=[tuned.graph_features for tuned in candidates]) - features, axis=1)
+        order = [idx for idx in np.argsort(distances, kind='stable')[:k] if distances[idx] <= max_distance]
+
+        if __debug__:
+            print(f'similar: distances={distances[order]}')
+
+        return [candidates[idx] for idx in order]
+
+    def save(self, path: str=None):
+        """
+        Writes all records to a JSON file, replacing it atomically.
+
+        Args:
+            path (str, optional): Output file; self.path if None. Defaults to None.
+
+        Raises:
+            ValueError: Neither path nor self.path is set
+        """
+        path = self.path if path is None else path
+        if path is None:
+            raise ValueError('No path given to save TunedSamplerRegistry to')
+
+        os.makedirs(name=os.path.dirname(path) or '.', exist_ok=True)
+        tmp_path = f'{path}.tmp'
+        with open(file=tmp_path, mode='w') as f:
+            json.dump(obj=[tuned._asdict() for tuned in self.records.values()], fp=f, indent=1)
+        os.replace(tmp_path, path)
 #endregion
 
+def narrow_param_values(param_values: Union[Iterable[Any], Tuple[float, float]],
+                        priors: Iterable[Any],
+                        shrink: float=0.25,
+                        int_only: bool=False) -> Union[List[Any], Tuple[float, float]]:
+    """
+    Narrows a tuning search region around best values found on similar networks.
+
+    A bounded interval (2-element tuple) becomes an interval spanning the priors, which are first clipped to the original bounds, widened on
+    each side by shrink times the original width and clipped to the original bounds. A discrete list keeps the values nearest to each prior
+    together with their immediate neighbours in sorted order; for non-numeric values only the priors found in the list are kept. The original
+    values are returned if nothing matches.
+
+    Args:
+        param_values (Union[Iterable[Any], Tuple[float, float]]): Discrete values or bounded interval, as taken by tune_single
+        priors (Iterable[Any]): Best values found on similar networks
+        shrink (float, optional): Margin around the priors as a fraction of the original interval width. Defaults to 0.25.
+        int_only (bool, optional): Whether interval bounds must be integers. Defaults to False.
+
+    Returns:
+        Union[List[Any], Tuple[float, float]]: Narrowed values or interval
+    """
+    priors = [prior for prior in priors if prior is not None]
+    if len(priors) == 0:
+        return param_values
+
+    if type(param_values) == tuple:
+        lower_bound, upper_bound = param_values
+        margin = shrink * (upper_bound - lower_bound)
+        priors = [min([max([prior, lower_bound]), upper_bound]) for prior in priors]  # priors tuned under other bounds must not invert the interval
+        lower, upper = max([lower_bound, min(priors) - margin]), min([upper_bound, max(priors) + margin])
+        if int_only:
+            lower, upper = int(np.floor(lower)), int(np.ceil(upper))
+        return (lower, upper)
+
+    values = list(param_values)
+    if not all(isinstance(v, (int, float, np.number)) for v in values + priors):
+        kept = [v for v in values if v in priors]
+        return kept if len(kept) > 0 else values
+
+    ordered = sorted(values)
+    keep = set()
+    for prior in priors:
+        nearest = int(np.argmin(np.abs(np.asarray(a=ordered, dtype=np.float64) - prior)))
+        keep.update(range(max([nearest - 1, 0]), min([nearest + 2, len(ordered)])))
+    return [ordered[idx] for idx in sorted(keep)]
+
 def _rescore(ns: NetworkSampler, graph: nx.Graph, start_node: int=None):
     """
     Helper function does a re-sampling followed by an immediate re-scoring is completed.
@@ -250,8 +679,54 @@ def _rescore(ns: NetworkSampler, graph: nx.Graph, start_node: int=None):
     if __debug__:
         print(f'<_rescore: ns={repr(ns)}, graph={repr(graph)}, start_node={start_node}>')
 
-    ns.sample(graph, start_node)
-    return ns.score()
+    return ns.sample_and_score(graph=graph, start_node=start_node)[1]
+
+def _timed_rescore(ns: NetworkSampler,
+                    graph: nx.Graph,
+                    start_node: int=None,
+                    trace_memory: bool=True,
+                    statistics: Dict[Tuple[str, str, Hashable], Any]=None) -> Tuple[Any, Dict[str, float]]:
+    """
+    Helper function like _rescore that also measures the cost of the trial: wall time of sampling and of scoring, peak memory
+    allocated while sampling and scoring (as seen by tracemalloc, so memory-mapped pages are not counted) and nodes sampled per second.
+    Tracing memory slows allocation-heavy code down, which is included in the measured times.
+
+    Args:
+        ns (NetworkSampler): Network sampler to use
+        graph (nx.Graph): Network to sample from
+        start_node (int, optional): Starting node. Defaults to None.
+        trace_memory (bool, optional): Whether to trace peak memory; NaN is recorded if False. Defaults to True.
+        statistics (Dict[Tuple[str, str, Hashable], Any], optional): Parent statistics computed by the dispatching process, as returned by
+            NetworkSamplingFingerprint.parent_statistics. Defaults to None.
+
+    Returns:
+        Tuple[Any, Dict[str, float]]: Score; cost per column of NetworkSamplerGrid.COST_COLUMNS except tuning time
+    """
+    if statistics is not None:
+        load_parent_statistics(statistics=statistics)
+
+    started_tracing = trace_memory and not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    if trace_memory:
+        tracemalloc.reset_peak()
+        baseline = tracemalloc.get_traced_memory()[0]
+
+    sample_start = time.perf_counter()
+    sample = ns.sample(graph=graph, start_node=start_node)
+    score_start = time.perf_counter()
+    score = ns.score()
+    score_end = time.perf_counter()
+
+    peak = (tracemalloc.get_traced_memory()[1] - baseline) / 2 ** 20 if trace_memory else np.nan
+    if started_tracing:
+        tracemalloc.stop()
+
+    sample_time = score_start - sample_start
+    return score, {'Sample Time (s)': sample_time,
+                    'Score Time (s)': score_end - score_start,
+                    'Peak Memory (MB)': peak,
+                    'Nodes per Second': sample.number_of_nodes() / sample_time if sample_time > 0 else np.nan}
 
 #region
 class NetworkSamplerTuner:
@@ -259,7 +734,7 @@ class NetworkSamplerTuner:
     Takes a given NetworkSampler object and tunes chosen parameters. Each set of parameter values for testing can either be a bounded interval,
     which undergoes the bisection method, or a select iterable of test values to scan across.
     """
-    def __init__(self, nssampler: NetworkSampler, graph: nx.Graph, start_node: int):
+    def __init__(self, nssampler: NetworkSampler, graph: nx.Graph, start_node: int, registry: TunedSamplerRegistry=None):
         """
         Initializes a parameter tuning framework to test on a given netowrk and start node.
 
@@ -267,11 +742,14 @@ class NetworkSamplerTuner:
             nssampler (NetworkSampler): NetworkSampler object to tune
             graph (nx.Graph): Network to test on; this should be the same network intended to sample from
             start_node (int): Node where sampling starts to spread
+            registry (TunedSamplerRegistry, optional): Earlier tuning results used to warm-start tuning. Defaults to None.
         """
 
         self.nssampler = nssampler
         self.graph = graph
         self.start_node = start_node
+        self.registry = registry
+        self.best_score = None  # mean score of the parameter values returned by the last tune_single / tune_multiple call
 
         # if __debug__:
         print('-' * 20)
@@ -296,13 +774,39 @@ class NetworkSamplerTuner:
         """
         return f'<NetworkSamplerTuner: nssampler={repr(self.nssampler)}, graph={repr(self.graph)}, start_node={repr(self.start_node)}>'
 
+    def warm_start_values(self, param_name: str, param_values: Union[Iterable[float], Tuple[float, float]], int_only: bool=False, k: int=3):
+        """
+        Narrows the search region of a parameter around its best values on the k most similar networks in the registry, tuned with the same
+        sampler class and scorer. The region is returned unchanged if there is no registry or no similar network.
+
+        Args:
+            param_name (str): Name of parameter to tune
+            param_values (Union[Iterable[float], Tuple[float, float]]): Discrete values or bounded interval
+            int_only (bool, optional): Whether only integer values are accepted for the parameter. Defaults to False.
+            k (int, optional): Number of similar networks to draw priors from. Defaults to 3.
+
+        Returns:
+            Union[List[float], Tuple[float, float]]: Narrowed values or interval
+        """
+        if self.registry is None:
+            return param_values
+
+        similar = self.registry.similar(sampler=self.nssampler.sampler, graph=self.graph, scorer=self.nssampler.scorer, k=k)
+        narrowed = narrow_param_values(param_values=param_values, priors=[tuned.params.get(param_name) for tuned in similar], int_only=int_only)
+
+        if __debug__:
+            print(f'warm_start_values: {param_name} {param_values} -> {narrowed} from {len(similar)} similar networks')
+
+        return narrowed
+
     def tune_single(self,
                     param_name: str,
                     param_values: Union[Iterable[float], Tuple[float, float]],
                     int_only: bool=False,
                     n_trials: int=1,
                     n_iter: int=10,
-                    n_no_improve: int=None):
+                    n_no_improve: int=None,
+                    warm_start: bool=False):
         """
         Tunes a single parameter for a sampler. This assumes all other required parameters are already fixed in __init__ of sampler.
 
@@ -316,15 +820,20 @@ class NetworkSamplerTuner:
             n_iter (int, optional): Number of iterations to use before stopping; only applies to biseciotn method 'param_values' is a tuple.
                 Defaults to 10.
             n_no_improve (int, optional): Number of iterations without improvement on best score to confirm stopping. Defaults to None.
+            warm_start (bool, optional): Whether to first narrow 'param_values' around the best values on similar networks in the registry.
+                Defaults to False.
 
         Returns:
             Union[int, float]: Parameter value that yielded highest score within given constraints of tuner.
         """
-        print(f'<tune_single: param_name={param_name}, param_values={param_values}, int_only={int_only}, n_trials={n_trials}, n_iter={n_iter}, n_no_improve={n_no_improve}>')
+        print(f'<tune_single: param_name={param_name}, param_values={param_values}, int_only={int_only}, n_trials={n_trials}, n_iter={n_iter}, n_no_improve={n_no_improve}, warm_start={warm_start}>')
 
         sig = signature(self.nssampler.sampler.__init__)
         if param_name not in sig.parameters:
-            raise ValueError(f'parameter {param_name} is not in __init__ method of sampler {self.sampler}')
+            raise ValueError(f'parameter {param_name} is not in __init__ method of sampler {self.nssampler.sampler}')
+
+        if warm_start:
+            param_values = self.warm_start_values(param_name=param_name, param_values=param_values, int_only=int_only)
 
         # Variables common to different constraints
         pool = mp.Pool(processes=n_trials)
@@ -344,19 +853,20 @@ class NetworkSamplerTuner:
                 upper_bound = int(upper_bound)
                 mid = int(mid)
 
+            from tqdm import tqdm
             for iter_cnt in tqdm(np.arange(1, n_iter)):
                 print(f'iter_cnt: {iter_cnt}')
 
                 # Sampling and scoring
-                setattr(self.nssampler, param_name, lower_bound)
+                setattr(self.nssampler.sampler, param_name, lower_bound)
                 score_list = pool.starmap_async(_rescore, [(self.nssampler, self.graph, self.start_node) for _ in np.arange(n_trials)]).get()
                 lower_bound_score = np.mean(a=score_list, axis=None)
 
-                setattr(self.nssampler, param_name, upper_bound)
+                setattr(self.nssampler.sampler, param_name, upper_bound)
                 result = pool.starmap_async(_rescore, [(self.nssampler, self.graph, self.start_node) for _ in np.arange(n_trials)]).get()
                 upper_bound_score = np.mean(a=score_list, axis=None)
 
-                setattr(self.nssampler, param_name, mid)
+                setattr(self.nssampler.sampler, param_name, mid)
                 score_list = pool.starmap_async(_rescore, [(self.nssampler, self.graph, self.start_node) for _ in np.arange(n_trials)]).get()
                 mid_score = np.mean(a=score_list, axis=None)
 
@@ -375,6 +885,7 @@ class NetworkSamplerTuner:
                     # if __debug__:
                     print(f'n_no_improve ({n_no_improve}) line crossed')
                     print(f'best_param_value: {best_param_value}')
+                    self.best_score = high_score
                     return best_param_value
 
                 # if __debug__:
@@ -394,9 +905,11 @@ class NetworkSamplerTuner:
         # Specific iterable of testable values given
         else:
             print('tune_single - option B')
+            from tqdm import tqdm
             for value in tqdm(param_values):
                 print(f'value: {value}')
-                setattr(self.nssampler, param_name, value)
+                setattr(self.nssampler.sampler, param_name, value)
+                score_list = list()
                 for _ in tqdm(np.arange(n_trials)):
                     score_list.append(_rescore(self.nssampler, self.graph, self.start_node))
 
@@ -413,28 +926,56 @@ class NetworkSamplerTuner:
         if __debug__:
             print(f'best_param_value: {best_param_value}')
 
+        self.best_score = high_score
         return best_param_value
 
     def tune_multiple(self,
                         params: Dict[str, Union[Iterable[float], Tuple[float, float]]],
-                        n_trials: int=1):
+                        n_trials: int=1,
+                        warm_start: bool=False,
+                        method: str='grid',
+                        budget: int=None,
+                        batch_size: int=4,
+                        seed: int=None):
         """
-        Tune the current sampler for a specific network to sample, given a dictionary of parameter values, using the gridsearchcv heuristic.
+        Tune the current sampler for a specific network to sample, given a dictionary of parameter values, using the gridsearchcv heuristic
+        or, with method='gp', a Gaussian-process model-based search that proposes combinations from the scores observed so far and stops
+        after 'budget' evaluated combinations (see NetworkSamplingBayesOpt.py).
 
         Args:
             params (Dict[str, Union[Iterable[float], Tuple[float, float]]]): Dictionary of parameter names and either a list of discretevalues or
                     a bounded interval (2-element tuple) for the bisection method.
             n_trials (int, optional): Number of trials to commit for each tested parameter value. The score for that parameter value is the
                 mean over all 'n_trials' trials. Defaults to 1.
+            warm_start (bool, optional): Whether to first narrow each parameter's values around the best values on similar networks in the
+                registry. Defaults to False.
+            method (str, optional): 'grid' for exhaustive search over the product of all values, or 'gp' for model-based search, where a
+                2-element tuple is a continuous (or integer, if both bounds are ints) interval. Defaults to 'grid'.
+            budget (int, optional): Maximum number of combinations evaluated with method='gp'; 4 * (number of parameters + 1) if None.
+                Defaults to None.
+            batch_size (int, optional): Number of combinations proposed and evaluated in parallel per round with method='gp'. Defaults to 4.
+            seed (int, optional): Seed of proposals with method='gp'. Defaults to None.
 
         Raises:
             ValueError: One or more specified parameter names do not exist in sampler
+            ValueError: method is not 'grid' or 'gp'
 
         Returns:
             Dict[str, Union[int, float]]: Dictionary with the same keys as 'params', but each value is the parameter value for a specific
                 parameter with the highest achieved score during tuning.
         """
-        print(f'<tune_multiple: params={params}, n_trials={n_trials}>')
+        print(f'<tune_multiple: params={params}, n_trials={n_trials}, warm_start={warm_start}>')
+
+        if method not in ('grid', 'gp'):
+            raise ValueError(f'method ({method}) must be one of [\'grid\', \'gp\']')
+
+        if warm_start:
+            params = {name: self.warm_start_values(param_name=name, param_values=values) for name, values in params.items()}
+
+        if method == 'gp':
+            return self._tune_model_based(params=params, n_trials=n_trials, budget=budget, batch_size=batch_size, seed=seed)
+
+        from tqdm import tqdm
 
         param_values = list(itertools.product(*params.values()))
         pool = mp.Pool(processes=n_trials)
@@ -463,15 +1004,94 @@ class NetworkSamplerTuner:
             print(f'best_param_tup: {best_param_tup}')
 
         retval = dict(zip(params.keys(), best_param_tup))
+        self.best_score = high_score
         # print(f'retval: {retval}')
 
         return retval
 
+    def _tune_model_based(self,
+                            params: Dict[str, Union[Iterable[float], Tuple[float, float]]],
+                            n_trials: int=1,
+                            budget: int=None,
+                            batch_size: int=4,
+                            seed: int=None) -> Dict[str, Any]:
+        """
+        Model-based search behind tune_multiple(method='gp'). Each round, a batch of proposed combinations is set on shallow copies of the
+        sampler and all batch_size * n_trials sampling runs are scored in one pool call.
+        """
+        from NetworkSamplingBayesOpt import GaussianProcessOptimizer, SearchSpace
+        from tqdm import tqdm
+
+        space = SearchSpace(params=params)
+        budget = 4 * (len(space) + 1) if budget is None else budget
+        budget = int(min([budget, space.size()]))
+        optimizer = GaussianProcessOptimizer(space=space, seed=seed)
+
+        with mp.Pool(processes=max([min([batch_size * n_trials, mp.cpu_count()]), 1])) as pool:
+            for _ in tqdm(range(0, budget, batch_size)):
+                proposals = optimizer.ask(n=min([batch_size, budget - len(optimizer.history)]))
+                samplers = list()
+                for proposal in proposals:
+                    ns = copy.copy(self.nssampler)
+                    ns.sampler = copy.copy(self.nssampler.sampler)
+                    ns.sampler.__dict__.update(proposal)
+                    samplers.append(ns)
+                score_list = pool.starmap(_rescore, [(ns, self.graph, self.start_node) for ns in samplers for _ in range(n_trials)])
+                optimizer.tell(params_list=proposals, scores=np.asarray(a=score_list, dtype=np.float64).reshape(len(proposals), n_trials).mean(axis=1))
+
+                if __debug__:
+                    print(f'proposals: {proposals}')
+                    print(f'best so far: {optimizer.best()}')
+
+        best_params, self.best_score = optimizer.best()
+        self.nssampler.sampler.__dict__.update(best_params)
+        return best_params
+
+#endregion
+
+#region
+def seed_trial(sampler: Any, seed: int):
+    """
+    Puts a sampler on the random-number stream of one trial: the global 'random' and np.random generators used by the custom samplers
+    are seeded, and so is the sampler's own 'seed' attribute (littleballoffur samplers and MultiWalkerSampler) if it has one. Seeding
+    every sampler with the same value for trial i gives common random numbers across samplers.
+
+    Args:
+        sampler (Any): Sampler instance
+        seed (int): Seed of trial
+    """
+    random.seed(seed)
+    np.random.seed(seed)
+    if hasattr(sampler, 'seed'):
+        sampler.seed = seed
+
+def paired_confidence_interval(differences: Iterable[float], confidence: float=0.95) -> Tuple[float, float, float]:
+    """
+    Student-t confidence interval of the mean of paired score differences.
+
+    Args:
+        differences (Iterable[float]): Per-trial differences between two samplers' scores on the same start node and seed
+        confidence (float, optional): Confidence level. Defaults to 0.95.
+
+    Returns:
+        Tuple[float, float, float]: Mean difference, lower bound, upper bound; bounds are infinite with fewer than 2 differences
+    """
+    differences = np.asarray(a=list(differences), dtype=np.float64)
+    mean = differences.mean() if differences.size > 0 else np.nan
+    if differences.size < 2:
+        return mean, -np.inf, np.inf
+    from scipy.stats import t as t_dist
+
+    half_width = t_dist.ppf(q=0.5 + confidence / 2, df=differences.size - 1) * differences.std(ddof=1) / np.sqrt(differences.size)
+    return mean, mean - half_width, mean + half_width
 #endregion
 
 #region
 class NetworkSamplerGrid:
     """Compare and contrast different metrics of resulting samples from networks among different sampling algorithms."""
+    # Cost columns recorded next to the score of every (sampler, scorer) cell, each aggregated over trials like the score
+    COST_COLUMNS = ('Sample Time (s)', 'Score Time (s)', 'Tune Time (s)', 'Peak Memory (MB)', 'Nodes per Second')
+
     # METHODS
     def __init__(self, graph_group: Iterable[nx.Graph],
                 sampler_group: Iterable[Any],
@@ -479,12 +1099,14 @@ class NetworkSamplerGrid:
                 sampler_names: Iterable[str]=None,
                 scorer_names: Iterable[str]=None,
                 dir_path: str=None,
-                csv_names: Iterable[str]=None):
+                csv_names: Iterable[str]=None,
+                registry: TunedSamplerRegistry=None):
         """Initializes the group of sampling algorithms to compare using one or more scoring metrics.
 
         Args:
             graph_group (Iterable[nx.Graph]): One or more networks to sample and evaluate. Each graph having a 'name' attribute is recommended 
                 for later labeling in tables; if absent, label for a graph will be its 0-based index in graph_group.
+                Memory-mapped CSRGraph objects from NetworkSamplingCSR.py may be used in place of nx.Graph with the custom samplers.
             sampler_group (Iterable[Any]): One or more sampling algorithms to apply, either in the form of litleballoffur instances or a custom 
                 instance from NEtworkSamplerFunctions.py
             scorer_group (Iterable[NSMethod]): One or more scoring metrics to apply to the resulting sampled network using each given sampling 
@@ -496,6 +1118,8 @@ class NetworkSamplerGrid:
             dir_path (str, optional): Path of directory where to store all .csv files. Defaults to None.
             csv_names (str, optional): Iterable of .csv names to store each dataframe per graph as csv. If None, nothing is stored in disk.
                 If None or empty string is used for some individual graph, the graph name (or index) is used as .csv name. Defaults to None.
+            registry (TunedSamplerRegistry, optional): Registry of tuned parameter values; (sampler, graph, scorer) combinations already in
+                it are not re-tuned, and new tuning results are added to it. An in-memory registry is used if None. Defaults to None.
 
         Raises:
             ValueError: The number of names designated for scorers does not equal the number of scorers in scorer_group.
@@ -526,14 +1150,21 @@ class NetworkSamplerGrid:
         self.dir_path = dir_path
         self.csv_names = csv_names
 
-        # stores TunedNetworkSampler organized as dict of dict of dicts with key hierarchy being network -> scorer -> network sampling algorithm
-        self.tuned_ns = dict()
+        # stores TunedNetworkSampler records keyed by (sampler class, graph fingerprint, scorer)
+        self.tuned_ns = TunedSamplerRegistry() if registry is None else registry
+        self.tuned_params = None
+        self.int_only = None
+        self.n_trials_tune = 1
+        self.n_no_improve = None
+        self.warm_start = False
+        self.tune_method = 'grid'
+        self.tune_budget = None
 
         if __debug__:
             print(f'Number of graphs: {len(self.graph_group)}')
             print(f'Number of samplers: {len(self.sampler_group)}')
             print(f'Number of scorers: {len(self.scorer_group)}')
-            print(f'Number of tuned parameters: {len(self.tuned_params)}')
+            print(f'tuned_ns: {repr(self.tuned_ns)}')
             print(f'sampler_names: {self.sampler_names}')
             print(f'scorer_names: {self.scorer_names}')
             print(f'dir_path: {dir_path}')
@@ -562,7 +1193,10 @@ class NetworkSamplerGrid:
                     tuned_params: Iterable[Dict[str, Any]],
                     int_only: Iterable[bool]=None,
                     n_trials_tune: int=1,
-                    n_no_improve: int=None):
+                    n_no_improve: int=None,
+                    warm_start: bool=False,
+                    tune_method: str='grid',
+                    tune_budget: int=None):
         """
         Sets parameter values for NetworkSamplerTuner used in tuning before sampling a network.
 
@@ -580,6 +1214,11 @@ class NetworkSamplerGrid:
             n_trials_tune (int, optional): Number of trials to tune each sampler per scorer metric and network before aggregating s final score.
                 Defaults to 1.
             n_no_improve (int, optional): Number of iterations without improvement on best score to confirm stopping. Defaults to None.
+            warm_start (bool, optional): Whether to narrow each search region around the best values found on structurally similar networks
+                in the registry before tuning. Defaults to False.
+            tune_method (str, optional): Search method of samplers with several parameters to tune, 'grid' or 'gp'; see
+                NetworkSamplerTuner.tune_multiple. Defaults to 'grid'.
+            tune_budget (int, optional): Maximum number of parameter combinations evaluated with tune_method='gp'. Defaults to None.
         """
         if len(tuned_params) != len(self.sampler_group):
             raise ValueError(f'The number of parameter dicts in tune_params ({len(tuned_params)}) does not equal the number of samplers in sampler_group ({len(sampler_names)}).')
@@ -595,21 +1234,199 @@ class NetworkSamplerGrid:
         self.int_only = int_only
         self.n_trials_tune = n_trials_tune
         self.n_no_improve = n_no_improve
+        self.warm_start = warm_start
+        self.tune_method = tune_method
+        self.tune_budget = tune_budget
 
         # if __debug__:
         print(f'tuned_params: {self.tuned_params}')
         print(f'int_only: {self.int_only}')
         print(f'n_trials_tune: {self.n_trials_tune}')
         print(f'n_no_improve: {self.n_no_improve}')
+        print(f'warm_start: {self.warm_start}')
+        print(f'tune_method: {self.tune_method}')
+
+    def _sample_cell(self,
+                    graph: nx.Graph,
+                    row_idx: int,
+                    col_idx: int,
+                    start_node: int=None,
+                    n_trials: int=1,
+                    pool: Any=None,
+                    trace_memory: bool=True) -> Tuple[List[Any], Dict[str, Any], Dict[str, List[float]]]:
+        """
+        Tunes (if set up with set_tuner) and runs one sampler of the grid with one scorer on a network for n_trials trials.
+
+        Args:
+            graph (nx.Graph): Network to sample
+            row_idx (int): Index of sampler in sampler_group
+            col_idx (int): Index of scorer in scorer_group
+            start_node (int, optional): Node where sampling starts to spread. Defaults to None.
+            n_trials (int, optional): Number of trials. Defaults to 1.
+            pool (multiprocessing.Pool, optional): Pool to run the trials in; trials run in this process if None or if the pool
+                fails. Defaults to None.
+            trace_memory (bool, optional): Whether to trace peak memory of each trial with tracemalloc. Defaults to True.
+
+        Raises:
+            ValueError: start_node is not part of a sample
+
+        Returns:
+            Tuple[List[Any], Dict[str, Any], Dict[str, List[float]]]: Score of each trial; tuned parameter values; values of each of
+                COST_COLUMNS per trial (a single tuning time)
+        """
+        sampler, scorer = self.sampler_group[row_idx], self.scorer_group[col_idx]
+
+        # Initializing sampler and sampling
+        ns = NetworkSampler(sampler=sampler, scorer=scorer)
+        score_list = list()  # temporary use to hold scores across trials for the same  (sampler, scorer) pair
+
+        # Possible tuning of parameters
+        tune_start = time.perf_counter()
+        best_params_dict = dict()  # stores best parameter values as dict values to the chosen parameters to tune as keys
+        tuned = self.tuned_ns.get(sampler=ns.sampler, graph=graph, scorer=scorer) if self.tuned_params is not None and self.tuned_params[row_idx] is not None else None
+        if tuned is not None:
+            # Tuned in this or an earlier run on the same network
+            best_params_dict = dict(tuned.params)
+            tuned.apply(sampler=ns.sampler)
+
+            if __debug__:
+                print(f'Reusing {repr(tuned)}')
+
+        elif self.tuned_params is not None and self.tuned_params[row_idx] is not None:
+            nstuner = NetworkSamplerTuner(nssampler=ns, graph=graph, start_node=start_node, registry=self.tuned_ns)
+            tuned_params_dict = self.tuned_params[row_idx]
+
+            # Only a single parameter to tune
+            if len(tuned_params_dict) == 1:
+                single_param_key, single_param_val = list(tuned_params_dict.items())[0]
+
+                if __debug__:
+                    print(f'single_param_key: {single_param_key}')
+                    print(f'single_param val: {single_param_val}')
+
+                best_params_dict[single_param_key] = nstuner.tune_single(param_name=single_param_key,
+                                                                        param_values=single_param_val,
+                                                                        int_only=self.int_only,
+                                                                        n_trials=self.n_trials_tune,
+                                                                        warm_start=self.warm_start)
+            # Multiple parameters to tune
+            else:
+                best_params_dict = nstuner.tune_multiple(params=tuned_params_dict,
+                                                        n_trials=self.n_trials_tune,
+                                                        warm_start=self.warm_start,
+                                                        method=self.tune_method,
+                                                        budget=self.tune_budget)
+
+            # Each sampler itself if modified to accept tuned parameters
+            ns.sampler.__dict__.update(best_params_dict)
+
+            # Saving tuned parameter values
+            self.tuned_ns.put(sampler=ns.sampler, graph=graph, scorer=scorer, params=best_params_dict, score=nstuner.best_score)
+
+            if __debug__:
+                print(f'Sampler after tuning: {ns.sampler}')
+
+        tune_time = time.perf_counter() - tune_start
+
+        # The first trial runs here, so the statistics of parent networks that scorers compute once (spectrum, clustering summary, visit
+        # frequencies) are shipped to the pool with the other trials instead of being recomputed by every worker
+        trials = [_timed_rescore(ns=ns, graph=graph, start_node=start_node, trace_memory=trace_memory)]
+        statistics = parent_statistics(parents=[value for value in scorer.params.values() if isinstance(value, (nx.Graph, CSRGraph))])
+        try:
+            trials += pool.starmap_async(_timed_rescore, [(ns, graph, start_node, trace_memory, statistics) for _ in np.arange(n_trials - 1)]).get()
+        except:
+            trials = trials[:1]
+            for _ in np.arange(n_trials - 1):
+                trials.append(_timed_rescore(ns=ns, graph=graph, start_node=start_node, trace_memory=trace_memory))
+                if start_node not in ns.prev_sample:
+                    raise ValueError('start_node lost during sampling')
+
+        score_list = [score for score, _ in trials]
+        costs = {column: [cost[column] for _, cost in trials] for column in NetworkSamplerGrid.COST_COLUMNS if column != 'Tune Time (s)'}
+        costs['Tune Time (s)'] = [tune_time]
+        return score_list, best_params_dict, costs
+
+    def _empty_score_dict(self, col_labels: List[str]) -> Dict[str, List[Any]]:
+        """
+        Empty columns of a grid dataframe: scores of every scorer, then their tuned parameters, then their costs.
+
+        Args:
+            col_labels (List[str]): Label of each scorer
+
+        Returns:
+            Dict[str, List[Any]]: Column name -> empty list
+        """
+        score_dict = dict()
+        for col_label in col_labels:
+            score_dict[col_label] = list()
+        for col_label in col_labels:
+            score_dict[col_label + ' Tuned Params'] = list()
+        for col_label in col_labels:
+            for column in NetworkSamplerGrid.COST_COLUMNS:
+                score_dict[f'{col_label} {column}'] = list()
+        return score_dict
+
+    def _append_cell(self,
+                    score_dict: Dict[str, List[Any]],
+                    col_label: str,
+                    cell: Tuple[List[Any], Dict[str, Any], Dict[str, List[float]]],
+                    aggregate: Callable=np.mean,
+                    n_trials: int=1):
+        """
+        Appends the aggregated score, tuned parameters and aggregated costs of one cell (as returned by _sample_cell) to the columns
+        of its scorer.
+
+        Args:
+            score_dict (Dict[str, List[Any]]): Columns from _empty_score_dict
+            col_label (str): Label of the cell's scorer
+            cell (Tuple[List[Any], Dict[str, Any], Dict[str, List[float]]]): Result of _sample_cell
+            aggregate (Callable, optional): Aggregation function over trials. Defaults to np.mean.
+            n_trials (int, optional): Number of trials. Defaults to 1.
+        """
+        score_list, best_params_dict, costs = cell
+        score_dict[col_label].append(self._aggregate_scores(score_list=score_list, aggregate=aggregate, n_trials=n_trials))
+        score_dict[col_label + ' Tuned Params'].append(best_params_dict)
+        for column in NetworkSamplerGrid.COST_COLUMNS:
+            score_dict[f'{col_label} {column}'].append(aggregate(costs[column]))
+
+    @staticmethod
+    def _aggregate_scores(score_list: List[Any], aggregate: Callable=np.mean, n_trials: int=1) -> Any:
+        """
+        Single score of a grid cell from the scores of its trials.
+
+        Args:
+            score_list (List[Any]): Score of each trial
+            aggregate (Callable, optional): Aggregation function of numeric scores. Defaults to np.mean.
+            n_trials (int, optional): Number of trials. Defaults to 1.
+
+        Returns:
+            Any: Aggregated number, or merged iterable of iterable scores
+        """
+        # Score is a number
+        if type(score_list[0]) in [int, float, np.int_, np.float64]:
+            return aggregate(score_list)
+
+        # Score is an iterable, so a merged iterable of all score iterables (over n_trials) is created
+        iter_score = score_list[0]
+        for idx in np.arange(1, n_trials):
+            iter_score = iter_score.update(score_list[idx])
+
+        if __debug__:
+            print(f'iter_score:\n{iter_score}')
+
+        return iter_score
 
     def sample_by_graph(self,
                         graph: nx.Graph,
                         start_node: int=None,
                         aggregate: Callable=np.mean,
                         csv_name: str=None,
-                        n_trials: int=1):
+                        n_trials: int=1,
+                        trace_memory: bool=True):
         """
-        Samples a specific network, possibly over many trials and aggregating the score.
+        Samples a specific network, possibly over many trials and aggregating the score. Next to its score and tuned parameters, every
+        (sampler, scorer) cell records its cost in COST_COLUMNS: sampling and scoring wall time, tuning time, peak traced memory and
+        nodes sampled per second, aggregated over trials like the score.
 
         Args:
             graph: Graph to sample
@@ -619,6 +1436,8 @@ class NetworkSamplerGrid:
                 nothing will be stored in memory. If 'dir_path' is initialized, the .csv file will be stored in that directory. Defaults to None.
             n_trials (int, optional): The number of times to run the each sampling algorithm when evalutating with the same scoring metric. The end 
                 score is a single value from aggregating the scores from all the trials. Defaults to 1.
+            trace_memory (bool, optional): Whether to trace peak memory with tracemalloc, which slows allocation-heavy samplers down;
+                'Peak Memory (MB)' is NaN if False. Defaults to True.
 
         Returns:
             pd.DataFrame: Dataframe with sampling algorithm as rows and scores / other data generated by specified metrics as columns, and 
@@ -630,14 +1449,9 @@ class NetworkSamplerGrid:
         sample_result = None
         row_labels = [str(sampler) for sampler in self.sampler_group] if self.sampler_names is None else self.sampler_names # indexes for dataframe df
         col_labels = [str(scorer) for scorer in self.scorer_group] if self.scorer_names is None else self.scorer_names
-        score_dict = dict()
 
         # Setting up initial empty lists for each column in dataframe
-        for col_label in self.scorer_names:
-            score_dict[col_label] = list()
-
-        for col_label in self.scorer_names:
-            score_dict[col_label + ' Tuned Params'] = list()
+        score_dict = self._empty_score_dict(col_labels=col_labels)
 
         if __debug__:
             print(f'row_labels: {row_labels}')
@@ -645,90 +1459,24 @@ class NetworkSamplerGrid:
             print(f'initial score_dict:\n{score_dict}')
 
         # pdb.set_trace(header='NetworkSamplerGrid - sample_by_graph - Sampling chose graph with each provided sampling algorithm')
-        for row_idx, row_tup in enumerate(zip(row_labels, self.sampler_group)):
-            row_label, sampler = row_tup
-
+        for row_idx, row_label in enumerate(row_labels):
             if __debug__:
                 print(f'sampler: {row_label}')
 
-            # Initializing sampler and sampling
-            ns = NetworkSampler(sampler=sampler, scorer=None)
-
-            # Drawing and saving sample
-            # sample_result = ns.sample(graph=graph, start_node=start_node)
-            # nx.draw(G=sample_result, pos=nx.spring_layout(G=sample_result))
-            # plt.show(block=False)
-            # plt.savefig(fname=f'./Graph Plots/{graph_name}_{row_label}.jpg', format='JPG')
-
-            for col_label, scorer in zip(col_labels, self.scorer_group):
-                # Computing score / distribution
-                ns.set_scorer(new_scorer=scorer)
-                score_list = list()  # temporary use to hold scores across trials for the same  (sampler, scorer) pair
-
-                # Possible tuning of parameters
-                best_params_dict = dict()  # stores best parameter values as dict values to the chosen parameters to tune as keys
-                if self.tuned_params is not None and self.tuned_params[row_idx] is not None:
-                    nstuner = NetworkSamplerTuner(nssampler=ns, graph=graph, start_node=start_node)
-                    tuned_params_dict = self.tuned_params[row_idx]
-
-                    # Only a single parameter to tune
-                    if len(tuned_params_dict) == 1:
-                        single_param_key, single_param_val = list(tuned_params_dict.items())[0]
-
-                        if __debug__:
-                            print(f'single_param_key: {single_param_key}')
-                            print(f'single_param val: {single_param_val}')
-
-                        best_params_dict[single_param_key] = nstuner.tune_single(param_name=single_param_key,
-                                                                                param_values=single_param_val,
-                                                                                int_only=self.int_only,
-                                                                                n_trials=self.n_trials_tune)
-                    # Multiple parameters to tune
-                    else:
-                        best_params_dict = nstuner.tune_multiple(params=tuned_params_dict, n_trials=self.n_trials_tune)
-
-                    # Each sampler itself if modified to accept tuned parameters
-                    ns.sampler.__dict__.update(best_params_dict)
-
-                    # Saving tuned network sampler
-                    # self.tuned_ns[graph][col_label][row_label] = copy.deepcopy(x=ns)
-
-                    if __debug__:
-                        print(f'Sampler after tuning: {ns.sampler}')
-
-                try:
-                    score_list = pool.starmap_async(_rescore, [(ns, graph, start_node) for _ in np.arange(n_trials)]).get()
-                except:
-                    for _ in np.arange(n_trials):
-                        ns.sample(graph=graph, start_node=start_node)
-                        if start_node not in ns.prev_sample:
-                            raise ValueError('start_node lost during sampling')
-                        score_list.append(ns.score())
+            for col_idx, col_label in enumerate(col_labels):
+                cell = self._sample_cell(graph=graph, row_idx=row_idx, col_idx=col_idx, start_node=start_node, n_trials=n_trials, pool=pool,
+                                        trace_memory=trace_memory)
 
                 # if __debug__:
                 print(f'scorer: {col_label}')
-                print(f'score_list:\n{score_list}')
-
-                # Score is a number
-                if type(score_list[0]) in [int, float, np.int_, np.float_]:
-                    score_dict[col_label].append(aggregate(score_list))
-
-                # Score is an iterable, so a merged iterable of all score iterables (over n_trials) is created
-                else:
-                    iter_score = score_list[0]
-                    for idx in np.arange(1, n_trials):
-                        iter_score = iter_score.update(score_list[idx])
-
-                    if __debug__:
-                        print(f'iter_score:\n{iter_score}')
+                print(f'score_list:\n{cell[0]}')
 
-                    score_dict[col_label].append(iter_score)
-
-                score_dict[col_label + ' Tuned Params'].append(best_params_dict)
+                self._append_cell(score_dict=score_dict, col_label=col_label, cell=cell, aggregate=aggregate, n_trials=n_trials)
 
         if __debug__:
             print(f'final score_dict:\n{score_dict}')
 
+        import pandas as pd
         df = pd.DataFrame(data=score_dict, index=row_labels)
 
         if csv_name is not None:
@@ -738,6 +1486,177 @@ class NetworkSamplerGrid:
         return df
 
 
+    def compare_paired(self,
+                        graph: nx.Graph,
+                        scorer: NSMethod,
+                        reference: str=None,
+                        start_node: int=None,
+                        confidence: float=0.95,
+                        n_trials_min: int=5,
+                        n_trials_max: int=100,
+                        seed: int=0):
+        """
+        Paired comparison of every sampler against a reference sampler with common random numbers. Trial i uses the same start node and
+        the same seed (see seed_trial) for all samplers, so the noise shared by the samplers cancels in the per-trial score differences.
+        A comparison stops as soon as the confidence interval of its mean difference excludes 0 (after at least n_trials_min trials), or
+        after n_trials_max trials. Stopping is checked after every trial, so a stricter confidence level keeps the false resolution rate low.
+
+        Args:
+            graph (nx.Graph): Graph to sample
+            scorer (NSMethod): Scoring metric returning a number
+            reference (str, optional): Name of reference sampler in sampler_names; the first sampler if None. Defaults to None.
+            start_node (int, optional): Start node of every trial; drawn at random per trial (the same for all samplers) if None. Defaults to None.
+            confidence (float, optional): Confidence level of intervals. Defaults to 0.95.
+            n_trials_min (int, optional): Minimum number of trials per comparison. Defaults to 5.
+            n_trials_max (int, optional): Maximum number of trials per comparison. Defaults to 100.
+            seed (int, optional): Seed of trial seeds and start nodes. Defaults to 0.
+
+        Raises:
+            ValueError: reference is not a sampler name
+            ValueError: n_trials_min is below 2 or above n_trials_max
+
+        Returns:
+            pd.DataFrame: One row per non-reference sampler with the mean paired difference (sampler - reference), its confidence interval,
+                the number of trials used and whether the comparison was resolved
+        """
+        row_labels = [str(sampler) for sampler in self.sampler_group] if self.sampler_names is None else list(self.sampler_names)
+        reference = row_labels[0] if reference is None else reference
+        if reference not in row_labels:
+            raise ValueError(f'reference ({reference}) is not one of the sampler names {row_labels}')
+        elif n_trials_min < 2 or n_trials_min > n_trials_max:
+            raise ValueError(f'n_trials_min ({n_trials_min}) must be at least 2 and at most n_trials_max ({n_trials_max})')
+
+        # Copies, so the trial seeds set by seed_trial do not stick to the grid's own samplers
+        samplers = {label: NetworkSampler(sampler=copy.copy(sampler), scorer=scorer) for label, sampler in zip(row_labels, self.sampler_group)}
+        rng = np.random.default_rng(seed=seed)
+        nodes = None if start_node is not None else list(graph.nodes) if isinstance(graph, nx.Graph) else None
+
+        def _trial_score(label: str, trial_seed: int, trial_start_node: Any) -> float:
+            seed_trial(sampler=samplers[label].sampler, seed=trial_seed)
+            return samplers[label].sample_and_score(graph=graph, start_node=trial_start_node)[1]
+
+        differences = {label: list() for label in row_labels if label != reference}
+        active = set(differences.keys())
+        for trial in range(n_trials_max):
+            if len(active) == 0:
+                break
+            trial_seed = int(rng.integers(low=0, high=2 ** 31 - 1))
+            if start_node is not None:
+                trial_start_node = start_node
+            elif nodes is not None:
+                trial_start_node = nodes[int(rng.integers(low=0, high=len(nodes)))]
+            else:
+                trial_start_node = int(rng.integers(low=0, high=graph.number_of_nodes()))
+
+            reference_score = _trial_score(label=reference, trial_seed=trial_seed, trial_start_node=trial_start_node)
+            for label in sorted(active):
+                differences[label].append(_trial_score(label=label, trial_seed=trial_seed, trial_start_node=trial_start_node) - reference_score)
+                if len(differences[label]) >= n_trials_min:
+                    _, lower, upper = paired_confidence_interval(differences=differences[label], confidence=confidence)
+                    if lower > 0 or upper < 0:
+                        active.discard(label)
+
+        result = dict()
+        for label, diffs in differences.items():
+            mean, lower, upper = paired_confidence_interval(differences=diffs, confidence=confidence)
+            result[label] = {'Mean Difference': mean, 'CI Lower': lower, 'CI Upper': upper, 'Trials': len(diffs), 'Resolved': lower > 0 or upper < 0}
+        import pandas as pd
+        df = pd.DataFrame.from_dict(data=result, orient='index')
+
+        if __debug__:
+            print(f'compare_paired: reference={reference}\n{df}')
+
+        return df
+
+    def sample_size_sweep(self,
+                            graph: nx.Graph,
+                            sizes: Iterable[int],
+                            start_node: int=None,
+                            aggregate: Callable=np.mean,
+                            n_trials: int=1,
+                            seed: int=None,
+                            csv_name: str=None):
+        """
+        Learning curve of every (sampler, scorer) pair over sample sizes from one trajectory per trial. Each sampler runs once per trial up
+        to the largest size through its anytime iter_sample, and every scorer is updated incrementally as nodes arrive (see
+        NetworkSamplingIncremental.py), so the prefix at each requested size is scored without re-sampling. A sweep costs about as much as
+        a single run at the largest size. Samplers whose sample is not a prefix of their trajectory (eg. the caterpillar samplers, which
+        keep the highest-degree visited nodes) are scored on the trajectory prefix.
+
+        Args:
+            graph (nx.Graph): Graph to sample
+            sizes (Iterable[int]): Sample sizes (number of nodes) to score at
+            start_node (int, optional): Node where sampling starts to spread. Defaults to None.
+            aggregate (Callable, optional): Aggregation of numeric scores over trials; histogram scores are summed. Defaults to np.mean.
+            n_trials (int, optional): Number of trajectories per sampler. Defaults to 1.
+            seed (int, optional): Seed of trial i is seed + i, shared by all samplers (see seed_trial); unseeded if None. Defaults to None.
+            csv_name (str, optional): CSV name to store the table, in dir_path if initialized. Defaults to None.
+
+        Raises:
+            ValueError: sizes is empty or contains a non-positive size
+
+        Returns:
+            pd.DataFrame: Tidy table with columns 'Size', 'Sampler', 'Scorer', 'Score' and 'Trials' (trajectories that reached the size)
+        """
+        sizes = sorted(set(int(size) for size in sizes))
+        if len(sizes) == 0 or sizes[0] <= 0:
+            raise ValueError(f'sizes ({sizes}) must be a non-empty collection of positive integers')
+
+        row_labels = [str(sampler) for sampler in self.sampler_group] if self.sampler_names is None else self.sampler_names
+        col_labels = [str(scorer) for scorer in self.scorer_group] if self.scorer_names is None else self.scorer_names
+        scores = {(size, row_label, col_label): list() for size in sizes for row_label in row_labels for col_label in col_labels}
+
+        for row_label, sampler in zip(row_labels, self.sampler_group):
+            sampler = copy.copy(sampler)
+            if hasattr(sampler, 'number_of_nodes'):
+                sampler.number_of_nodes = sizes[-1]
+            ns = NetworkSampler(sampler=sampler, scorer=None)
+
+            for trial in range(n_trials):
+                if seed is not None:
+                    seed_trial(sampler=sampler, seed=seed + trial)
+                running = {col_label: incremental_scorer(scorer=scorer, parent=graph) for col_label, scorer in zip(col_labels, self.scorer_group)}
+                prefix = set()
+                size_iter = iter(sizes)
+                next_size = next(size_iter)
+                for batch in ns.iter_sample(graph=graph, start_node=start_node, batch=True):
+                    for n in batch:
+                        if n in prefix:
+                            continue
+                        prefix.add(n)
+                        for score in running.values():
+                            score.add(nodes=[n])
+                        if len(prefix) == next_size:
+                            for col_label, score in running.items():
+                                scores[(next_size, row_label, col_label)].append(score.value())
+                            next_size = next(size_iter, None)
+                        if next_size is None:
+                            break
+                    if next_size is None:
+                        break
+
+                if __debug__:
+                    print(f'sample_size_sweep: sampler={row_label}, trial={trial}, reached={"all" if next_size is None else next_size}')
+
+        rows = list()
+        for (size, row_label, col_label), score_list in scores.items():
+            if len(score_list) == 0:
+                continue
+            if isinstance(score_list[0], collections.Counter):
+                score = sum(score_list, collections.Counter())
+            else:
+                score = aggregate(score_list)
+            rows.append({'Size': size, 'Sampler': row_label, 'Scorer': col_label, 'Score': score, 'Trials': len(score_list)})
+
+        import pandas as pd
+        df = pd.DataFrame(data=rows, columns=['Size', 'Sampler', 'Scorer', 'Score', 'Trials'])
+
+        if csv_name is not None:
+            path = './' + csv_name if self.dir_path is None else os.path.join(self.dir_path, csv_name)
+            df.to_csv(path_or_buf=path, index=False)
+
+        return df
+
     def sample_all_graphs(self,
                         start_node: int=None,
                         aggregate: Callable=np.mean,
@@ -763,4 +1682,128 @@ class NetworkSamplerGrid:
             retval[graph] = df
         return retval
 
+    def enqueue(self, path: str, start_node: int=None, n_trials: int=1, lease: float=None) -> Union[JobQueue, DirectoryJobQueue]:
+        """
+        Writes every (graph, sampler, scorer) cell of the grid as a job to an on-disk queue, to be run by any number of worker processes
+        with NetworkSamplingQueue.run_worker and collected with 'gather'. The grid definition and each graph are stored once in the queue;
+        each job only holds indices into them. A queue directory (see NetworkSamplingQueue.open_queue) can be served by workers on several
+        hosts sharing a filesystem.
+
+        Args:
+            path (str): Path of queue file or directory; must not hold jobs yet
+            start_node (int, optional): Node where sampling starts to spread. Defaults to None.
+            n_trials (int, optional): The number of times to run each sampling algorithm with each scoring metric. Defaults to 1.
+            lease (float, optional): Seconds after which a cell claimed by a worker that has not completed it can be claimed again. Defaults to None.
+
+        Raises:
+            ValueError: The queue already holds jobs
+
+        Returns:
+            Union[JobQueue, DirectoryJobQueue]: Queue of grid cells
+        """
+        queue = open_queue(path=path, lease=lease)
+        if len(queue) > 0:
+            raise ValueError(f'Queue {path} already holds {len(queue)} jobs')
+
+        grid = copy.copy(self)
+        grid.graph_group = [None] * len(self.graph_group)  # graphs are stored separately, so workers load only the graphs they need
+        queue.set_meta(key='grid', value=grid)
+        for graph_idx, graph in enumerate(self.graph_group):
+            queue.set_meta(key=f'graph/{graph_idx}', value=graph)
+
+        queue.put(payloads=[{'graph_idx': graph_idx, 'row_idx': row_idx, 'col_idx': col_idx, 'start_node': start_node, 'n_trials': n_trials}
+                            for graph_idx in range(len(self.graph_group))
+                            for row_idx in range(len(self.sampler_group))
+                            for col_idx in range(len(self.scorer_group))])
+
+        if __debug__:
+            print(f'enqueue: {repr(queue)}')
+
+        return queue
+
+    def gather(self, path: str, aggregate: Callable=np.mean) -> Dict[nx.Graph, pd.DataFrame]:
+        """
+        Collects the cells completed by queue workers into one dataframe per network, as returned by sample_all_graphs.
+
+        Args:
+            path (str): Path of queue file or directory written by 'enqueue'
+            aggregate (Callable, optional): Aggregation function over trials for a specific scoring metric. Defaults to np.mean.
+
+        Raises:
+            ValueError: Some cells are not completed yet, or have failed
+
+        Returns:
+            Dict[nx.Graph, pd.DataFrame]: Dataframe of each network, with sampling algorithm as rows and scores as columns
+        """
+        queue = open_queue(path=path)
+        counts = queue.counts()
+        if counts['failed'] > 0:
+            raise ValueError(f'{counts["failed"]} grid cells failed, first error: {queue.errors()[0][1]}')
+        elif counts['pending'] + counts['running'] > 0:
+            raise ValueError(f'{counts["pending"] + counts["running"]} grid cells in {path} are not completed yet')
+
+        row_labels = [str(sampler) for sampler in self.sampler_group] if self.sampler_names is None else self.sampler_names
+        col_labels = [str(scorer) for scorer in self.scorer_group] if self.scorer_names is None else self.scorer_names
+        cells = {(cell['graph_idx'], cell['row_idx'], cell['col_idx']): (cell['n_trials'], result) for cell, result in queue.results()}
+
+        import pandas as pd
+
+        retval = dict()
+        for graph_idx, graph in enumerate(self.graph_group):
+            score_dict = self._empty_score_dict(col_labels=col_labels)
+            for row_idx in range(len(row_labels)):
+                for col_idx, col_label in enumerate(col_labels):
+                    n_trials, cell = cells[(graph_idx, row_idx, col_idx)]
+                    self._append_cell(score_dict=score_dict, col_label=col_label, cell=cell, aggregate=aggregate, n_trials=n_trials)
+            df = pd.DataFrame(data=score_dict, index=row_labels)
+
+            csv_name = None if self.csv_names is None else self.csv_names[graph_idx]
+            if csv_name is not None:
+                csv_path = './' + csv_name if self.dir_path is None else os.path.join(self.dir_path, csv_name)
+                df.to_csv(path_or_buf=csv_path)
+            retval[graph] = df
+        return retval
+
+    def sample_all_graphs_queued(self,
+                                path: str,
+                                n_workers: int=None,
+                                start_node: int=None,
+                                aggregate: Callable=np.mean,
+                                n_trials: int=1,
+                                lease: float=None) -> Dict[nx.Graph, pd.DataFrame]:
+        """
+        Multi-process version of sample_all_graphs: enqueues every grid cell to an on-disk queue, runs local worker processes until the
+        queue is drained and gathers the results. More workers can join at any time with 'python NetworkSamplingQueue.py <path>', on the
+        same host for a queue file, or on any host sharing the filesystem for a queue directory. If the queue already holds this grid's
+        jobs (eg. after an interrupted run), its remaining jobs are run instead of enqueuing the grid again; jobs left running by the
+        interrupted run's workers are requeued first, so no other workers may still be running on the queue when resuming.
+
+        Args:
+            path (str): Path of queue file or directory (see NetworkSamplingQueue.open_queue)
+            n_workers (int, optional): Number of local worker processes; os.cpu_count() if None. Defaults to None.
+            start_node (int, optional): Node where sampling starts to spread. Defaults to None.
+            aggregate (Callable, optional): Aggregation function over trials for a specific scoring metric. Defaults to np.mean.
+            n_trials (int, optional): The number of times to run each sampling algorithm with each scoring metric. Defaults to 1.
+            lease (float, optional): Seconds after which a cell claimed by a worker that has not completed it can be claimed again. Defaults to None.
+
+        Returns:
+            Dict[nx.Graph, pd.DataFrame]: Dataframe of each network, with sampling algorithm as rows and scores as columns
+        """
+        queue = open_queue(path=path)
+        if len(queue) == 0:
+            self.enqueue(path=path, start_node=start_node, n_trials=n_trials, lease=lease)
+        else:
+            requeued = queue.requeue_running()
+
+            if __debug__:
+                print(f'sample_all_graphs_queued: resuming {path}, requeued {requeued} jobs of stopped workers')
+
+        workers = [mp.Process(target=run_worker, kwargs={'path': path, 'lease': lease}) for _ in range(os.cpu_count() if n_workers is None else n_workers)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        return self.gather(path=path, aggregate=aggregate)
+
 #endregion
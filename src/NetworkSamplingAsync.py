@@ -0,0 +1,255 @@
+
+import asyncio
+import networkx as nx
+import numpy as np
+import threading
+from typing import Any, Iterable, List, Tuple
+
+#region
+class LatencyMockSource:
+    """
+    Asynchronous adjacency source answering from an nx.Graph after an artificial delay. Stands in for a remote
+    backend when testing AsyncFrontierGraph; 'n_requests' counts fetches and 'max_in_flight' records the highest
+    number of fetches that were waiting at the same time.
+    """
+    def __init__(self, graph: nx.Graph, latency: float=0.01):
+        """
+        Initializes mock source.
+
+        Args:
+            graph (nx.Graph): Graph to answer from
+            latency (float, optional): Seconds each fetch waits before answering. Defaults to 0.01.
+        """
+        self.graph = graph
+        self.latency = latency
+        self.n_requests = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def __repr__(self):
+        """
+        Representation of LatencyMockSource object.
+
+        Returns:
+            str: Representation of LatencyMockSource object.
+        """
+        return f'<LatencyMockSource: graph={repr(self.graph)}, latency={self.latency}>'
+
+    async def fetch_neighbors(self, n: Any) -> List[Tuple[Any, int]]:
+        """
+        Neighbors of n together with their degrees.
+
+        Args:
+            n (Any): Node id
+
+        Returns:
+            List[Tuple[Any, int]]: (neighbor, degree of neighbor) pairs, or None if n is not a node
+        """
+        self.n_requests += 1
+        self.in_flight += 1
+        self.max_in_flight = max([self.max_in_flight, self.in_flight])
+        await asyncio.sleep(self.latency)
+        self.in_flight -= 1
+
+        if n not in self.graph:
+            return None
+        return [(m, self.graph.degree[m]) for m in self.graph.neighbors(n)]
+#endregion
+
+#region
+class _DegreeView:
+    """Indexable view so that graph.degree[n] works on AsyncFrontierGraph like on nx.Graph."""
+    def __init__(self, graph: 'AsyncFrontierGraph'):
+        self.graph = graph
+
+    def __getitem__(self, n: Any):
+        return self.graph.get_degree(n=n)
+
+class AsyncFrontierGraph:
+    """
+    Graph wrapper that hides the round-trip latency of a slow adjacency source. An asyncio event loop runs in a
+    background thread; prefetch() schedules neighbor fetches on it and returns immediately, so up to 'concurrency'
+    requests are in flight while the sampler keeps ranking the current layer. neighbors() only blocks when the
+    requested node has not arrived yet.
+
+    The source is any object with a coroutine 'fetch_neighbors(n)' returning (neighbor, degree) pairs, or None for
+    unknown nodes, eg. LatencyMockSource. CaterpillarQuotaWalkSampler prefetches the q1 nodes chosen at each node,
+    which form the next layer, as soon as they are chosen.
+    """
+    # Samplers may call prefetch() per node without paying a round-trip each time
+    asynchronous_prefetch = True
+
+    def __init__(self, source: Any, concurrency: int=16, name: str=None):
+        """
+        Starts the background event loop.
+
+        Args:
+            source (Any): Asynchronous adjacency source
+            concurrency (int, optional): Maximum number of fetches in flight. Defaults to 16.
+            name (str, optional): Name of graph used as label in NetworkSamplerGrid tables. Defaults to None.
+
+        Raises:
+            ValueError: concurrency is not a positive integer
+        """
+        if concurrency <= 0:
+            raise ValueError(f'concurrency ({concurrency}) is not a positive integer.')
+
+        self.source = source
+        self.concurrency = concurrency
+        self.name = name
+        self.degree = _DegreeView(graph=self)
+
+        self._adjacency = dict()
+        self._degree = dict()
+        self._missing = set()
+        self._pending = dict()  # node -> concurrent.futures.Future of fetch
+
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+        self._thread.start()
+        self._semaphore = asyncio.run_coroutine_threadsafe(self._make_semaphore(), self._loop).result()
+
+    def __repr__(self):
+        """
+        Representation of AsyncFrontierGraph object.
+
+        Returns:
+            str: Representation of AsyncFrontierGraph object.
+        """
+        return f'<AsyncFrontierGraph: name={self.name}, source={repr(self.source)}, concurrency={self.concurrency}, cached={len(self._adjacency)}>'
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __contains__(self, n: Any):
+        """
+        Whether n is a node of the source, fetching its neighbors if unknown.
+
+        Args:
+            n (Any): Candidate node
+
+        Returns:
+            bool: True if n is a node of graph
+        """
+        if n in self._adjacency or n in self._degree:
+            return True
+        if n not in self._missing:
+            self._resolve(n=n)
+        return n in self._adjacency
+
+    async def _make_semaphore(self):
+        """
+        Creates the concurrency limit inside the background loop, which older asyncio versions bind it to.
+        """
+        return asyncio.Semaphore(value=self.concurrency)
+
+    async def _fetch(self, n: Any):
+        """
+        Fetches one node while holding a slot of the concurrency limit.
+        """
+        async with self._semaphore:
+            return await self.source.fetch_neighbors(n)
+
+    def _resolve(self, n: Any):
+        """
+        Waits for the fetch of n, scheduling it first if needed, and stores the result.
+        """
+        if n in self._adjacency or n in self._missing:
+            return
+        if n not in self._pending:
+            self.prefetch(nodes=[n])
+
+        pairs = self._pending.pop(n).result()
+        if pairs is None:
+            self._missing.add(n)
+            return
+        self._adjacency[n] = np.asarray(a=[m for m, _ in pairs])
+        self._degree[n] = len(pairs)
+        for m, m_degree in pairs:
+            self._degree[m] = m_degree
+
+    # ACCESSORS
+    def prefetch(self, nodes: Iterable[Any]):
+        """
+        Schedules neighbor fetches for every node not cached or already in flight, without waiting for them.
+
+        Args:
+            nodes (Iterable[Any]): Nodes expected to be expanded soon
+        """
+        for n in nodes:
+            if n not in self._adjacency and n not in self._pending and n not in self._missing:
+                self._pending[n] = asyncio.run_coroutine_threadsafe(self._fetch(n=n), self._loop)
+
+    def neighbors(self, n: Any) -> np.ndarray:
+        """
+        Neighbors of a node, waiting for its fetch if it is still in flight.
+
+        Args:
+            n (Any): Node id
+
+        Raises:
+            ValueError: n is not a node of graph
+
+        Returns:
+            np.ndarray: Neighbor ids of n
+        """
+        self._resolve(n=n)
+        if n not in self._adjacency:
+            raise ValueError(f'Node {n} must exist inside network {self}')
+        return self._adjacency[n]
+
+    def get_degree(self, n: Any) -> int:
+        """
+        Degree of a node; known without a fetch once any neighbor of n has been fetched.
+
+        Args:
+            n (Any): Node id
+
+        Raises:
+            ValueError: n is not a node of graph
+
+        Returns:
+            int: Degree of n
+        """
+        if n not in self._degree:
+            self._resolve(n=n)
+        if n not in self._degree:
+            raise ValueError(f'Node {n} must exist inside network {self}')
+        return self._degree[n]
+
+    def subgraph(self, nodes: Iterable[Any]) -> nx.Graph:
+        """
+        Induced subgraph over the given nodes, materialized as an in-memory nx.Graph. Missing adjacency lists are
+        fetched concurrently.
+
+        Args:
+            nodes (Iterable[Any]): Node ids to keep
+
+        Returns:
+            nx.Graph: Induced subgraph
+        """
+        node_list = list(dict.fromkeys(nodes))
+        node_set = set(node_list)
+        self.prefetch(nodes=node_list)
+
+        sub = nx.Graph(name=self.name)
+        sub.add_nodes_from(node_list)
+        for n in node_list:
+            sub.add_edges_from((n, m) for m in self.neighbors(n=n) if m in node_set)
+        return sub
+
+    # MUTATORS
+    def close(self):
+        """
+        Cancels fetches still in flight and stops the background event loop.
+        """
+        for future in self._pending.values():
+            future.cancel()
+        self._pending.clear()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+#endregion
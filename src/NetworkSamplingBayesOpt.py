@@ -0,0 +1,250 @@
+
+import numpy as np
+from scipy.special import ndtr
+from typing import Any, Dict, Iterable, List, Tuple, Union
+
+#region
+class SearchSpace:
+    """
+    Mixed search space of sampler parameters mapped onto the unit cube. A 2-element tuple is a bounded interval, integer-valued if both
+    bounds are ints; any other iterable is a set of discrete choices, encoded by their position in the iterable.
+    """
+    def __init__(self, params: Dict[str, Union[Iterable[Any], Tuple[float, float]]]):
+        """
+        Initializes a search space.
+
+        Args:
+            params (Dict[str, Union[Iterable[Any], Tuple[float, float]]]): Parameter name -> bounded interval or discrete values, as taken
+                by NetworkSamplerTuner.tune_multiple
+
+        Raises:
+            ValueError: An interval has its lower bound above its upper bound, or a list of values is empty
+        """
+        self.names = list(params.keys())
+        self.dims = list()  # ('interval', (low, high, is_int)) or ('choice', values)
+        for name, values in params.items():
+            if type(values) == tuple:
+                low, high = values
+                if low > high:
+                    raise ValueError(f'Lower bound of {name} ({low}) is above its upper bound ({high})')
+                self.dims.append(('interval', (low, high, isinstance(low, (int, np.integer)) and isinstance(high, (int, np.integer)))))
+            else:
+                values = list(values)
+                if len(values) == 0:
+                    raise ValueError(f'No values given for {name}')
+                self.dims.append(('choice', values))
+
+    def __repr__(self):
+        """
+        Representation of SearchSpace object.
+
+        Returns:
+            str: Representation of SearchSpace object.
+        """
+        return f'<SearchSpace: names={self.names}, dims={self.dims}>'
+
+    def __len__(self):
+        """
+        Number of parameters.
+
+        Returns:
+            int: Number of parameters
+        """
+        return len(self.names)
+
+    def size(self) -> float:
+        """
+        Number of distinct parameter combinations; inf if some interval is continuous.
+
+        Returns:
+            float: Number of combinations
+        """
+        size = 1.0
+        for kind, spec in self.dims:
+            if kind == 'choice':
+                size *= len(spec)
+            elif spec[2]:
+                size *= spec[1] - spec[0] + 1
+            else:
+                return np.inf
+        return size
+
+    def decode(self, u: np.ndarray) -> Dict[str, Any]:
+        """
+        Parameter values of a point of the unit cube.
+
+        Args:
+            u (np.ndarray): Point in [0, 1]^len(self)
+
+        Returns:
+            Dict[str, Any]: Parameter name -> value
+        """
+        params = dict()
+        for name, (kind, spec), x in zip(self.names, self.dims, np.clip(u, 0.0, 1.0)):
+            if kind == 'choice':
+                params[name] = spec[min([int(x * len(spec)), len(spec) - 1])]
+            else:
+                low, high, is_int = spec
+                params[name] = int(round(low + x * (high - low))) if is_int else float(low + x * (high - low))
+        return params
+
+    def encode(self, params: Dict[str, Any]) -> np.ndarray:
+        """
+        Canonical point of the unit cube for parameter values; discrete choices map to the middle of their cell.
+
+        Args:
+            params (Dict[str, Any]): Parameter name -> value
+
+        Returns:
+            np.ndarray: Point in [0, 1]^len(self)
+        """
+        u = np.zeros(shape=(len(self),))
+        for idx, (name, (kind, spec)) in enumerate(zip(self.names, self.dims)):
+            if kind == 'choice':
+                u[idx] = (spec.index(params[name]) + 0.5) / len(spec)
+            else:
+                low, high, _ = spec
+                u[idx] = 0.5 if high == low else (params[name] - low) / (high - low)
+        return u
+#endregion
+
+#region
+class GaussianProcessOptimizer:
+    """
+    Sequential model-based optimizer for noisy sampler scores. A Gaussian process with a Matern 5/2 kernel is fit to the scores observed
+    so far, and new parameter combinations are proposed by maximizing expected improvement over random candidates in the unit cube. A
+    batch of proposals is built with the kriging believer heuristic: each proposal is added as a pseudo-observation at the model's mean
+    before the next one is chosen, so the batch spreads out and can be evaluated in parallel. The first proposals are a random design.
+    """
+    def __init__(self, space: SearchSpace, n_initial: int=None, n_candidates: int=2048, seed: int=None):
+        """
+        Initializes an optimizer with no observations.
+
+        Args:
+            space (SearchSpace): Parameters to optimize
+            n_initial (int, optional): Number of random proposals before the model is used; 2 * len(space) + 1 if None. Defaults to None.
+            n_candidates (int, optional): Number of random points expected improvement is maximized over. Defaults to 2048.
+            seed (int, optional): Seed of random number generator. Defaults to None.
+        """
+        self.space = space
+        self.n_initial = 2 * len(space) + 1 if n_initial is None else n_initial
+        self.n_candidates = n_candidates
+        self.rng = np.random.default_rng(seed=seed)
+        self.X = np.zeros(shape=(0, len(space)))
+        self.y = np.zeros(shape=(0,))
+        self.history: List[Tuple[Dict[str, Any], float]] = list()
+
+    def __repr__(self):
+        """
+        Representation of GaussianProcessOptimizer object.
+
+        Returns:
+            str: Representation of GaussianProcessOptimizer object.
+        """
+        return f'<GaussianProcessOptimizer: space={repr(self.space)}, n_observed={len(self.history)}>'
+
+    @staticmethod
+    def _kernel(A: np.ndarray, B: np.ndarray, lengthscale: float) -> np.ndarray:
+        """
+        Matern 5/2 kernel matrix between the rows of A and B.
+        """
+        r = np.sqrt(np.maximum(((A[:, None, :] - B[None, :, :]) ** 2).sum(axis=2), 0.0)) * np.sqrt(5.0) / lengthscale
+        return (1.0 + r + r ** 2 / 3.0) * np.exp(-r)
+
+    def _fit(self, X: np.ndarray, y: np.ndarray) -> Tuple[float, np.ndarray, np.ndarray, float, float]:
+        """
+        Fits the process to standardized scores, choosing the lengthscale with the highest marginal likelihood from a small grid.
+        Returns (lengthscale, Cholesky factor, weights, score mean, score scale).
+        """
+        mean, scale = y.mean(), y.std() if y.std() > 0 else 1.0
+        z = (y - mean) / scale
+        best = None
+        for lengthscale in (0.1, 0.2, 0.4, 0.8):
+            K = self._kernel(A=X, B=X, lengthscale=lengthscale) + 1e-2 * np.eye(X.shape[0])  # noise term for noisy scores
+            L = np.linalg.cholesky(K)
+            alpha = np.linalg.solve(L.T, np.linalg.solve(L, z))
+            log_likelihood = -0.5 * z @ alpha - np.log(np.diag(L)).sum()
+            if best is None or log_likelihood > best[0]:
+                best = (log_likelihood, lengthscale, L, alpha)
+        return best[1], best[2], best[3], mean, scale
+
+    def _predict(self, fit: Tuple[float, np.ndarray, np.ndarray, float, float], X: np.ndarray, U: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Posterior mean and standard deviation (standardized units) at the rows of U.
+        """
+        lengthscale, L, alpha, _, _ = fit
+        Ks = self._kernel(A=U, B=X, lengthscale=lengthscale)
+        v = np.linalg.solve(L, Ks.T)
+        return Ks @ alpha, np.sqrt(np.maximum(1.0 - (v ** 2).sum(axis=0), 1e-12))
+
+    def ask(self, n: int=1) -> List[Dict[str, Any]]:
+        """
+        Proposes a batch of parameter combinations not evaluated yet (as far as the space has unevaluated combinations).
+
+        Args:
+            n (int, optional): Number of proposals. Defaults to 1.
+
+        Returns:
+            List[Dict[str, Any]]: Parameter combinations
+        """
+        seen = {tuple(map(repr, params.values())) for params, _ in self.history}
+        proposals = list()
+        X, y = self.X.copy(), self.y.copy()
+        for _ in range(n * 10):
+            if len(proposals) == n:
+                break
+            fit = None
+            if X.shape[0] < max([self.n_initial, 1]):
+                u = self.rng.random(size=(len(self.space),))
+            else:
+                fit = self._fit(X=X, y=y)
+                U = self.rng.random(size=(self.n_candidates, len(self.space)))
+                mu, sigma = self._predict(fit=fit, X=X, U=U)
+                best = ((y - fit[3]) / fit[4]).max()
+                gamma = (mu - best) / sigma
+                ei = sigma * (gamma * ndtr(gamma) + np.exp(-0.5 * gamma ** 2) / np.sqrt(2 * np.pi))
+                u = U[int(np.argmax(ei))]
+
+            params = self.space.decode(u=u)
+            key = tuple(map(repr, params.values()))
+            if key in seen and len(seen) < self.space.size():
+                continue
+            seen.add(key)
+            proposals.append(params)
+
+            # Kriging believer: pretend the proposal scored the model's mean so the rest of the batch looks elsewhere
+            u = self.space.encode(params=params)
+            if fit is None:
+                believed = y.mean() if y.size > 0 else 0.0
+            else:
+                believed = fit[3] + fit[4] * self._predict(fit=fit, X=X, U=u[None, :])[0][0]
+            X, y = np.vstack((X, u[None, :])), np.append(y, believed)
+        return proposals
+
+    def tell(self, params_list: List[Dict[str, Any]], scores: Iterable[float]):
+        """
+        Records the scores of evaluated parameter combinations.
+
+        Args:
+            params_list (List[Dict[str, Any]]): Evaluated combinations, eg. from ask
+            scores (Iterable[float]): Score of each combination; higher is better
+        """
+        for params, score in zip(params_list, scores):
+            self.X = np.vstack((self.X, self.space.encode(params=params)[None, :]))
+            self.y = np.append(self.y, float(score))
+            self.history.append((params, float(score)))
+
+    def best(self) -> Tuple[Dict[str, Any], float]:
+        """
+        Best parameter combination observed so far.
+
+        Raises:
+            ValueError: Nothing has been observed yet
+
+        Returns:
+            Tuple[Dict[str, Any], float]: Parameter combination and its score
+        """
+        if len(self.history) == 0:
+            raise ValueError('No scores have been observed yet')
+        return max(self.history, key=lambda item: item[1])
+#endregion
@@ -0,0 +1,287 @@
+
+import hashlib
+import json
+import numpy as np
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from typing import Any, Callable, Dict, Iterable, List, Tuple
+
+from NetworkSamplingCSR import CSRGraph
+
+#region
+def component_roots(src: np.ndarray, dst: np.ndarray, number_of_nodes: int) -> np.ndarray:
+    """
+    Vectorized union-find: every round hooks the larger root of each edge onto the smaller one, then compresses
+    paths by pointer jumping until every edge has both endpoints under the same root.
+
+    Args:
+        src (np.ndarray): First endpoint of every edge
+        dst (np.ndarray): Second endpoint of every edge
+        number_of_nodes (int): Number of nodes
+
+    Returns:
+        np.ndarray: Root of every node; the root is the smallest node id of its connected component
+    """
+    parent = np.arange(number_of_nodes, dtype=np.int64)
+    while True:
+        ru, rv = parent[src], parent[dst]
+        if np.array_equal(ru, rv):
+            return parent
+        np.minimum.at(parent, np.maximum(ru, rv), np.minimum(ru, rv))
+        while True:
+            grandparent = parent[parent]
+            if np.array_equal(grandparent, parent):
+                break
+            parent = grandparent
+
+def stitch_components(src: np.ndarray, dst: np.ndarray, number_of_nodes: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Connects all components with a linear chain through one node per component, adding c - 1 edges for c components
+    instead of an edge between every pair of components.
+
+    Args:
+        src (np.ndarray): First endpoint of every edge
+        dst (np.ndarray): Second endpoint of every edge
+        number_of_nodes (int): Number of nodes
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Endpoints of the edges with the chain edges appended
+    """
+    roots = np.unique(component_roots(src=src, dst=dst, number_of_nodes=number_of_nodes))
+
+    if __debug__:
+        print(f'number of connected components (before): {roots.size}')
+
+    return np.concatenate((src, roots[:-1])), np.concatenate((dst, roots[1:]))
+
+def _simple_edges(src: np.ndarray, dst: np.ndarray, number_of_nodes: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Drops self-loops and duplicate edges, returning each undirected edge once as (smaller, larger) endpoint.
+    """
+    lo, hi = np.minimum(src, dst).astype(np.int64), np.maximum(src, dst).astype(np.int64)
+    keep = lo != hi
+    codes = np.unique(lo[keep] * number_of_nodes + hi[keep])
+    return codes // number_of_nodes, codes % number_of_nodes
+#endregion
+
+#region
+def gnm_edges(n: int, m: int, rng: np.random.Generator) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Uniform random graph with n nodes and m edges, drawing candidate edges in vectorized batches and rejecting
+    self-loops and duplicates.
+
+    Args:
+        n (int): Number of nodes
+        m (int): Number of edges; at most n * (n - 1) / 2
+        rng (np.random.Generator): Random number generator
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Edge endpoints
+    """
+    if m > n * (n - 1) // 2:
+        raise ValueError(f'm ({m}) exceeds the number of possible edges of {n} nodes')
+
+    codes = np.asarray(a=[], dtype=np.int64)
+    while codes.size < m:
+        batch = int((m - codes.size) * 1.1) + 16
+        src, dst = _simple_edges(src=rng.integers(low=0, high=n, size=batch), dst=rng.integers(low=0, high=n, size=batch), number_of_nodes=n)
+        codes = np.union1d(codes, src * n + dst)
+    codes = rng.permutation(codes)[:m]
+    return codes // n, codes % n
+
+def ba_edges(n: int, m: int, rng: np.random.Generator) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Preferential attachment graph by the Batagelj-Brandes edge-copying scheme. Slot 2k + 1 copies the node at a
+    uniformly drawn earlier slot r; chains of odd slots copying odd slots are resolved together by pointer jumping,
+    so the whole graph is generated without a loop over nodes. Duplicate edges and self-loops are dropped, so a few
+    nodes may end up with fewer than m edges.
+
+    Args:
+        n (int): Number of nodes
+        m (int): Number of edges attached per new node
+        rng (np.random.Generator): Random number generator
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Edge endpoints
+    """
+    k = np.arange(n * m, dtype=np.int64)
+    target = (rng.random(size=n * m) * (2 * k + 1)).astype(np.int64)  # earlier slot in [0, 2k]
+    while True:
+        odd = target % 2 == 1
+        if not odd.any():
+            break
+        target[odd] = target[target[odd] // 2]
+    return k // m, (target // 2) // m
+
+def caterpillar_edges(spine_length: int, n_leaves: int, rng: np.random.Generator) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Caterpillar tree: a path of 'spine_length' nodes with 'n_leaves' leaves attached to uniformly random spine nodes.
+
+    Args:
+        spine_length (int): Number of spine nodes
+        n_leaves (int): Number of leaves
+        rng (np.random.Generator): Random number generator
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Edge endpoints
+    """
+    spine = np.arange(spine_length, dtype=np.int64)
+    leaves = np.arange(spine_length, spine_length + n_leaves, dtype=np.int64)
+    return np.concatenate((spine[:-1], rng.integers(low=0, high=spine_length, size=n_leaves))), np.concatenate((spine[1:], leaves))
+
+def lobster_edges(spine_length: int, n_branches: int, n_leaves: int, rng: np.random.Generator) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Lobster tree: a caterpillar with 'n_branches' branches on the spine and 'n_leaves' leaves attached to uniformly
+    random branch nodes.
+
+    Args:
+        spine_length (int): Number of spine nodes
+        n_branches (int): Number of branch nodes attached to the spine
+        n_leaves (int): Number of leaves attached to branch nodes
+        rng (np.random.Generator): Random number generator
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Edge endpoints
+    """
+    src, dst = caterpillar_edges(spine_length=spine_length, n_leaves=n_branches, rng=rng)
+    leaves = np.arange(spine_length + n_branches, spine_length + n_branches + n_leaves, dtype=np.int64)
+    parents = rng.integers(low=spine_length, high=spine_length + max([n_branches, 1]), size=n_leaves) if n_branches > 0 else rng.integers(low=0, high=spine_length, size=n_leaves)
+    return np.concatenate((src, parents)), np.concatenate((dst, leaves))
+
+# model name -> (edge generator, function of params giving the number of nodes)
+GENERATORS: Dict[str, Tuple[Callable, Callable]] = {
+    'gnm': (gnm_edges, lambda params: params['n']),
+    'ba': (ba_edges, lambda params: params['n']),
+    'caterpillar': (caterpillar_edges, lambda params: params['spine_length'] + params['n_leaves']),
+    'lobster': (lobster_edges, lambda params: params['spine_length'] + params['n_branches'] + params['n_leaves'])
+}
+#endregion
+
+#region
+def benchmark_graph(model: str, params: Dict[str, Any], seed: int=0, connect: bool=True, cache_dir: str=None, name: str=None) -> CSRGraph:
+    """
+    Generates a benchmark graph directly into CSR form, optionally stitching its components into one with a chain of
+    c - 1 edges. With cache_dir, each graph is written once under a key derived from (model, params, seed, connect)
+    and memory-mapped from disk on every later call instead of being regenerated. The graph is written to a temporary
+    directory first and moved into place complete, so a cached path always holds a whole graph.
+
+    Args:
+        model (str): One of 'gnm', 'ba', 'caterpillar', 'lobster'
+        params (Dict[str, Any]): Keyword arguments of the matching generator, eg. {'n': 1000, 'm': 5000} for 'gnm'
+        seed (int, optional): Seed of random number generator. Defaults to 0.
+        connect (bool, optional): Whether to stitch all components together. Defaults to True.
+        cache_dir (str, optional): Directory of cached graphs; nothing is cached if None. Defaults to None.
+        name (str, optional): Name of graph. Defaults to None.
+
+    Raises:
+        ValueError: model is not in GENERATORS
+
+    Returns:
+        CSRGraph: Generated or cached graph
+    """
+    if model not in GENERATORS:
+        raise ValueError(f'model ({model}) must be one of {list(GENERATORS.keys())}')
+
+    path = None
+    if cache_dir is not None:
+        key = json.dumps(obj={'model': model, 'params': params, 'seed': seed, 'connect': connect}, sort_keys=True, default=str)
+        path = os.path.join(cache_dir, f'{model}_{hashlib.sha1(key.encode()).hexdigest()[:16]}')
+        if os.path.exists(path=path):
+            if __debug__:
+                print(f'benchmark_graph: loading cached {model} graph from {path}')
+            return CSRGraph.load(path=path)
+
+    generator, count_nodes = GENERATORS[model]
+    number_of_nodes = count_nodes(params)
+    src, dst = generator(rng=np.random.default_rng(seed=seed), **params)
+    src, dst = _simple_edges(src=src, dst=dst, number_of_nodes=number_of_nodes)
+    if connect:
+        src, dst = stitch_components(src=src, dst=dst, number_of_nodes=number_of_nodes)
+
+    graph = CSRGraph.from_edges(src=src, dst=dst, number_of_nodes=number_of_nodes, name=name)
+    if path is None:
+        return graph
+
+    # Written next to its final place and renamed in one step, so an interrupted write never leaves a partial graph under path
+    os.makedirs(name=cache_dir, exist_ok=True)
+    tmp_path = tempfile.mkdtemp(dir=cache_dir, prefix=f'.{os.path.basename(path)}.tmp')
+    try:
+        graph.save(path=tmp_path)
+        os.replace(src=tmp_path, dst=path)
+    except OSError:
+        if not os.path.exists(path=path):
+            raise
+    finally:
+        shutil.rmtree(path=tmp_path, ignore_errors=True)  # left over only if another process cached the same graph first
+    return CSRGraph.load(path=path)
+#endregion
+
+#region
+# Modules that importing the core API (NSMethod, NetworkSampler, the samplers, the scorers) must not load, and the time it may take in a fresh
+# interpreter; NetworkSampling imports them on first use instead.
+HEAVY_MODULES = ('pandas', 'matplotlib', 'param', 'joblib', 'tqdm', 'littleballoffur', 'scipy.stats', 'scipy.sparse')
+IMPORT_BUDGET = 1.0
+
+def import_cost(module: str='NetworkSampling', n_runs: int=3) -> Tuple[float, List[str]]:
+    """
+    Time to import a module in a fresh interpreter, as paid by every spawned pool worker and short script, and the HEAVY_MODULES it
+    loads. The directory of this file is put on the import path of the interpreter.
+
+    Args:
+        module (str, optional): Module to import. Defaults to 'NetworkSampling'.
+        n_runs (int, optional): Number of fresh interpreters; the fastest import is reported. Defaults to 3.
+
+    Raises:
+        ValueError: The import fails
+
+    Returns:
+        Tuple[float, List[str]]: Seconds to import module; heavy modules loaded by it
+    """
+    code = ('import json, sys, time\n'
+            'start = time.perf_counter()\n'
+            f'import {module}\n'
+            'print(json.dumps([time.perf_counter() - start, [m for m in json.loads(sys.argv[1]) if m in sys.modules]]))')
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join([os.path.dirname(os.path.abspath(__file__))] + ([env['PYTHONPATH']] if 'PYTHONPATH' in env else []))
+
+    runs = list()
+    for _ in range(n_runs):
+        proc = subprocess.run([sys.executable, '-c', code, json.dumps(HEAVY_MODULES)], capture_output=True, text=True, env=env)
+        if proc.returncode != 0:
+            raise ValueError(f'Importing {module} failed:\n{proc.stderr}')
+        runs.append(json.loads(proc.stdout.strip().splitlines()[-1]))
+    seconds, loaded = min(runs, key=lambda run: run[0])
+    return seconds, loaded
+
+def check_import_budget(modules: Iterable[str]=('NetworkSampling', 'NetworkSamplingFunctions', 'NetworkSamplingScorer'), budget: float=IMPORT_BUDGET) -> Dict[str, float]:
+    """
+    Checks that each module imports within budget without loading any of HEAVY_MODULES.
+
+    Args:
+        modules (Iterable[str], optional): Modules to check. Defaults to ('NetworkSampling', 'NetworkSamplingFunctions',
+            'NetworkSamplingScorer').
+        budget (float, optional): Seconds each import may take. Defaults to IMPORT_BUDGET.
+
+    Raises:
+        ValueError: A module takes longer than budget or loads a heavy module
+
+    Returns:
+        Dict[str, float]: Seconds to import each module
+    """
+    costs = dict()
+    for module in modules:
+        seconds, loaded = import_cost(module=module)
+        if len(loaded) > 0:
+            raise ValueError(f'Importing {module} loads heavy modules {loaded}')
+        elif seconds > budget:
+            raise ValueError(f'Importing {module} takes {seconds:.3f}s, above the budget of {budget:.3f}s')
+        costs[module] = seconds
+
+    if __debug__:
+        print(f'check_import_budget: {costs}')
+
+    return costs
+#endregion
@@ -0,0 +1,351 @@
+
+import json
+import networkx as nx
+import numpy as np
+import os
+from typing import Any, Callable, Iterable, Iterator, Tuple, Union
+
+# File names used for the on-disk CSR layout inside a graph directory
+INDPTR_FILE = 'indptr.npy'
+INDICES_FILE = 'indices.npy'
+DEGREE_FILE = 'degree.npy'
+META_FILE = 'meta.json'
+
+def _index_dtype(number_of_nodes: int):
+    """
+    Smallest signed integer dtype able to hold every node id of a graph.
+
+    Args:
+        number_of_nodes (int): Number of nodes in graph
+
+    Returns:
+        np.dtype: np.int32 if node ids fit in 32 bits, else np.int64
+    """
+    return np.int32 if number_of_nodes < np.iinfo(np.int32).max else np.int64
+
+#region
+class CSRGraph:
+    """
+    Read-only undirected graph stored in compressed sparse row (CSR) form. The neighbors of node n are
+    indices[indptr[n]:indptr[n + 1]] and degree[n] is the number of such neighbors. Nodes are the contiguous
+    integers 0..n-1. When loaded from disk, all three arrays are np.memmap objects, so only the pages touched
+    while sampling are ever read into memory.
+
+    CSRGraph exposes the small subset of the nx.Graph interface used by the custom samplers in
+    NetworkSamplingFunctions.py ('n in graph', graph.neighbors(n=n), graph.degree[n], graph.subgraph(nodes=nodes)),
+    so it can be passed directly to those samplers and to NetworkSampler / NetworkSamplerGrid. Samples are
+    returned as small in-memory nx.Graph objects, which keeps every scorer in NetworkSamplingScorer usable as is.
+    """
+    def __init__(self, indptr: np.ndarray, indices: np.ndarray, degree: np.ndarray=None, name: str=None, path: str=None):
+        """
+        Wraps existing CSR arrays without copying them.
+
+        Args:
+            indptr (np.ndarray): Row offsets of length number_of_nodes + 1
+            indices (np.ndarray): Concatenated neighbor lists of length 2 * number_of_edges
+            degree (np.ndarray, optional): Degree per node; derived from indptr if None. Defaults to None.
+            name (str, optional): Name of graph used as label in NetworkSamplerGrid tables. Defaults to None.
+            path (str, optional): Directory the arrays were loaded from, if any. Defaults to None.
+
+        Raises:
+            ValueError: indptr does not end at the length of indices
+        """
+        if indptr[-1] != indices.shape[0]:
+            raise ValueError(f'Last entry of indptr ({indptr[-1]}) does not equal the length of indices ({indices.shape[0]})')
+
+        self.indptr = indptr
+        self.indices = indices
+        self.degree = np.diff(indptr) if degree is None else degree
+        self.name = name
+        self.path = path
+
+    def __repr__(self):
+        """
+        Representation of CSRGraph object.
+
+        Returns:
+            str: Representation of CSRGraph object.
+        """
+        return f'<CSRGraph: name={self.name}, number_of_nodes={self.number_of_nodes()}, number_of_edges={self.number_of_edges()}, path={self.path}>'
+
+    def __len__(self):
+        """
+        Number of nodes in graph.
+
+        Returns:
+            int: Number of nodes
+        """
+        return self.number_of_nodes()
+
+    def __iter__(self) -> Iterator[int]:
+        """
+        Iterates over all node ids.
+
+        Returns:
+            Iterator[int]: Node ids 0..n-1
+        """
+        return iter(range(self.number_of_nodes()))
+
+    def __contains__(self, n: Any):
+        """
+        Whether n is a node id of graph. Non-integer values are never nodes.
+
+        Args:
+            n (Any): Candidate node
+
+        Returns:
+            bool: True if n is a node of graph
+        """
+        if isinstance(n, (bool, np.bool_)) or not isinstance(n, (int, np.integer)):
+            return False
+        return 0 <= n < self.number_of_nodes()
+
+    # ACCESSORS
+    def number_of_nodes(self):
+        """
+        Number of nodes in graph.
+
+        Returns:
+            int: Number of nodes
+        """
+        return int(self.indptr.shape[0] - 1)
+
+    def number_of_edges(self):
+        """
+        Number of undirected edges in graph.
+
+        Returns:
+            int: Number of edges
+        """
+        return int(self.indices.shape[0] // 2)
+
+    def neighbors(self, n: int) -> np.ndarray:
+        """
+        Neighbors of a node as a view into indices; no copy is made for memory-mapped graphs.
+
+        Args:
+            n (int): Node id
+
+        Raises:
+            ValueError: n is not a node of graph
+
+        Returns:
+            np.ndarray: Neighbor ids of n
+        """
+        if n not in self:
+            raise ValueError(f'Node {n} must exist inside network {self}')
+        return self.indices[self.indptr[n]:self.indptr[n + 1]]
+
+    def subgraph(self, nodes: Iterable[int]) -> nx.Graph:
+        """
+        Induced subgraph over the given nodes, materialized as an in-memory nx.Graph. Only the rows of the given
+        nodes are read.
+
+        Args:
+            nodes (Iterable[int]): Node ids to keep
+
+        Returns:
+            nx.Graph: Induced subgraph
+        """
+        node_array = np.unique(np.fromiter((int(n) for n in nodes), dtype=np.int64))
+        sub = nx.Graph(name=self.name)
+        sub.add_nodes_from(node_array.tolist())
+        for n in node_array:
+            nbrs = np.asarray(self.indices[self.indptr[n]:self.indptr[n + 1]])
+            kept = nbrs[np.isin(element=nbrs, test_elements=node_array, assume_unique=False)]
+            kept = kept[kept > n]  # each undirected edge is added once
+            sub.add_edges_from((int(n), int(m)) for m in kept)
+        return sub
+
+    def to_networkx(self) -> nx.Graph:
+        """
+        Full in-memory copy of graph as nx.Graph, built straight from the edge arrays in one pass.
+
+        Returns:
+            nx.Graph: Graph with the same nodes and edges
+        """
+        n = self.number_of_nodes()
+        src = np.repeat(np.arange(n, dtype=np.int64), np.diff(np.asarray(self.indptr, dtype=np.int64)))
+        dst = np.asarray(self.indices, dtype=np.int64)
+        keep = src < dst  # each undirected edge once
+        graph = nx.Graph(name=self.name)
+        graph.add_nodes_from(range(n))
+        graph.add_edges_from(zip(src[keep].tolist(), dst[keep].tolist()))
+        return graph
+
+    def to_scipy(self):
+        """
+        Adjacency matrix sharing the indptr / indices buffers of graph.
+
+        Returns:
+            scipy.sparse.csr_matrix: Binary n x n adjacency matrix
+        """
+        from scipy.sparse import csr_matrix
+
+        n = self.number_of_nodes()
+        data = np.ones(shape=(self.indices.shape[0],), dtype=np.float64)
+        return csr_matrix((data, self.indices, self.indptr), shape=(n, n))
+
+    # MUTATORS
+    def save(self, path: str):
+        """
+        Writes graph to a directory as .npy arrays readable by CSRGraph.load.
+
+        Args:
+            path (str): Directory to write into; created if absent
+
+        Returns:
+            CSRGraph: Memory-mapped graph read back from path
+        """
+        os.makedirs(name=path, exist_ok=True)
+        np.save(file=os.path.join(path, INDPTR_FILE), arr=np.asarray(self.indptr))
+        np.save(file=os.path.join(path, INDICES_FILE), arr=np.asarray(self.indices))
+        np.save(file=os.path.join(path, DEGREE_FILE), arr=np.asarray(self.degree))
+        with open(file=os.path.join(path, META_FILE), mode='w') as f:
+            json.dump(obj={'name': self.name, 'number_of_nodes': self.number_of_nodes(), 'number_of_edges': self.number_of_edges()}, fp=f)
+        return CSRGraph.load(path=path)
+
+    # CONSTRUCTORS
+    @classmethod
+    def load(cls, path: str, mmap_mode: str='r'):
+        """
+        Opens a graph directory written by CSRGraph.save or build_csr.
+
+        Args:
+            path (str): Graph directory
+            mmap_mode (str, optional): Mode passed to np.load; None reads the arrays fully into memory. Defaults to 'r'.
+
+        Raises:
+            ValueError: path is not a CSR graph directory
+
+        Returns:
+            CSRGraph: Graph backed by np.memmap arrays
+        """
+        if not os.path.exists(path=os.path.join(path, INDPTR_FILE)):
+            raise ValueError(f'{path} is not a CSR graph directory')
+
+        name = None
+        if os.path.exists(path=os.path.join(path, META_FILE)):
+            with open(file=os.path.join(path, META_FILE), mode='r') as f:
+                name = json.load(fp=f).get('name')
+
+        return cls(indptr=np.load(file=os.path.join(path, INDPTR_FILE), mmap_mode=mmap_mode),
+                    indices=np.load(file=os.path.join(path, INDICES_FILE), mmap_mode=mmap_mode),
+                    degree=np.load(file=os.path.join(path, DEGREE_FILE), mmap_mode=mmap_mode),
+                    name=name,
+                    path=path)
+
+    @classmethod
+    def from_networkx(cls, graph: nx.Graph, name: str=None):
+        """
+        Converts an in-memory graph whose nodes are the integers 0..n-1.
+
+        Args:
+            graph (nx.Graph): Graph to convert
+            name (str, optional): Name of new graph; graph.name is used if None. Defaults to None.
+
+        Raises:
+            ValueError: Nodes of graph are not the contiguous integers 0..n-1
+
+        Returns:
+            CSRGraph: In-memory CSR copy of graph
+        """
+        n = graph.number_of_nodes()
+        if set(graph.nodes) != set(range(n)):
+            raise ValueError('Nodes of graph must be the contiguous integers 0..n-1')
+
+        dtype = _index_dtype(number_of_nodes=n)
+        edges = np.asarray(a=list(graph.edges), dtype=dtype).reshape(-1, 2)
+        return cls.from_edges(src=edges[:, 0], dst=edges[:, 1], number_of_nodes=n, name=name if name is not None else graph.name)
+
+    @classmethod
+    def from_edges(cls, src: np.ndarray, dst: np.ndarray, number_of_nodes: int, name: str=None):
+        """
+        Builds an in-memory graph from arrays of undirected edge endpoints. Each edge must appear once.
+
+        Args:
+            src (np.ndarray): First endpoint of every edge
+            dst (np.ndarray): Second endpoint of every edge
+            number_of_nodes (int): Number of nodes in graph
+            name (str, optional): Name of graph. Defaults to None.
+
+        Returns:
+            CSRGraph: In-memory CSR graph
+        """
+        dtype = _index_dtype(number_of_nodes=number_of_nodes)
+        rows = np.concatenate((src, dst)).astype(np.int64, copy=False)
+        cols = np.concatenate((dst, src)).astype(dtype, copy=False)
+        order = np.argsort(rows, kind='stable')
+        degree = np.bincount(rows, minlength=number_of_nodes).astype(dtype)
+        indptr = np.zeros(shape=(number_of_nodes + 1,), dtype=np.int64)
+        np.cumsum(degree, out=indptr[1:])
+        return cls(indptr=indptr, indices=cols[order], degree=degree, name=name)
+#endregion
+
+#region
+def build_csr(edge_chunks: Callable[[], Iterable[Tuple[np.ndarray, np.ndarray]]], number_of_nodes: int, path: str, name: str=None):
+    """
+    Out-of-core CSR construction. Edges are streamed twice from 'edge_chunks', once to count degrees and once to
+    scatter neighbors into a memory-mapped indices array, so only one chunk of edges and the O(n) offset arrays are
+    held in memory at any time.
+
+    Args:
+        edge_chunks (Callable[[], Iterable[Tuple[np.ndarray, np.ndarray]]]): Factory returning a fresh iterable of
+            (src, dst) array pairs each time it is called; each undirected edge must appear exactly once overall.
+        number_of_nodes (int): Number of nodes; every endpoint must be in 0..number_of_nodes-1
+        path (str): Directory to write the graph into; created if absent
+        name (str, optional): Name of graph. Defaults to None.
+
+    Returns:
+        CSRGraph: Memory-mapped graph written to path
+    """
+    os.makedirs(name=path, exist_ok=True)
+    dtype = _index_dtype(number_of_nodes=number_of_nodes)
+
+    # First pass: degrees
+    degree = np.zeros(shape=(number_of_nodes,), dtype=np.int64)
+    for src, dst in edge_chunks():
+        degree += np.bincount(src, minlength=number_of_nodes)
+        degree += np.bincount(dst, minlength=number_of_nodes)
+
+    indptr = np.zeros(shape=(number_of_nodes + 1,), dtype=np.int64)
+    np.cumsum(degree, out=indptr[1:])
+    np.save(file=os.path.join(path, INDPTR_FILE), arr=indptr)
+    np.save(file=os.path.join(path, DEGREE_FILE), arr=degree.astype(dtype))
+
+    # Second pass: scatter neighbors into their rows through a write cursor per node
+    indices = np.lib.format.open_memmap(filename=os.path.join(path, INDICES_FILE), mode='w+', dtype=dtype, shape=(int(indptr[-1]),))
+    cursor = indptr[:-1].copy()
+    for src, dst in edge_chunks():
+        rows = np.concatenate((src, dst)).astype(np.int64, copy=False)
+        cols = np.concatenate((dst, src)).astype(dtype, copy=False)
+        if rows.size == 0:
+            continue
+        order = np.argsort(rows, kind='stable')
+        rows, cols = rows[order], cols[order]
+        first = np.searchsorted(rows, rows, side='left')  # start of each row's run inside chunk
+        indices[cursor[rows] + np.arange(rows.size) - first] = cols
+        cursor += np.bincount(rows, minlength=number_of_nodes)
+    indices.flush()
+    del indices
+
+    with open(file=os.path.join(path, META_FILE), mode='w') as f:
+        json.dump(obj={'name': name, 'number_of_nodes': number_of_nodes, 'number_of_edges': int(indptr[-1] // 2)}, fp=f)
+
+    if __debug__:
+        print(f'build_csr: wrote {number_of_nodes} nodes and {int(indptr[-1] // 2)} edges to {path}')
+
+    return CSRGraph.load(path=path)
+
+def as_csr(graph: Union[nx.Graph, CSRGraph]) -> CSRGraph:
+    """
+    Returns graph unchanged if it already is a CSRGraph, otherwise converts it with CSRGraph.from_networkx.
+
+    Args:
+        graph (Union[nx.Graph, CSRGraph]): Graph to convert
+
+    Returns:
+        CSRGraph: CSR view of graph
+    """
+    return graph if isinstance(graph, CSRGraph) else CSRGraph.from_networkx(graph=graph)
+#endregion
@@ -0,0 +1,149 @@
+
+import networkx as nx
+from typing import Any, Dict, Iterable, List, Tuple
+
+from NetworkSamplingFingerprint import _features_cache, _fingerprint_cache
+from NetworkSamplingFunctions import CaterpillarQuotaBFSSampler, CaterpillarQuotaWalkSampler
+from NetworkSamplingRelabel import _relabel_cache
+from NetworkSamplingScorer import _visit_frequency_cache
+from NetworkSamplingVisitFrequency import _transition_cache
+
+def invalidate_graph_caches(graph: nx.Graph):
+    """
+    Drops every structure cached for a graph (RelabelIndex and its CSR copy, fingerprint, structural features, transition matrix,
+    visit frequencies), so they are rebuilt from the graph's current edges on next use; parent statistics such as the clustering summary
+    and spectrum are keyed on the fingerprint and so are recomputed too. Call after changing the edges of a graph in place.
+
+    Args:
+        graph (nx.Graph): Network whose edges have changed
+    """
+    for cache in (_relabel_cache, _fingerprint_cache, _features_cache, _transition_cache, _visit_frequency_cache):
+        cache.pop(graph, None)
+
+#region
+class DynamicSample:
+    """
+    Caterpillar sample of a network that receives batches of edge insertions and deletions. The sampler's trace records the step (walk
+    layer or BFS q1 extraction) every node was visited in. An edge change (u, v) can only alter the sampler's choices from the first step at which
+    u or v was visited or competed as an unvisited neighbor of a visited node, so the nodes visited before that step are kept and sampling
+    resumes from them on the updated graph (see 'invalidated_step'). The cost of a repair is local to the changed edges plus the regrown part of the sample;
+    if more than 'max_invalidated' of the sample would be regrown, it is re-sampled from scratch instead.
+    """
+    def __init__(self, sampler: Any, graph: nx.Graph, start_node: Any, max_invalidated: float=0.5):
+        """
+        Samples the network once.
+
+        Args:
+            sampler (Union[CaterpillarQuotaWalkSampler, CaterpillarQuotaBFSSampler]): Sampler to maintain a sample of
+            graph (nx.Graph): Network to be sampled; edge changes are applied to it in place
+            start_node (Any): Node to start the sampling
+            max_invalidated (float, optional): Fraction of invalidated sampled nodes above which a full re-sample is done. Defaults to 0.5.
+
+        Raises:
+            ValueError: sampler is not a caterpillar sampler
+        """
+        if not isinstance(sampler, (CaterpillarQuotaWalkSampler, CaterpillarQuotaBFSSampler)):
+            raise ValueError(f'{type(sampler).__name__} does not support incremental maintenance')
+
+        self.sampler = sampler
+        self.graph = graph
+        self.start_node = start_node
+        self.max_invalidated = max_invalidated
+        self.trace: List[Tuple[Any, int]] = list()
+        self.sampled_network = self.sampler.sample(graph=self.graph, start_node=self.start_node, trace=self.trace)
+        self.steps = self._first_steps()
+        self.last_update: Dict[str, Any] = dict()
+
+    def __repr__(self):
+        """
+        Representation of DynamicSample object.
+
+        Returns:
+            str: Representation of DynamicSample object.
+        """
+        return f'<DynamicSample: sampler={repr(self.sampler)}, start_node={self.start_node}, max_invalidated={self.max_invalidated}, visited={len(self.steps)}>'
+
+    def _first_steps(self) -> Dict[Any, int]:
+        """
+        Step each node of the trace was first visited in.
+        """
+        steps = dict()
+        for n, s in self.trace:
+            steps.setdefault(n, s)
+        return steps
+
+    def _exposure_step(self, n: Any, extra_nbrs: Iterable[Any]) -> float:
+        """
+        First step at which n was visited or could compete as an unvisited neighbor of a visited node. Neighbors through deleted edges
+        are passed as extra_nbrs, since they are no longer in the graph.
+        """
+        step = self.steps.get(n, float('inf'))
+        nbrs = list(self.graph.neighbors(n=n)) if n in self.graph else list()
+        for nbr in nbrs + list(extra_nbrs):
+            if nbr in self.steps:
+                step = min([step, self.steps[nbr] + 1])
+        return step
+
+    def invalidated_step(self, added_edges: Iterable[Tuple[Any, Any]]=(), removed_edges: Iterable[Tuple[Any, Any]]=()) -> float:
+        """
+        First sampling step whose choices may differ after the given edges changed; inf if the sample is unaffected. An endpoint is
+        affected from the first step it was visited in or competed in as an unvisited neighbor of a visited node: its neighbors change
+        if it is visited, and its degree, which ranks it and moves the q1 / q2 cumulative-degree cuts of the visited node, changes either
+        way.
+
+        Args:
+            added_edges (Iterable[Tuple[Any, Any]], optional): Inserted edges. Defaults to ().
+            removed_edges (Iterable[Tuple[Any, Any]], optional): Deleted edges. Defaults to ().
+
+        Returns:
+            float: Step from which visits are invalidated
+        """
+        extra_nbrs = dict()
+        for u, v in list(added_edges) + list(removed_edges):
+            for a, b in ((u, v), (v, u)):
+                extra_nbrs.setdefault(a, set()).add(b)
+
+        step = float('inf')
+        for n, nbrs in extra_nbrs.items():
+            step = min([step, self._exposure_step(n=n, extra_nbrs=nbrs)])
+        return step
+
+    def update(self, added_edges: Iterable[Tuple[Any, Any]]=(), removed_edges: Iterable[Tuple[Any, Any]]=(), apply: bool=True) -> nx.Graph:
+        """
+        Applies a batch of edge changes and repairs the sample.
+
+        Args:
+            added_edges (Iterable[Tuple[Any, Any]], optional): Inserted edges. Defaults to ().
+            removed_edges (Iterable[Tuple[Any, Any]], optional): Deleted edges. Defaults to ().
+            apply (bool, optional): Apply the changes to the graph; pass False if the graph has already been updated. Defaults to True.
+
+        Returns:
+            nx.Graph: Repaired sample
+        """
+        added_edges, removed_edges = list(added_edges), list(removed_edges)
+        if apply:
+            self.graph.remove_edges_from(removed_edges)
+            self.graph.add_edges_from(added_edges)
+        invalidate_graph_caches(graph=self.graph)
+
+        step = self.invalidated_step(added_edges=added_edges, removed_edges=removed_edges)
+        kept = [(n, s) for n, s in self.trace if s < max([step, 1])]  # steps never decrease along a trace, so this is a prefix
+        n_kept = len(set(n for n, _ in kept))
+        invalidated = 1.0 - n_kept / float(len(self.steps))
+        full = invalidated > self.max_invalidated
+
+        self.trace = list() if full else kept
+        self.sampled_network = self.sampler.sample(graph=self.graph, start_node=self.start_node, trace=self.trace)
+        self.steps = self._first_steps()
+        self.last_update = {'added': len(added_edges),
+                            'removed': len(removed_edges),
+                            'invalidated_step': step,
+                            'invalidated': invalidated,
+                            'kept': 0 if full else n_kept,
+                            'full_resample': full}
+
+        if __debug__:
+            print(f'DynamicSample.update: {self.last_update}')
+
+        return self.sampled_network
+#endregion
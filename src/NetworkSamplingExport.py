@@ -0,0 +1,199 @@
+
+import hashlib
+import json
+import networkx as nx
+import numpy as np
+import os
+from typing import Any, Dict, Tuple
+
+# Samples above this many nodes get a pivot MDS layout, whose cost grows with the number of edges rather than n^2
+SPRING_LAYOUT_MAX_NODES = 5000
+
+#region
+def _edge_arrays(graph: nx.Graph) -> Tuple[list, np.ndarray, np.ndarray]:
+    """
+    Node list of a sample and its edges as index arrays into that list.
+    """
+    nodes = list(graph.nodes)
+    index = {n: i for i, n in enumerate(nodes)}
+    edges = np.asarray(a=[(index[u], index[v]) for u, v in graph.edges], dtype=np.int64).reshape(-1, 2)
+    return nodes, edges[:, 0], edges[:, 1]
+
+def sample_fingerprint(graph: nx.Graph) -> str:
+    """
+    Content hash of a sample's node and edge sets, independent of insertion order.
+
+    Args:
+        graph (nx.Graph): Sample of a network
+
+    Returns:
+        str: Hex digest
+    """
+    digest = hashlib.sha1()
+    digest.update(repr(sorted(map(repr, graph.nodes))).encode())
+    digest.update(repr(sorted(tuple(sorted(map(repr, e))) for e in graph.edges)).encode())
+    return digest.hexdigest()
+
+def pivot_mds_layout(n: int, src: np.ndarray, dst: np.ndarray, n_pivots: int=50, seed: int=0) -> np.ndarray:
+    """
+    Pivot MDS layout: hop distances from a few pivot nodes (one BFS per pivot) are double-centered and projected onto
+    their top two singular vectors. Runs in O(n_pivots * (n + m)), so it stays fast on samples of 100k+ nodes.
+
+    Args:
+        n (int): Number of nodes
+        src (np.ndarray): First endpoint index of every edge
+        dst (np.ndarray): Second endpoint index of every edge
+        n_pivots (int, optional): Number of pivot nodes. Defaults to 50.
+        seed (int, optional): Seed for choosing pivots. Defaults to 0.
+
+    Returns:
+        np.ndarray: (n, 2) coordinates
+    """
+    from scipy.sparse import coo_matrix
+    from scipy.sparse.csgraph import shortest_path
+
+    adjacency = coo_matrix((np.ones(shape=(src.size,)), (src, dst)), shape=(n, n)).tocsr()
+    pivots = np.random.default_rng(seed=seed).choice(n, size=min([n_pivots, n]), replace=False)
+    dist = shortest_path(csgraph=adjacency, directed=False, unweighted=True, indices=pivots).T  # (n, n_pivots)
+    finite = np.isfinite(dist)
+    dist[~finite] = dist[finite].max(initial=0) + 1  # separate components are placed one hop beyond the farthest node
+
+    sq = dist ** 2
+    centered = sq - sq.mean(axis=0, keepdims=True) - sq.mean(axis=1, keepdims=True) + sq.mean()
+    u, sv, _ = np.linalg.svd(-0.5 * centered, full_matrices=False)
+    coords = u[:, :2] * sv[:2]
+    if coords.shape[1] < 2:
+        coords = np.pad(coords, ((0, 0), (0, 2 - coords.shape[1])))
+    return coords
+
+def compute_layout(graph: nx.Graph, cache_dir: str=None, seed: int=0) -> np.ndarray:
+    """
+    2-D coordinates of every node of a sample, in graph.nodes order. Small samples get a spring layout, large ones a
+    pivot MDS layout. With cache_dir, coordinates are stored under the sample fingerprint and reused on later
+    exports of the same sample.
+
+    Args:
+        graph (nx.Graph): Sample of a network
+        cache_dir (str, optional): Directory of cached layouts; nothing is cached if None. Defaults to None.
+        seed (int, optional): Seed of spring layout. Defaults to 0.
+
+    Returns:
+        np.ndarray: (number_of_nodes, 2) coordinates scaled to [-1, 1]
+    """
+    path = None
+    if cache_dir is not None:
+        path = os.path.join(cache_dir, f'layout_{sample_fingerprint(graph=graph)[:16]}.npy')
+        if os.path.exists(path=path):
+            return np.load(file=path)
+
+    if graph.number_of_nodes() <= SPRING_LAYOUT_MAX_NODES:
+        pos = nx.spring_layout(G=graph, seed=seed)
+        coords = np.asarray(a=[pos[n] for n in graph.nodes], dtype=np.float32).reshape(-1, 2)
+    else:
+        nodes, src, dst = _edge_arrays(graph=graph)
+        coords = pivot_mds_layout(n=len(nodes), src=src, dst=dst, seed=seed)
+        coords = (coords / max([np.abs(coords).max(), 1e-12])).astype(np.float32)
+
+    if path is not None:
+        os.makedirs(name=cache_dir, exist_ok=True)
+        np.save(file=path, arr=coords)
+    return coords
+
+def collapse_leaves(n: int, src: np.ndarray, dst: np.ndarray, levels: int=1) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Level-of-detail aggregation for caterpillar-like samples. Each round merges every remaining degree-1 node into its
+    only remaining neighbor, so round 1 folds the leaf branches of a caterpillar into its spine, round 2 folds the
+    legs of a lobster, and so on.
+
+    Args:
+        n (int): Number of nodes
+        src (np.ndarray): First endpoint index of every edge
+        dst (np.ndarray): Second endpoint index of every edge
+        levels (int, optional): Number of collapse rounds. Defaults to 1.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray]: Index each node merged into (-1 if never merged); round it merged
+            in (0 if never); number of original nodes each node stands for at the coarsest level
+    """
+    alive = np.ones(shape=(n,), dtype=bool)
+    parent = np.full(shape=(n,), fill_value=-1, dtype=np.int64)
+    collapsed_at = np.zeros(shape=(n,), dtype=np.int64)
+    weight = np.ones(shape=(n,), dtype=np.int64)
+
+    for level in range(1, levels + 1):
+        live_edge = alive[src] & alive[dst]
+        degree = np.bincount(src[live_edge], minlength=n) + np.bincount(dst[live_edge], minlength=n)
+        leaf = alive & (degree == 1)
+
+        u, v = src[live_edge], dst[live_edge]
+        u_leaf, v_leaf = leaf[u], leaf[v]
+        # An isolated leaf pair merges the larger index into the smaller
+        child = np.where(u_leaf & v_leaf, np.maximum(u, v), np.where(u_leaf, u, v))
+        into = np.where(u_leaf & v_leaf, np.minimum(u, v), np.where(u_leaf, v, u))
+        merging = u_leaf | v_leaf
+        child, into = child[merging], into[merging]
+        if child.size == 0:
+            break
+
+        parent[child] = into
+        collapsed_at[child] = level
+        np.add.at(weight, into, weight[child])
+        alive[child] = False
+
+    return parent, collapsed_at, weight
+#endregion
+
+#region
+def export_sample(graph: nx.Graph, path: str, levels: int=1, layout_cache_dir: str=None, binary: bool=None) -> Dict[str, Any]:
+    """
+    Writes a sample as a compact columnar node / edge payload for browser rendering, in place of pyvis HTML that
+    embeds the whole graph. Node coordinates are precomputed (and cached with layout_cache_dir), and every node
+    records which node it collapses into at coarser levels of detail, so a viewer can draw the collapsed spine first
+    and expand branches on zoom.
+
+    The payload holds 'nodes' (id, x, y, parent, collapsed_at, weight), 'edges' (source, target as node indices) and
+    'meta'. A node is visible at level L when collapsed_at is 0 or greater than L.
+
+    Args:
+        graph (nx.Graph): Sample of a network, eg. the result of NetworkSampler.sample
+        path (str): Output file; '.json' writes JSON, '.npz' writes compressed numpy arrays
+        levels (int, optional): Number of leaf collapse rounds. Defaults to 1.
+        layout_cache_dir (str, optional): Directory of cached layouts. Defaults to None.
+        binary (bool, optional): Force binary (True) or JSON (False) output; chosen from extension if None. Defaults to None.
+
+    Returns:
+        Dict[str, Any]: Metadata of the written payload
+    """
+    nodes, src, dst = _edge_arrays(graph=graph)
+    coords = compute_layout(graph=graph, cache_dir=layout_cache_dir)
+    parent, collapsed_at, weight = collapse_leaves(n=len(nodes), src=src, dst=dst, levels=levels)
+
+    meta = {'name': graph.name,
+            'number_of_nodes': len(nodes),
+            'number_of_edges': int(src.size),
+            'levels': levels,
+            'visible_per_level': [int(((collapsed_at == 0) | (collapsed_at > level)).sum()) for level in range(levels + 1)]}
+    binary = path.endswith('.npz') if binary is None else binary
+
+    os.makedirs(name=os.path.dirname(path) or '.', exist_ok=True)
+    if binary:
+        ids = np.asarray(a=nodes) if all(isinstance(n, (int, np.integer)) for n in nodes) else np.asarray(a=[str(n) for n in nodes])
+        np.savez_compressed(path, id=ids, x=coords[:, 0], y=coords[:, 1], parent=parent, collapsed_at=collapsed_at,
+                            weight=weight, source=src, target=dst, meta=np.asarray(a=json.dumps(obj=meta)))
+    else:
+        payload = {'meta': meta,
+                    'nodes': {'id': [n if isinstance(n, (int, str)) else str(n) for n in nodes],
+                            'x': np.round(coords[:, 0], 4).tolist(),
+                            'y': np.round(coords[:, 1], 4).tolist(),
+                            'parent': parent.tolist(),
+                            'collapsed_at': collapsed_at.tolist(),
+                            'weight': weight.tolist()},
+                    'edges': {'source': src.tolist(), 'target': dst.tolist()}}
+        with open(file=path, mode='w') as f:
+            json.dump(obj=payload, fp=f, separators=(',', ':'))
+
+    if __debug__:
+        print(f'export_sample: {meta}')
+
+    return meta
+#endregion
@@ -0,0 +1,141 @@
+
+from collections import OrderedDict
+import hashlib
+import networkx as nx
+import numpy as np
+from typing import Any, Callable, Dict, Hashable, Iterable, Tuple, Union
+import weakref
+
+from NetworkSamplingCSR import CSRGraph
+from NetworkSamplingRelabel import relabel_index
+
+# Per-graph cache of fingerprints with the RelabelIndex they were computed over, dropped automatically once the graph itself is garbage
+# collected and recomputed once relabel_index rebuilds the index after an edit of the graph
+_fingerprint_cache = weakref.WeakKeyDictionary()
+
+def graph_fingerprint(graph: Union[nx.Graph, CSRGraph]) -> str:
+    """
+    Content hash of a graph's node ids and edge set, independent of node and edge insertion order, so the same
+    network loaded in another run gets the same fingerprint. Edges are hashed as sorted integer codes over the
+    graph's RelabelIndex, so no Python-level sort of the edge list is needed. Computed once per graph and cached until relabel_index
+    rebuilds the index of the graph.
+
+    Args:
+        graph (Union[nx.Graph, CSRGraph]): Network
+
+    Returns:
+        str: Hex digest
+    """
+    index = relabel_index(graph=graph)
+    cached_index, fingerprint = _fingerprint_cache.get(graph, (None, None))
+    if cached_index is index:
+        return fingerprint
+
+    csr = index.csr(graph=graph)
+    n = index.number_of_nodes()
+    rank = np.empty(shape=(n,), dtype=np.int64)
+    rank[index._order] = np.arange(n)  # position of each label's id in sorted id order
+
+    rows = np.repeat(np.arange(n, dtype=np.int64), np.asarray(csr.degree, dtype=np.int64))
+    cols = np.asarray(csr.indices, dtype=np.int64)
+    rows, cols = rank[rows], rank[cols]
+    keep = rows < cols  # each undirected edge once
+    codes = np.sort(rows[keep] * n + cols[keep])
+
+    digest = hashlib.sha1()
+    digest.update(str(n).encode())
+    if not index.is_identity:
+        digest.update('\0'.join(map(str, index._sorted_ids.tolist())).encode())
+    digest.update(codes.tobytes())
+    _fingerprint_cache[graph] = (index, digest.hexdigest())
+    return _fingerprint_cache[graph][1]
+
+# Per-graph cache of structural feature vectors
+_features_cache = weakref.WeakKeyDictionary()
+
+# Names of the entries of graph_features(), in order
+GRAPH_FEATURE_NAMES = ('log_nodes', 'log_edges', 'log_mean_degree', 'degree_cv', 'degree_skew')
+
+def graph_features(graph: Union[nx.Graph, CSRGraph]) -> np.ndarray:
+    """
+    Scale-free summary of a graph's size, density and degree moments, used to find structurally similar graphs: log number of nodes,
+    log number of edges, log mean degree (density up to a factor of n), coefficient of variation and skewness of the degree sequence.
+    Euclidean distance between two feature vectors is a usable similarity without further scaling. Computed once per graph and cached.
+
+    Args:
+        graph (Union[nx.Graph, CSRGraph]): Network
+
+    Returns:
+        np.ndarray: Features in GRAPH_FEATURE_NAMES order
+    """
+    if graph in _features_cache:
+        return _features_cache[graph]
+
+    if isinstance(graph, CSRGraph):
+        degree = np.asarray(graph.degree, dtype=np.float64)
+    else:
+        degree = np.fromiter((d for _, d in graph.degree), dtype=np.float64, count=graph.number_of_nodes())
+    n, m = degree.size, degree.sum() / 2
+    mean = degree.mean() if n > 0 else 0.0
+    std = degree.std() if n > 0 else 0.0
+    skew = ((degree - mean) ** 3).mean() / std ** 3 if std > 0 else 0.0
+
+    features = np.asarray(a=[np.log1p(n), np.log1p(m), np.log1p(mean), std / mean if mean > 0 else 0.0, np.sign(skew) * np.log1p(abs(skew))])
+    _features_cache[graph] = features
+    return features
+
+# Statistics of parent networks (clustering summary, spectrum, visit frequencies) keyed by (kind, fingerprint, key) and kept in least
+# recently used order. Keyed on content rather than on the graph object, so a parent unpickled in a pool worker finds the statistics
+# computed for the same network in the process that dispatched it; see parent_statistics
+_parent_statistics = OrderedDict()
+PARENT_STATISTICS_SIZE = 256
+
+def parent_statistic(parent: Union[nx.Graph, CSRGraph], kind: str, key: Hashable, compute: Callable[[], Any]) -> Any:
+    """
+    Statistic of a parent network, computed once per network content and cached for every later trial, in this process and in the pool
+    workers it was shipped to with parent_statistics.
+
+    Args:
+        parent (Union[nx.Graph, CSRGraph]): Network samples are drawn from
+        kind (str): Name of statistic, eg. 'spectrum'
+        key (Hashable): Arguments the statistic depends on besides the parent
+        compute (Callable[[], Any]): Computes the statistic on a cache miss
+
+    Returns:
+        Any: Statistic
+    """
+    entry = (kind, graph_fingerprint(graph=parent), key)
+    if entry not in _parent_statistics:
+        _parent_statistics[entry] = compute()
+
+        if __debug__:
+            print(f'parent_statistic: computed {kind} {key} of {entry[1][:12]}')
+
+    _parent_statistics.move_to_end(entry)
+    while len(_parent_statistics) > PARENT_STATISTICS_SIZE:
+        _parent_statistics.popitem(last=False)
+    return _parent_statistics[entry]
+
+def parent_statistics(parents: Iterable[Union[nx.Graph, CSRGraph]]) -> Dict[Tuple[str, str, Hashable], Any]:
+    """
+    Cached statistics of the given parent networks, to be passed to load_parent_statistics in a pool worker.
+
+    Args:
+        parents (Iterable[Union[nx.Graph, CSRGraph]]): Networks samples are drawn from
+
+    Returns:
+        Dict[Tuple[str, str, Hashable], Any]: (kind, fingerprint, key) -> statistic
+    """
+    fingerprints = set(graph_fingerprint(graph=parent) for parent in parents)
+    return {entry: value for entry, value in _parent_statistics.items() if entry[1] in fingerprints}
+
+def load_parent_statistics(statistics: Dict[Tuple[str, str, Hashable], Any]):
+    """
+    Adds statistics returned by parent_statistics in another process to the cache of this one.
+
+    Args:
+        statistics (Dict[Tuple[str, str, Hashable], Any]): (kind, fingerprint, key) -> statistic
+    """
+    for entry, value in statistics.items():
+        if entry not in _parent_statistics:
+            _parent_statistics[entry] = value
@@ -1,14 +1,16 @@
 
 import copy
 import heapq
-from joblib.parallel import Parallel, delayed
 import multiprocessing as mp
 import networkx as nx
 import numpy as np
 import pdb
 import random
-from typing import Any, Callable, Dict, Iterable, Union
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Tuple, Union
 from NetworkSampling import NSMethod
+from NetworkSamplingCSR import CSRGraph, as_csr
+import NetworkSamplingKernels as kernels
+from NetworkSamplingSketch import VisitSketch
 
 # PROPOSED METHOD
 #region
@@ -41,50 +43,58 @@ class CaterpillarQuotaWalkSampler:
             print(f'q1: {self.q1}')
 
     #region
-    def sample(self, graph: nx.Graph, start_node: int=None):
+    def iter_sample(self, graph: nx.Graph, start_node: int=None, batch: bool=False, trace: List[Tuple[Any, int]]=None) -> Iterator[Union[Any, List[Any]]]:
         """
-        Samples the network
+        Anytime version of 'sample': yields nodes in the order they are visited, starting with start_node, so callers can stop early,
+        score prefixes or stream nodes onward without building a subgraph. Visits continue until more than 'number_of_nodes' nodes are
+        visited.
 
         Args:
-            graph (nx.Graph): Network to be sampled
+            graph (Union[nx.Graph, CSRGraph, Neo4jGraph]): Network to be sampled, either in memory, memory-mapped or database-backed
             start_node (int, optional): Node to start the sampling. Defaults to None.
+            batch (bool, optional): Yield a list of nodes per layer instead of single nodes. Defaults to False.
+            trace (List[Tuple[Any, int]], optional): Filled with (node, layer) of every visit in visit order, (start_node, 0) first. If
+                it already holds a prefix of an earlier trace, that prefix is yielded first and sampling resumes from it, as used by
+                DynamicSample to repair a sample after edge changes. Defaults to None.
+
+        Yields:
+            Union[Any, List[Any]]: Newly visited node, or list of nodes newly visited in one layer
         """
-        # pdb.set_trace(header='CaterpillarQuotaWalk - sample - Entering sample')
+        # pdb.set_trace(header='CaterpillarQuotaWalk - iter_sample - Entering iter_sample')
         if __debug__:
             print('graph: {graph}')
             print('start_node: {start_node}')
 
+        trace = list() if trace is None else trace
+        if len(trace) == 0:
+            trace.append((start_node, 0))
+        prefix = [n for n, _ in trace]
+
         # Node collections
-        visited = set([start_node])
+        visited = set(prefix)
+        # CSR graphs rank neighbors with an array kernel over a visited mask instead of per-neighbor Python lookups
+        visited_mask = None
+        if isinstance(graph, CSRGraph):
+            visited_mask = np.zeros(shape=(graph.number_of_nodes(),), dtype=np.bool_)
+            visited_mask[np.asarray(a=prefix, dtype=np.int64)] = True
         curr_layer = set([start_node])
         next_layer = set()
         # stop = False  # Indicates whether to stop loops once desired number of nodes is sampled
 
         # DEBUGGING PURPOSES
-        layer_counter = 0
-        node_counter = 1
+        layer_counter = trace[-1][1]
+        node_counter = len(prefix)
 
-        # Choosing nodes to contribute to sampling
-        def _sample_at_node(n: Any):
+        def _rank_nbrs(n: Any):
             """
-            Internal helper function that carries out the actual algorithm at a specific visited node
+            Internal helper function that ranks the unvisited neighbors of n by degree descending and finds the q1 and q2 quota cuts
 
             Args:
-                n (Any): Node to visit neighbors from
+                n (Any): Node to rank neighbors of
 
-            Raises:
-                ValueError: n is not part of the graph's vertex set
-                ValueError: n is already visited
+            Returns:
+                Tuple[np.ndarray, int, int]: Ranked unvisited neighbors; index after the q1 group; index after the q2 group
             """
-            # pdb.set_trace(header='CaterpillarQuotaWalk - sample - _sample_at_node - Entering _sample_at_node')
-            if __debug__:
-                print(f'n: {n}')
-
-            if n not in graph:
-                raise ValueError(f'Node {n} must exist inside network {graph}')
-            if n not in visited:
-                raise ValueError(f'Node {n} must be already visited.')
-
             # unvisited neighboring nodes of n rnaked by degree descending
             unvisited_nbrs = []
             for nbr in graph.neighbors(n=n):
@@ -94,7 +104,7 @@ class CaterpillarQuotaWalkSampler:
 
             # No unvisited neighbors left
             if degree_ranked_desc_nbrs.size == 0:
-                return
+                return degree_ranked_desc_nbrs, 0, 0
 
             cumsum_degree = np.cumsum(a=[graph.degree[nbr] for nbr in degree_ranked_desc_nbrs], axis=None)
             sum_degree = np.sum(a=[graph.degree[nbr] for nbr in degree_ranked_desc_nbrs], axis=None)
@@ -104,7 +114,7 @@ class CaterpillarQuotaWalkSampler:
             q1_quota_weight, q2_quota_weight = self.q1 * sum_degree, self.q2 * sum_degree
 
             # Computing indexes of the successor of the last neigbor belonging under q1 threshold and q2 threshold, respectively
-            q1_index, q2_index = np.argwhere(a=cumsum_degree > q1_quota_weight)[0], np.argwhere(a=cumsum_degree > q2_quota_weight)[0]
+            q1_index, q2_index = np.argwhere(a=cumsum_degree > q1_quota_weight)[0, 0], np.argwhere(a=cumsum_degree > q2_quota_weight)[0, 0]
 
             # No nodes have degree that falls at or under even the q1 threshhold, so manually designate first node (index is 0) to belong to q1 group
             q1_index = max([q1_index, 1])
@@ -114,44 +124,116 @@ class CaterpillarQuotaWalkSampler:
                 print(f'cumsum_degree:\n{cumsum_degree}')
                 print(f'sum_degree:\n{sum_degree}')
 
+            return degree_ranked_desc_nbrs, q1_index, q2_index
+
+        # Choosing nodes to contribute to sampling
+        def _sample_at_node(n: Any):
+            """
+            Internal helper function that carries out the actual algorithm at a specific visited node
+
+            Args:
+                n (Any): Node to visit neighbors from
+
+            Raises:
+                ValueError: n is not part of the graph's vertex set
+                ValueError: n is already visited
+            """
+            # pdb.set_trace(header='CaterpillarQuotaWalk - sample - _sample_at_node - Entering _sample_at_node')
+            if __debug__:
+                print(f'n: {n}')
+
+            if n not in graph:
+                raise ValueError(f'Node {n} must exist inside network {graph}')
+            if n not in visited:
+                raise ValueError(f'Node {n} must be already visited.')
+
+            if visited_mask is not None:
+                degree_ranked_desc_nbrs, q1_index, q2_index = kernels.quota_select(indptr=graph.indptr, indices=graph.indices, degree=graph.degree,
+                                                                                    visited=visited_mask, n=n, q1=self.q1, q2=self.q2)
+            else:
+                degree_ranked_desc_nbrs, q1_index, q2_index = _rank_nbrs(n=n)
+
+            # No unvisited neighbors left
+            if degree_ranked_desc_nbrs.size == 0:
+                return []
+
             # Visiting new nodes
             # pdb.set_trace(header='CaterpillarQuotaWalk - sample - _sample_at_node - Adding new nodes to visited and swapping current layer with new layer')
             nonlocal curr_layer
             nonlocal next_layer
             nonlocal node_counter
+            new_nodes = list()
             for nbr in degree_ranked_desc_nbrs[0:int(q1_index)]:
                 visited.add(nbr)
                 next_layer.add(nbr)
+                new_nodes.append(nbr)
+                trace.append((nbr, layer_counter))
+                if visited_mask is not None:
+                    visited_mask[nbr] = True
 
                 node_counter += 1
                 if __debug__:
                     print(f'node_counter: {node_counter}')
 
+            # The q1 nodes extend the walk, so asynchronous backends start fetching them while this layer is ranked
+            if getattr(graph, 'asynchronous_prefetch', False):
+                graph.prefetch(nodes=degree_ranked_desc_nbrs[0:int(q1_index)])
+
             # Brief check for exceeding the node limit for sampling
             if node_counter > self.number_of_nodes:
-                return
+                return new_nodes
 
             for nbr in degree_ranked_desc_nbrs[int(q1_index):int(q2_index)]:
                 visited.add(nbr)
+                new_nodes.append(nbr)
+                trace.append((nbr, layer_counter))
+                if visited_mask is not None:
+                    visited_mask[nbr] = True
 
                 node_counter += 1
                 if __debug__:
                     print(f'node_counter: {node_counter}')
 
             # Final check for exceeding the node limit for sampling
-            if node_counter > self.number_of_nodes:
-                return
+            return new_nodes
 
         # pdb.set_trace(header='CaterpillarQuotaWalk - sample - _sample_at_node - Calling sampling algorithm for each node in current layer')
 
+        if batch:
+            yield prefix
+        else:
+            yield from prefix
+
         while node_counter < self.number_of_nodes:
             layer_counter += 1
             if __debug__:
                 print(f'layer_counter: {layer_counter}')
 
+            # Remote backends (eg. Neo4jGraph) fetch the adjacency of the whole layer in batched round-trips
+            if hasattr(graph, 'prefetch'):
+                graph.prefetch(nodes=visited)
+
+            layer_nodes = list()
             for n in set(visited):
-                _sample_at_node(n=n)
+                new_nodes = _sample_at_node(n=n)
+                if batch:
+                    layer_nodes.extend(new_nodes)
+                else:
+                    yield from new_nodes
+            if batch and len(layer_nodes) > 0:
+                yield layer_nodes
+
+    def sample(self, graph: nx.Graph, start_node: int=None, trace: List[Tuple[Any, int]]=None):
+        """
+        Samples the network
 
+        Args:
+            graph (Union[nx.Graph, CSRGraph, Neo4jGraph]): Network to be sampled, either in memory, memory-mapped or database-backed
+            start_node (int, optional): Node to start the sampling. Defaults to None.
+            trace (List[Tuple[Any, int]], optional): Visit trace, filled in and resumed from as in 'iter_sample'. Defaults to None.
+        """
+        # pdb.set_trace(header='CaterpillarQuotaWalk - sample - Entering sample')
+        visited = set(self.iter_sample(graph=graph, start_node=start_node, trace=trace))
         visited_list = sorted(list(visited), key=lambda n: graph.degree[n], reverse=True)[:self.number_of_nodes]
 
         # Forces start_node to be part of visited set
@@ -194,26 +276,67 @@ class CaterpillarQuotaBFSSampler:
             print(f'q1: {self.q1}')
 
 #region
-    def sample(self, graph: nx.Graph, start_node: int=None):
+    def iter_sample(self, graph: nx.Graph, start_node: int=None, batch: bool=False, trace: List[Tuple[Any, int]]=None) -> Iterator[Union[Any, List[Any]]]:
         """
-        Samples the network
+        Anytime version of 'sample': yields nodes in the order they are visited, starting with start_node, so callers can stop early,
+        score prefixes or stream nodes onward without building a subgraph.
 
         Args:
-            graph (nx.Graph): Network to be sampled
+            graph (Union[nx.Graph, CSRGraph, Neo4jGraph]): Network to be sampled, either in memory, memory-mapped or database-backed
             start_node (int, optional): Node to start the sampling. Defaults to None.
+            batch (bool, optional): Yield a list of nodes per q1 extraction instead of single nodes. Defaults to False.
+            trace (List[Tuple[Any, int]], optional): Filled with (node, q1 extraction) of every extracted queue entry in extraction
+                order, (start_node, 0) first; a node extracted again through a stale queue entry appears again. If it already holds a
+                prefix of an earlier trace, the priority queue is rebuilt by replaying the prefix's extractions, the prefix's nodes are
+                yielded first and sampling resumes from them. Defaults to None.
+
+        Yields:
+            Union[Any, List[Any]]: Newly visited node, or list of nodes newly visited in one extraction
         """
-        # pdb.set_trace(header='CaterpillarQuotaWalk - sample - Entering sample')
+        # pdb.set_trace(header='CaterpillarQuotaWalk - iter_sample - Entering iter_sample')
         if __debug__:
             print('graph: {graph}')
             print('start_node: {start_node}')
 
+        trace = list() if trace is None else trace
+        if len(trace) == 0:
+            trace.append((start_node, 0))
+
+        if isinstance(graph, CSRGraph) and kernels.JIT_ENABLED:
+            yield from self._iter_sample_csr(graph=graph, start_node=start_node, batch=batch, trace=trace)
+            return
+
         # Node collections
         visited = set([start_node])
         unvisited_nodes = [(-graph.degree[nbr], nbr) for nbr in graph.neighbors(n=start_node)]  # priority queue of 2-elemnt tuple (-degree, node id)
 
         # DEBUGGING PURPOSES
-        layer_counter = 0
-        node_counter = 1
+        layer_counter = trace[-1][1]
+        node_counter = len(trace)
+
+        def _extract(n: Any):
+            """
+            Internal helper function that queues the unvisited neighbors of an extracted node and marks it visited
+
+            Args:
+                n (Any): Extracted node
+
+            Returns:
+                bool: n was not visited before
+            """
+            for nbr in graph.neighbors(n=n):
+                if nbr not in visited:
+                    heapq.heappush(unvisited_nodes, (-graph.degree[nbr], nbr))
+
+            heapq.heappop(unvisited_nodes)
+            is_new = n not in visited
+            visited.add(n)
+            return is_new
+
+        # Resuming from an earlier trace replays its queue operations without ranking
+        for n, _ in trace[1:]:
+            _extract(n=n)
+        prefix = list(dict.fromkeys(n for n, _ in trace))
 
         # Choosing nodes to contribute to sampling
         def _sample_at_node(n: Any):
@@ -234,18 +357,20 @@ class CaterpillarQuotaBFSSampler:
                 raise ValueError(f'Node {n} must exist inside network {graph}')
 
             # unvisited neighboring nodes of n rnaked by degree descending
-            for nbr in graph.neighbors(n=n):
-                if nbr not in visited:
-                    heapq.heappush(unvisited_nodes, (-graph.degree[nbr], nbr))
+            is_new = _extract(n=n)
+            trace.append((n, layer_counter))
 
             if __debug__:
                 print(f'unvisited_nodes size:\n{len(unvisited_nodes)}')
 
-            heapq.heappop(unvisited_nodes)
-            visited.add(n)
-
             nonlocal node_counter
             node_counter += 1
+            return is_new
+
+        if batch:
+            yield prefix
+        else:
+            yield from prefix
 
         # pdb.set_trace(header='CaterpillarQuotaWalk - sample - _sample_at_node - Calling sampling algorithm for each node in current layer')
         while node_counter < self.number_of_nodes:
@@ -266,17 +391,90 @@ class CaterpillarQuotaBFSSampler:
                 print(f'q1_extract: {q1_extract}')
                 print(f'unvisited_nodes head (before): {unvisited_nodes[:10]}')
 
+            if hasattr(graph, 'prefetch'):
+                graph.prefetch(nodes=[q1_new_node[1] for q1_new_node in q1_extract])
+
+            extract_nodes = list()
             for q1_new_node in q1_extract:
-                _sample_at_node(n=q1_new_node[1])
+                if _sample_at_node(n=q1_new_node[1]):
+                    extract_nodes.append(q1_new_node[1])
 
                 if __debug__:
                     print(f'unvisited_nodes head (after): {unvisited_nodes[:10]}')
                     print(f'node_counter: {node_counter}')
 
+            if batch and len(extract_nodes) > 0:
+                yield extract_nodes
+            elif not batch:
+                yield from extract_nodes
+
+            # Brief check for exceeding the node limit for sampling
+            if node_counter > self.number_of_nodes:
+                break
+
+    def _iter_sample_csr(self, graph: CSRGraph, start_node: int, batch: bool, trace: List[Tuple[Any, int]]) -> Iterator[Union[int, List[int]]]:
+        """
+        'iter_sample' on a CSR graph with JIT-compiled kernels: the priority queue is a pair of key / node arrays kept with the same sift
+        rules as heapq, so the visits are the same as the heapq version's. Only used when Numba is available.
+        """
+        visited = np.zeros(shape=(graph.number_of_nodes(),), dtype=np.bool_)
+        visited[start_node] = True
+        nbrs = np.asarray(graph.neighbors(n=start_node), dtype=np.int64)
+        capacity = max([2 * graph.number_of_edges(), 1]) + nbrs.size
+        key, node = np.empty(shape=(capacity,), dtype=np.int64), np.empty(shape=(capacity,), dtype=np.int64)
+        size = nbrs.size
+        key[:size], node[:size] = -np.asarray(graph.degree[nbrs], dtype=np.int64), nbrs  # same unheapified start as the heapq version
+
+        def _extract(nodes: np.ndarray) -> np.ndarray:
+            nonlocal key, node, size
+            needed = size + int(np.asarray(graph.degree[nodes], dtype=np.int64).sum())
+            if needed > key.size:
+                key = np.concatenate((key, np.empty(shape=(needed,), dtype=np.int64)))
+                node = np.concatenate((node, np.empty(shape=(needed,), dtype=np.int64)))
+            is_new = np.zeros(shape=nodes.shape, dtype=np.bool_)
+            size = kernels.heap_extract(graph.indptr, graph.indices, graph.degree, visited, key, node, size, nodes, is_new)
+            return is_new
+
+        # Resuming from an earlier trace replays its queue operations without ranking
+        if len(trace) > 1:
+            _extract(nodes=np.asarray(a=[n for n, _ in trace[1:]], dtype=np.int64))
+        prefix = list(dict.fromkeys(n for n, _ in trace))
+        layer_counter = trace[-1][1]
+        node_counter = len(trace)
+
+        if batch:
+            yield prefix
+        else:
+            yield from prefix
+
+        while node_counter < self.number_of_nodes:
+            layer_counter += 1
+            q1_extract = kernels.heap_smallest(key, node, size, max([int(self.q1 * size), 1]))
+            is_new = _extract(nodes=q1_extract)
+            trace.extend((n, layer_counter) for n in q1_extract.tolist())
+            node_counter += q1_extract.size
+
+            extract_nodes = q1_extract[is_new].tolist()
+            if batch and len(extract_nodes) > 0:
+                yield extract_nodes
+            elif not batch:
+                yield from extract_nodes
+
             # Brief check for exceeding the node limit for sampling
             if node_counter > self.number_of_nodes:
                 break
 
+    def sample(self, graph: nx.Graph, start_node: int=None, trace: List[Tuple[Any, int]]=None):
+        """
+        Samples the network
+
+        Args:
+            graph (Union[nx.Graph, CSRGraph, Neo4jGraph]): Network to be sampled, either in memory, memory-mapped or database-backed
+            start_node (int, optional): Node to start the sampling. Defaults to None.
+            trace (List[Tuple[Any, int]], optional): Visit trace, filled in and resumed from as in 'iter_sample'. Defaults to None.
+        """
+        # pdb.set_trace(header='CaterpillarQuotaWalk - sample - Entering sample')
+        visited = set(self.iter_sample(graph=graph, start_node=start_node, trace=trace))
         visited_list = sorted(list(visited), key=lambda n, graph=graph : graph.degree[n], reverse=True)[:self.number_of_nodes]
 
         # Forces start_node to be part of visited set
@@ -294,6 +492,242 @@ class CaterpillarQuotaBFSSampler:
 #endregion
 #endregion
 
+#region
+def _unique_in_order(a: np.ndarray) -> np.ndarray:
+    """
+    Distinct values of an array in order of first occurrence.
+
+    Args:
+        a (np.ndarray): 1-D array
+
+    Returns:
+        np.ndarray: Distinct values of a
+    """
+    _, first_idx = np.unique(a, return_index=True)
+    return a[np.sort(first_idx)]
+
+class MultiWalkerSampler:
+    """
+    Array-based replacement for the mesa NSAgent / NSModel random walk in DeprecatedClasses.py. All 'n_walkers'
+    walkers advance together each step: positions are one int array, the next hop of every walker is drawn from the
+    CSR offsets of its current node with a single RNG call per step, and visits are added into one shared counter
+    instead of per-agent visited lists. Sampling stops once 'number_of_nodes' distinct nodes are visited or after
+    'max_steps' steps.
+
+    Transitions:
+        'uniform': every neighbor is equally likely
+        'degree': neighbors are chosen proportionally to their degree
+        'non_backtracking': uniform over neighbors other than the previous node, unless it is the only neighbor
+    """
+    TRANSITIONS = ('uniform', 'degree', 'non_backtracking')
+    # Walks index CSR arrays by node, so NetworkSampler passes graphs with other node ids through their RelabelIndex
+    contiguous_ids = True
+
+    def __init__(self,
+                number_of_nodes: int=100,
+                n_walkers: int=1000,
+                transition: str='uniform',
+                max_steps: int=10000,
+                seed: int=None,
+                visit_accounting: str='exact',
+                sketch_params: Dict[str, Any]=None):
+        """
+        Initializes metadata before smapling occurs
+
+        Args:
+            number_of_nodes (int, optional): The number of nodes to sample before stopping. Defaults to 100.
+            n_walkers (int, optional): The number of walkers advanced in parallel. Defaults to 1000.
+            transition (str, optional): One of 'uniform', 'degree' or 'non_backtracking'. Defaults to 'uniform'.
+            max_steps (int, optional): The maximum number of steps before stopping. Defaults to 10000.
+            seed (int, optional): Seed of random number generator. Defaults to None.
+            visit_accounting (str, optional): 'exact' counts visits per node in 'visit_counts'; 'sketch' records them in a
+                bounded-memory VisitSketch in 'visit_sketch' for very long walks on very large graphs. Defaults to 'exact'.
+            sketch_params (Dict[str, Any], optional): Keyword arguments of VisitSketch (k, width, depth). Defaults to None.
+
+        Raises:
+            ValueError: transition is not one of MultiWalkerSampler.TRANSITIONS
+            ValueError: visit_accounting is neither 'exact' nor 'sketch'
+        """
+        if transition not in MultiWalkerSampler.TRANSITIONS:
+            raise ValueError(f'transition ({transition}) must be one of {MultiWalkerSampler.TRANSITIONS}')
+        elif visit_accounting not in ['exact', 'sketch']:
+            raise ValueError(f'visit_accounting ({visit_accounting}) must be either \'exact\' or \'sketch\'')
+
+        self.number_of_nodes = number_of_nodes
+        self.n_walkers = n_walkers
+        self.transition = transition
+        self.max_steps = max_steps
+        self.seed = seed
+        self.visit_accounting = visit_accounting
+        self.sketch_params = sketch_params
+        self.visit_counts = None  # shared visit counter of the last walk, indexed by CSR node id
+        self.visit_sketch = None  # visit sketch of the last walk when visit_accounting is 'sketch'
+        self._csr_cache = (None, None)  # (graph, CSRGraph) of the last graph sampled
+
+        if __debug__:
+            print(f'number_of_nodes: {self.number_of_nodes}')
+            print(f'n_walkers: {self.n_walkers}')
+            print(f'transition: {self.transition}')
+
+    def _csr(self, graph: Union[nx.Graph, CSRGraph]) -> CSRGraph:
+        """
+        CSR form of graph, converted once and reused while the same graph is sampled repeatedly.
+        """
+        if self._csr_cache[0] is not graph:
+            self._csr_cache = (graph, as_csr(graph=graph))
+        return self._csr_cache[1]
+
+    def step(self, csr: CSRGraph, pos: np.ndarray, prev: np.ndarray, rng: np.random.Generator, cum_weight: np.ndarray=None) -> np.ndarray:
+        """
+        Advances every walker by one hop.
+
+        Args:
+            csr (CSRGraph): Graph being walked
+            pos (np.ndarray): Current node of every walker
+            prev (np.ndarray): Previous node of every walker, -1 if none; only used by 'non_backtracking'
+            rng (np.random.Generator): Random number generator
+            cum_weight (np.ndarray, optional): Cumulative neighbor degrees with a leading 0; required by 'degree'. Defaults to None.
+
+        Returns:
+            np.ndarray: Next node of every walker; walkers on isolated nodes stay put
+        """
+        u = rng.random(size=pos.shape[0])
+        if kernels.JIT_ENABLED:
+            return kernels.walk_step(csr.indptr, csr.indices, np.zeros(shape=(1,)) if cum_weight is None else cum_weight, pos, prev, u,
+                                    kernels.WALK_MODES[self.transition])
+
+        start = np.asarray(csr.indptr[pos])
+        deg = np.asarray(csr.indptr[pos + 1]) - start
+        moving = deg > 0
+
+        if self.transition == 'uniform':
+            offset = (u * deg).astype(np.int64)
+        elif self.transition == 'degree':
+            lo, hi = cum_weight[start], cum_weight[start + deg]
+            offset = np.searchsorted(cum_weight, lo + u * (hi - lo), side='right') - 1 - start
+            offset = np.clip(offset, 0, np.maximum(deg - 1, 0))
+        else:
+            # Draw among the first deg - 1 slots; if that is the previous node, take the last slot instead
+            offset = (u * np.maximum(deg - 1, 1)).astype(np.int64)
+            hit_prev = np.asarray(csr.indices[start + np.minimum(offset, np.maximum(deg - 1, 0))]) == prev
+            offset = np.where(hit_prev & (deg > 1), deg - 1, np.where(deg > 1, offset, 0))
+
+        nxt = np.asarray(csr.indices[np.where(moving, start + offset, 0)]) if csr.indices.shape[0] > 0 else pos
+        return np.where(moving, nxt, pos).astype(np.int64)
+
+    def _start(self, csr: CSRGraph, start_node: int, rng: np.random.Generator):
+        """
+        Initial positions, previous nodes, cumulative neighbor degrees and fresh visit accounting for a walk.
+        """
+        pos = np.full(shape=(self.n_walkers,), fill_value=start_node, dtype=np.int64) if start_node is not None else rng.integers(low=0, high=csr.number_of_nodes(), size=self.n_walkers)
+        prev = np.full(shape=(self.n_walkers,), fill_value=-1, dtype=np.int64)
+        cum_weight = None
+        if self.transition == 'degree':
+            cum_weight = np.concatenate(([0], np.cumsum(np.asarray(csr.degree)[np.asarray(csr.indices)], dtype=np.float64)))
+
+        if self.visit_accounting == 'sketch':
+            self.visit_counts = None
+            self.visit_sketch = VisitSketch(seed=self.seed, **(self.sketch_params or dict()))
+        else:
+            self.visit_counts = np.zeros(shape=(csr.number_of_nodes(),), dtype=np.int64)
+            self.visit_sketch = None
+        self._record(pos=pos)
+        return pos, prev, cum_weight
+
+    def _record(self, pos: np.ndarray):
+        """
+        Adds one visit per walker to the shared visit counter or sketch.
+        """
+        if self.visit_sketch is not None:
+            self.visit_sketch.update(nodes=pos)
+        else:
+            np.add.at(self.visit_counts, pos, 1)
+
+    def walk(self, graph: Union[nx.Graph, CSRGraph], start_node: int=None, n_steps: int=1000):
+        """
+        Runs all walkers for a fixed number of steps, only accounting visits. With visit_accounting='sketch' memory
+        does not grow with n_steps or with the size of graph.
+
+        Args:
+            graph (Union[nx.Graph, CSRGraph]): Network to walk on; nx.Graph nodes must be the integers 0..n-1
+            start_node (int, optional): Node every walker starts at; each walker starts at a random node if None. Defaults to None.
+            n_steps (int, optional): Number of steps. Defaults to 1000.
+
+        Returns:
+            Union[np.ndarray, VisitSketch]: Exact visit count per node, or the visit sketch
+        """
+        csr = self._csr(graph=graph)
+        rng = np.random.default_rng(seed=self.seed)
+        pos, prev, cum_weight = self._start(csr=csr, start_node=start_node, rng=rng)
+        for _ in range(n_steps):
+            pos, prev = self.step(csr=csr, pos=pos, prev=prev, rng=rng, cum_weight=cum_weight), pos
+            self._record(pos=pos)
+        return self.visit_sketch if self.visit_sketch is not None else self.visit_counts
+
+    def iter_sample(self, graph: Union[nx.Graph, CSRGraph], start_node: int=None, batch: bool=False) -> Iterator[Union[int, List[int]]]:
+        """
+        Anytime version of 'sample': yields distinct nodes in order of first visit, up to 'number_of_nodes' of them.
+
+        Args:
+            graph (Union[nx.Graph, CSRGraph]): Network to be sampled; nx.Graph nodes must be the integers 0..n-1
+            start_node (int, optional): Node every walker starts at; each walker starts at a random node if None. Defaults to None.
+            batch (bool, optional): Yield a list of the nodes first visited in each step instead of single nodes. Defaults to False.
+
+        Yields:
+            Union[int, List[int]]: Newly visited node, or list of nodes newly visited in one step
+        """
+        csr = self._csr(graph=graph)
+        rng = np.random.default_rng(seed=self.seed)
+        pos, prev, cum_weight = self._start(csr=csr, start_node=start_node, rng=rng)
+
+        # Distinct nodes in order of first visit. Sketch mode keeps them in a dict capped at the sample size instead
+        # of a boolean mask over every node of graph.
+        discovered = dict.fromkeys(_unique_in_order(pos)[:self.number_of_nodes].tolist())
+        if batch:
+            yield list(discovered)
+        else:
+            yield from discovered
+        seen = None
+        if self.visit_sketch is None:
+            seen = np.zeros(shape=(csr.number_of_nodes(),), dtype=bool)
+            seen[pos] = True
+
+        step_counter = 0
+        while len(discovered) < self.number_of_nodes and step_counter < self.max_steps:
+            pos, prev = self.step(csr=csr, pos=pos, prev=prev, rng=rng, cum_weight=cum_weight), pos
+            self._record(pos=pos)
+            if seen is not None:
+                newly = _unique_in_order(pos[~seen[pos]])
+                seen[newly] = True
+            else:
+                newly = _unique_in_order(pos)
+            newly = [n for n in newly.tolist() if n not in discovered][:self.number_of_nodes - len(discovered)]
+            discovered.update(dict.fromkeys(newly))
+            if batch and len(newly) > 0:
+                yield newly
+            elif not batch:
+                yield from newly
+            step_counter += 1
+
+        if __debug__:
+            print(f'step_counter: {step_counter}')
+            print(f'n_distinct: {len(discovered)}')
+
+    def sample(self, graph: Union[nx.Graph, CSRGraph], start_node: int=None):
+        """
+        Samples the network
+
+        Args:
+            graph (Union[nx.Graph, CSRGraph]): Network to be sampled; nx.Graph nodes must be the integers 0..n-1
+            start_node (int, optional): Node every walker starts at; each walker starts at a random node if None. Defaults to None.
+
+        Returns:
+            nx.Graph: Subgraph induced by the first 'number_of_nodes' distinct visited nodes
+        """
+        visited_list = list(self.iter_sample(graph=graph, start_node=start_node))
+        return graph.subgraph(nodes=visited_list)
+#endregion
+
 #region
 # DEPRECATED
 # class RWSampler:
@@ -0,0 +1,229 @@
+
+from collections import Counter
+import networkx as nx
+from typing import Any, Iterable, List
+
+#region
+class IncrementalScorer:
+    """
+    Score of a growing sample, updated as nodes are added in visit order instead of being recomputed on every prefix. Subclasses keep
+    running state in 'add' and report the score of the nodes added so far in 'value'. The base class scores the induced subgraph of the
+    prefix with any NSMethod, which is correct for every scorer but not incremental.
+    """
+    def __init__(self, parent: nx.Graph, scorer: Any=None):
+        """
+        Initializes an empty running score.
+
+        Args:
+            parent (nx.Graph): Network being sampled
+            scorer (NSMethod, optional): Scoring metric applied to the prefix subgraph by the non-incremental fallback. Defaults to None.
+        """
+        self.parent = parent
+        self.scorer = scorer
+        self.nodes: List[Any] = list()
+        self.members = set()
+
+    def __repr__(self):
+        """
+        Representation of IncrementalScorer object.
+
+        Returns:
+            str: Representation of IncrementalScorer object.
+        """
+        return f'<{type(self).__name__}: number_of_nodes={len(self.nodes)}>'
+
+    def add(self, nodes: Iterable[Any]):
+        """
+        Adds newly sampled nodes, ignoring nodes already in the sample.
+
+        Args:
+            nodes (Iterable[Any]): Nodes in visit order
+        """
+        for n in nodes:
+            if n not in self.members:
+                self.members.add(n)
+                self.nodes.append(n)
+                self._add_node(n=n)
+
+    def _add_node(self, n: Any):
+        """
+        Updates running state for one new node.
+        """
+        pass
+
+    def value(self) -> Any:
+        """
+        Score of the current prefix.
+
+        Returns:
+            Any: Score
+        """
+        return self.scorer.func(graph=self.parent.subgraph(nodes=self.nodes), **self.scorer.params)
+
+class RunningDegreeSum(IncrementalScorer):
+    """
+    Sum of node degrees inside the sample, ie. twice its number of edges, as NetworkSamplingScorer.degree_sum. Adding node v
+    adds 2 for each of its neighbors already in the sample, and 2 for a self-loop on v, which nx.degree counts twice.
+    """
+    def __init__(self, parent: nx.Graph, scorer: Any=None):
+        """
+        Initializes an empty running score.
+
+        Args:
+            parent (nx.Graph): Network being sampled
+            scorer (NSMethod, optional): Unused. Defaults to None.
+        """
+        super().__init__(parent=parent, scorer=scorer)
+        self.total = 0
+
+    def _add_node(self, n: Any):
+        loop = False
+        for nbr in self.parent.neighbors(n=n):
+            if nbr == n:
+                loop = True  # listed once by nx.Graph, twice by CSRGraph
+            elif nbr in self.members:
+                self.total += 2
+        if loop:
+            self.total += 2
+
+    def value(self) -> int:
+        """
+        Sum of degrees inside the current prefix.
+        """
+        return self.total
+
+class RunningTargetHits(IncrementalScorer):
+    """
+    Fraction of target nodes in the sample, as NetworkSamplingScorer.accuracy.
+    """
+    def __init__(self, parent: nx.Graph, scorer: Any=None):
+        """
+        Initializes an empty running score.
+
+        Args:
+            parent (nx.Graph): Network being sampled
+            scorer (NSMethod): Scoring metric with a 'targets' parameter
+        """
+        super().__init__(parent=parent, scorer=scorer)
+        self.targets = set(scorer.params['targets'])
+        self.hits = 0
+
+    def _add_node(self, n: Any):
+        self.hits += n in self.targets
+
+    def value(self) -> float:
+        """
+        Fraction of targets in the current prefix.
+        """
+        return self.hits / float(len(self.targets))
+
+class RunningDegreeHistogram(IncrementalScorer):
+    """
+    Histogram of node degrees inside the sample, as NetworkSamplingScorer.distribution with a degree transform. Adding node v moves
+    each of its sampled neighbors up one histogram bucket, so each update costs O(degree of v). A self-loop on v adds 2 to its own
+    degree, as in nx.degree.
+    """
+    def __init__(self, parent: nx.Graph, scorer: Any=None):
+        """
+        Initializes an empty running histogram.
+
+        Args:
+            parent (nx.Graph): Network being sampled
+            scorer (NSMethod, optional): Unused. Defaults to None.
+        """
+        super().__init__(parent=parent, scorer=scorer)
+        self.degree = dict()
+        self.histogram = Counter()
+
+    def _add_node(self, n: Any):
+        deg = 0
+        loop = False
+        for nbr in self.parent.neighbors(n=n):
+            if nbr == n:
+                loop = True  # listed once by nx.Graph, twice by CSRGraph
+            elif nbr in self.members:
+                self.histogram[self.degree[nbr]] -= 1
+                self.degree[nbr] += 1
+                self.histogram[self.degree[nbr]] += 1
+                deg += 1
+        if loop:
+            deg += 2
+        self.degree[n] = deg
+        self.histogram[deg] += 1
+
+    def value(self) -> Counter:
+        """
+        Degree histogram of the current prefix.
+        """
+        return Counter({deg: cnt for deg, cnt in self.histogram.items() if cnt > 0})
+
+class RunningVisitCoverage(IncrementalScorer):
+    """
+    Share of random walk visits on the parent network falling on sampled nodes, as NetworkSamplingScorer.visit_frequency_coverage, kept
+    as a running sum over the cached visit frequencies of the parent.
+    """
+    def __init__(self, parent: nx.Graph, scorer: Any=None):
+        """
+        Initializes an empty running score.
+
+        Args:
+            parent (nx.Graph): Network being sampled
+            scorer (NSMethod): visit_frequency_coverage scoring metric with its 'parent' and optional 'start_node' / 'n_steps' parameters
+        """
+        from NetworkSamplingScorer import parent_visit_frequencies
+
+        super().__init__(parent=parent, scorer=scorer)
+        self.index, self.freq = parent_visit_frequencies(parent=scorer.params['parent'],
+                                                        start_node=scorer.params.get('start_node'),
+                                                        n_steps=scorer.params.get('n_steps'))
+        self.covered = 0.0
+
+    def _add_node(self, n: Any):
+        if n in self.index:  # nodes outside the parent have no visits
+            self.covered += self.freq[self.index.to_int(nodes=n)]
+
+    def value(self) -> float:
+        """
+        Share of visits on the current prefix.
+        """
+        return self.covered / self.freq.sum()
+#endregion
+
+def incremental_scorer(scorer: Any, parent: nx.Graph) -> IncrementalScorer:
+    """
+    Running version of a scoring metric from NetworkSamplingScorer: degree_sum, accuracy, distribution with a 'degree' transform and
+    visit_frequency_coverage are updated incrementally; any other metric falls back to scoring each prefix subgraph.
+
+    Args:
+        scorer (NSMethod): Scoring metric
+        parent (nx.Graph): Network being sampled
+
+    Returns:
+        IncrementalScorer: Empty running score
+    """
+    from NetworkSamplingScorer import NetworkSamplingScorer
+
+    if scorer.func is NetworkSamplingScorer.degree_sum:
+        return RunningDegreeSum(parent=parent, scorer=scorer)
+    elif scorer.func is NetworkSamplingScorer.accuracy:
+        return RunningTargetHits(parent=parent, scorer=scorer)
+    elif scorer.func is NetworkSamplingScorer.visit_frequency_coverage:
+        return RunningVisitCoverage(parent=parent, scorer=scorer)
+    elif scorer.func is NetworkSamplingScorer.distribution and scorer.params.get('weights') is None \
+            and getattr(scorer.params.get('transform'), 'func', None) is sample_degree:
+        return RunningDegreeHistogram(parent=parent, scorer=scorer)
+    return IncrementalScorer(parent=parent, scorer=scorer)
+
+def sample_degree(n: Any, graph: nx.Graph) -> int:
+    """
+    Degree of node n inside a sample. Use as NSMethod(func=sample_degree, params={}) transform of NetworkSamplingScorer.distribution to get
+    a degree histogram that incremental_scorer keeps as a running histogram.
+
+    Args:
+        n (Any): Node
+        graph (nx.Graph): Sample of a network
+
+    Returns:
+        int: Degree of n in graph
+    """
+    return graph.degree[n]
@@ -0,0 +1,246 @@
+
+import numpy as np
+import os
+from typing import Tuple
+
+# Numba is optional: kernels below are written in the subset of Python/NumPy it compiles, and are JIT-compiled (and cached on disk
+# next to this module, or under NUMBA_CACHE_DIR, so later processes load them instead of recompiling) when it is installed.
+# Set NETWORK_SAMPLING_JIT=0 to keep the interpreted paths even with Numba installed.
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+JIT_ENABLED = HAS_NUMBA and os.environ.get('NETWORK_SAMPLING_JIT', '1') != '0'
+
+def _jit(func):
+    """
+    Compiles func with Numba if JIT_ENABLED, else returns it unchanged so it still runs (slowly) as plain Python.
+    """
+    return njit(cache=True, nogil=True)(func) if JIT_ENABLED else func
+
+#region
+def _quota_select_numpy(indptr: np.ndarray, indices: np.ndarray, degree: np.ndarray, visited: np.ndarray, n: int,
+                        q1: float, q2: float) -> Tuple[np.ndarray, int, int]:
+    """
+    NumPy version of quota_select.
+    """
+    nbrs = np.asarray(indices[indptr[n]:indptr[n + 1]])
+    cand = nbrs[~visited[nbrs]]
+    if cand.size == 0:
+        return cand, 0, 0
+    cand_degree = np.asarray(degree[cand])
+    order = np.argsort(-cand_degree, kind='stable')
+    cumsum_degree = np.cumsum(cand_degree[order])
+    sum_degree = cumsum_degree[-1]
+    q1_index = int(np.searchsorted(cumsum_degree, q1 * sum_degree, side='right'))
+    q2_index = int(np.searchsorted(cumsum_degree, q2 * sum_degree, side='right'))
+    return cand[order], max([q1_index, 1]), q2_index
+
+@_jit
+def _quota_select_jit(indptr, indices, degree, visited, n, q1, q2):
+    """
+    Loop version of quota_select for Numba.
+    """
+    start, end = indptr[n], indptr[n + 1]
+    count = 0
+    for j in range(start, end):
+        if not visited[indices[j]]:
+            count += 1
+    cand = np.empty(count, dtype=np.int64)
+    cand_degree = np.empty(count, dtype=np.int64)
+    count = 0
+    for j in range(start, end):
+        nbr = indices[j]
+        if not visited[nbr]:
+            cand[count] = nbr
+            cand_degree[count] = degree[nbr]
+            count += 1
+    if count == 0:
+        return cand, 0, 0
+
+    order = np.argsort(-cand_degree, kind='mergesort')
+    ranked = cand[order]
+    sum_degree = cand_degree.sum()
+    q1_quota, q2_quota = q1 * sum_degree, q2 * sum_degree
+    q1_index, q2_index = count, count
+    cumsum_degree = 0
+    for i in range(count):
+        cumsum_degree += cand_degree[order[i]]
+        if q1_index == count and cumsum_degree > q1_quota:
+            q1_index = i
+        if cumsum_degree > q2_quota:
+            q2_index = i
+            break
+    return ranked, max(q1_index, 1), q2_index
+
+def quota_select(indptr: np.ndarray, indices: np.ndarray, degree: np.ndarray, visited: np.ndarray, n: int,
+                q1: float, q2: float) -> Tuple[np.ndarray, int, int]:
+    """
+    Core of CaterpillarQuotaWalkSampler at one node of a CSR graph: unvisited neighbors of n ranked by degree descending (ties in
+    neighbor order), and the cut indices of the q1 and q2 degree quotas. Uses the Numba kernel if JIT_ENABLED, else NumPy.
+
+    Args:
+        indptr (np.ndarray): CSR row offsets
+        indices (np.ndarray): CSR neighbor lists
+        degree (np.ndarray): Degree per node
+        visited (np.ndarray): Boolean visited flag per node
+        n (int): Node to rank neighbors of
+        q1 (float): Quota proportion of nodes extending the walk
+        q2 (float): Quota proportion of nodes extending the walk or becoming branches
+
+    Returns:
+        Tuple[np.ndarray, int, int]: Ranked unvisited neighbors; ranked[:q1_index] extend the walk, ranked[q1_index:q2_index] branch
+    """
+    if JIT_ENABLED:
+        return _quota_select_jit(indptr, indices, degree, visited, n, q1, q2)
+    return _quota_select_numpy(indptr=indptr, indices=indices, degree=degree, visited=visited, n=n, q1=q1, q2=q2)
+#endregion
+
+#region
+# Array heap of (key, node) pairs with the exact ordering and sift rules of Python's heapq, so a sampler moved onto it makes the same
+# choices as with a heapq list of (key, node) tuples.
+@_jit
+def _less(key, node, i, j):
+    return key[i] < key[j] or (key[i] == key[j] and node[i] < node[j])
+
+@_jit
+def _siftdown(key, node, startpos, pos):
+    new_key, new_node = key[pos], node[pos]
+    while pos > startpos:
+        parentpos = (pos - 1) >> 1
+        if new_key < key[parentpos] or (new_key == key[parentpos] and new_node < node[parentpos]):
+            key[pos], node[pos] = key[parentpos], node[parentpos]
+            pos = parentpos
+            continue
+        break
+    key[pos], node[pos] = new_key, new_node
+
+@_jit
+def _siftup(key, node, size, pos):
+    startpos = pos
+    new_key, new_node = key[pos], node[pos]
+    childpos = 2 * pos + 1
+    while childpos < size:
+        rightpos = childpos + 1
+        if rightpos < size and not _less(key, node, childpos, rightpos):
+            childpos = rightpos
+        key[pos], node[pos] = key[childpos], node[childpos]
+        pos = childpos
+        childpos = 2 * pos + 1
+    key[pos], node[pos] = new_key, new_node
+    _siftdown(key, node, startpos, pos)
+
+@_jit
+def heap_extract(indptr, indices, degree, visited, key, node, size, nodes, is_new):
+    """
+    Core of CaterpillarQuotaBFSSampler for a batch of extracted nodes of a CSR graph: for each node in order, pushes (-degree, nbr) of
+    its unvisited neighbors, pops the heap once and marks the node visited, as heapq.heappush / heapq.heappop do on a list.
+
+    Args:
+        indptr (np.ndarray): CSR row offsets
+        indices (np.ndarray): CSR neighbor lists
+        degree (np.ndarray): Degree per node
+        visited (np.ndarray): Boolean visited flag per node, updated in place
+        key (np.ndarray): Heap keys (-degree), updated in place; must have room for every push
+        node (np.ndarray): Heap nodes, updated in place
+        size (int): Number of heap entries
+        nodes (np.ndarray): Extracted nodes
+        is_new (np.ndarray): Set to whether each extracted node was not visited before
+
+    Returns:
+        int: New number of heap entries
+    """
+    for i in range(nodes.shape[0]):
+        n = nodes[i]
+        for j in range(indptr[n], indptr[n + 1]):
+            nbr = indices[j]
+            if not visited[nbr]:
+                key[size], node[size] = -degree[nbr], nbr
+                size += 1
+                _siftdown(key, node, 0, size - 1)
+
+        if size == 0:
+            raise IndexError('index out of range')
+        size -= 1
+        if size > 0:
+            key[0], node[0] = key[size], node[size]
+            _siftup(key, node, size, 0)
+
+        is_new[i] = not visited[n]
+        visited[n] = True
+    return size
+
+@_jit
+def heap_smallest(key, node, size, k):
+    """
+    Nodes of the k smallest (key, node) heap entries in ascending order, as heapq.nsmallest.
+
+    Args:
+        key (np.ndarray): Heap keys
+        node (np.ndarray): Heap nodes
+        size (int): Number of heap entries
+        k (int): Number of entries
+
+    Returns:
+        np.ndarray: Nodes of the k smallest entries
+    """
+    order = np.argsort(node[:size], kind='mergesort')
+    order = order[np.argsort(key[:size][order], kind='mergesort')]
+    return node[:size][order[:min(k, size)]]
+#endregion
+
+#region
+WALK_MODES = {'uniform': 0, 'degree': 1, 'non_backtracking': 2}
+
+@_jit
+def walk_step(indptr, indices, cum_weight, pos, prev, u, mode):
+    """
+    Advances every walker of MultiWalkerSampler by one hop in a single fused loop over a CSR graph, with the same draws as its NumPy
+    step for the same uniform numbers u.
+
+    Args:
+        indptr (np.ndarray): CSR row offsets
+        indices (np.ndarray): CSR neighbor lists
+        cum_weight (np.ndarray): Cumulative neighbor degrees with a leading 0; only read in 'degree' mode
+        pos (np.ndarray): Current node of every walker
+        prev (np.ndarray): Previous node of every walker, -1 if none
+        u (np.ndarray): Uniform number in [0, 1) per walker
+        mode (int): Transition, a value of WALK_MODES
+
+    Returns:
+        np.ndarray: Next node of every walker; walkers on isolated nodes stay put
+    """
+    nxt = np.empty(pos.shape[0], dtype=np.int64)
+    for w in range(pos.shape[0]):
+        start = indptr[pos[w]]
+        deg = indptr[pos[w] + 1] - start
+        if deg == 0:
+            nxt[w] = pos[w]
+            continue
+
+        if mode == 0:
+            offset = int(u[w] * deg)
+        elif mode == 1:
+            lo, hi = cum_weight[start], cum_weight[start + deg]
+            target = lo + u[w] * (hi - lo)
+            # First position in cum_weight[start + 1:start + deg + 1] above target, as a right-sided searchsorted
+            left, right = start + 1, start + deg + 1
+            while left < right:
+                mid = (left + right) >> 1
+                if cum_weight[mid] > target:
+                    right = mid
+                else:
+                    left = mid + 1
+            offset = min(max(left - 1 - start, 0), deg - 1)
+        else:
+            offset = int(u[w] * max(deg - 1, 1))
+            if deg > 1:
+                if indices[start + min(offset, deg - 1)] == prev[w]:
+                    offset = deg - 1
+            else:
+                offset = 0
+        nxt[w] = indices[start + offset]
+    return nxt
+#endregion
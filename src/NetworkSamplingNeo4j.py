@@ -1,6 +1,522 @@
 
-from neo4j import GraphDatabase
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import json
+import networkx as nx
+import numpy as np
+import os
+import time
+from typing import Any, Dict, Iterable, List
+
+from NetworkSamplingCSR import CSRGraph, build_csr
 
 uri = 'bolt://localhost:1080'
-driver = GraphDatabase.driver(uri=uri, auth=('user', 'password'), param_config=None)
 
+# Every query starts with a '// ns:<kind>' comment so that stand-in runners can dispatch on it without parsing Cypher.
+# Node label and id property cannot be Cypher parameters, so they are formatted in once per Neo4jGraph.
+NEIGHBORS_QUERY = """// ns:neighbors
+UNWIND $ids AS node_id
+MATCH (n{label} {{{id_property}: node_id}})
+OPTIONAL MATCH (n)--(m{label})
+RETURN node_id AS node, collect([m.{id_property}, size([(m)--() | 1])]) AS neighbors"""
+
+DEGREE_QUERY = """// ns:degree
+UNWIND $ids AS node_id
+MATCH (n{label} {{{id_property}: node_id}})
+RETURN node_id AS node, size([(n)--() | 1]) AS degree"""
+
+COUNT_QUERY = """// ns:count
+MATCH (n{label})
+RETURN count(n) AS count"""
+
+NODE_PAGE_QUERY = """// ns:node_page
+MATCH (n{label})
+WHERE $after IS NULL OR n.{id_property} > $after
+RETURN n.{id_property} AS id
+ORDER BY id
+LIMIT $limit"""
+
+EDGE_PAGE_QUERY = """// ns:edge_page
+UNWIND $ids AS node_id
+MATCH (n{label} {{{id_property}: node_id}})--(m{label})
+WHERE node_id < m.{id_property}
+RETURN node_id AS src, m.{id_property} AS dst"""
+
+def _format_query(query: str, label: str=None, id_property: str='id'):
+    """
+    Fills node label and id property into a query template.
+
+    Args:
+        query (str): One of the query templates in this module
+        label (str, optional): Node label to restrict to; all nodes if None. Defaults to None.
+        id_property (str, optional): Node property holding the node id. Defaults to 'id'.
+
+    Returns:
+        str: Cypher query
+    """
+    return query.format(label='' if label is None else f':`{label}`', id_property=f'`{id_property}`')
+
+def _query_kind(query: str):
+    """
+    Reads the '// ns:<kind>' tag from the first line of a query.
+
+    Args:
+        query (str): Query built from a template in this module
+
+    Returns:
+        str: Kind of query, eg. 'neighbors'
+    """
+    return query.split('\n', 1)[0].replace('// ns:', '').strip()
+
+def connect(uri: str=uri, auth: tuple=('user', 'password'), max_connection_pool_size: int=50, **kwargs):
+    """
+    Opens a pooled driver. One driver should be shared by every Neo4jGraph of a process, since each session
+    borrows a connection from its pool rather than opening a new socket.
+
+    Args:
+        uri (str, optional): Bolt URI of database. Defaults to 'bolt://localhost:1080'.
+        auth (tuple, optional): (user, password) pair. Defaults to ('user', 'password').
+        max_connection_pool_size (int, optional): Maximum number of pooled connections. Defaults to 50.
+        kwargs: Extra keyword arguments passed to GraphDatabase.driver
+
+    Returns:
+        neo4j.Driver: Pooled driver
+    """
+    # Imported here so the rest of this module (and LocalQueryRunner) works without the neo4j package
+    from neo4j import GraphDatabase
+
+    return GraphDatabase.driver(uri, auth=auth, max_connection_pool_size=max_connection_pool_size, **kwargs)
+
+#region
+class Neo4jQueryRunner:
+    """Runs queries through a pooled neo4j driver and returns every record as a dict."""
+    def __init__(self, driver: Any, database: str=None):
+        """
+        Initializes runner on an open driver.
+
+        Args:
+            driver (Any): Driver from connect()
+            database (str, optional): Database name; server default if None. Defaults to None.
+        """
+        self.driver = driver
+        self.database = database
+        self.n_queries = 0
+
+    def __repr__(self):
+        """
+        Representation of Neo4jQueryRunner object.
+
+        Returns:
+            str: Representation of Neo4jQueryRunner object.
+        """
+        return f'<Neo4jQueryRunner: driver={repr(self.driver)}, database={self.database}>'
+
+    def run(self, query: str, parameters: Dict[str, Any]=None) -> List[Dict[str, Any]]:
+        """
+        Runs a single query in its own session.
+
+        Args:
+            query (str): Cypher query
+            parameters (Dict[str, Any], optional): Query parameters. Defaults to None.
+
+        Returns:
+            List[Dict[str, Any]]: Records as dicts
+        """
+        self.n_queries += 1
+        with self.driver.session(database=self.database) as session:
+            return [record.data() for record in session.run(query, parameters or dict())]
+
+class LocalQueryRunner:
+    """
+    In-process stand-in for Neo4jQueryRunner that answers the queries of this module from an nx.Graph. Used to
+    test Neo4jGraph without a database; 'n_queries' counts round-trips and 'latency' simulates their cost.
+    """
+    def __init__(self, graph: nx.Graph, latency: float=0.0):
+        """
+        Initializes stand-in on an in-memory graph.
+
+        Args:
+            graph (nx.Graph): Graph standing in for the database
+            latency (float, optional): Seconds to sleep per query. Defaults to 0.0.
+        """
+        self.graph = graph
+        self.latency = latency
+        self.n_queries = 0
+
+    def __repr__(self):
+        """
+        Representation of LocalQueryRunner object.
+
+        Returns:
+            str: Representation of LocalQueryRunner object.
+        """
+        return f'<LocalQueryRunner: graph={repr(self.graph)}, latency={self.latency}>'
+
+    def run(self, query: str, parameters: Dict[str, Any]=None) -> List[Dict[str, Any]]:
+        """
+        Answers a query built from one of the templates in this module.
+
+        Args:
+            query (str): Cypher query
+            parameters (Dict[str, Any], optional): Query parameters. Defaults to None.
+
+        Raises:
+            ValueError: query was not built from a known template
+
+        Returns:
+            List[Dict[str, Any]]: Records as dicts, in the same shape the database returns
+        """
+        self.n_queries += 1
+        if self.latency > 0:
+            time.sleep(self.latency)
+
+        parameters = parameters or dict()
+        kind = _query_kind(query=query)
+        graph = self.graph
+        if kind == 'neighbors':
+            return [{'node': n, 'neighbors': [[m, graph.degree[m]] for m in graph.neighbors(n)]} for n in parameters['ids'] if n in graph]
+        elif kind == 'degree':
+            return [{'node': n, 'degree': graph.degree[n]} for n in parameters['ids'] if n in graph]
+        elif kind == 'count':
+            return [{'count': graph.number_of_nodes()}]
+        elif kind == 'node_page':
+            after = parameters['after']
+            ids = sorted(n for n in graph if after is None or n > after)
+            return [{'id': n} for n in ids[:parameters['limit']]]
+        elif kind == 'edge_page':
+            return [{'src': n, 'dst': m} for n in parameters['ids'] if n in graph for m in graph.neighbors(n) if n < m]
+        raise ValueError(f'Unknown query kind \'{kind}\'')
+#endregion
+
+#region
+class _DegreeView:
+    """Indexable view so that graph.degree[n] works on Neo4jGraph like on nx.Graph."""
+    def __init__(self, graph: 'Neo4jGraph'):
+        self.graph = graph
+
+    def __getitem__(self, n: Any):
+        return self.graph.get_degree(n=n)
+
+class Neo4jGraph:
+    """
+    Graph backend reading adjacency from a Neo4j database on demand. Neighbor lists and degrees are fetched for a
+    whole frontier per round-trip by prefetch(), and kept in a local LRU cache of at most 'cache_size' adjacency
+    lists. Exposes the same nx.Graph subset as CSRGraph, so the custom samplers in NetworkSamplingFunctions.py and
+    NetworkSampler can sample a live database; samplers call prefetch() once per layer before expanding it.
+    """
+    def __init__(self,
+                runner: Any,
+                label: str=None,
+                id_property: str='id',
+                cache_size: int=100000,
+                batch_size: int=1000,
+                name: str=None):
+        """
+        Initializes backend on a query runner.
+
+        Args:
+            runner (Any): Neo4jQueryRunner, LocalQueryRunner, or any object with a compatible 'run(query, parameters)'
+            label (str, optional): Node label to restrict to; all nodes if None. Defaults to None.
+            id_property (str, optional): Node property holding the node id. Defaults to 'id'.
+            cache_size (int, optional): Maximum number of adjacency lists kept locally. Defaults to 100000.
+            batch_size (int, optional): Maximum number of nodes per round-trip. Defaults to 1000.
+            name (str, optional): Name of graph used as label in NetworkSamplerGrid tables. Defaults to None.
+
+        Raises:
+            ValueError: cache_size or batch_size is not a positive integer
+        """
+        if cache_size <= 0:
+            raise ValueError(f'cache_size ({cache_size}) is not a positive integer.')
+        elif batch_size <= 0:
+            raise ValueError(f'batch_size ({batch_size}) is not a positive integer.')
+
+        self.runner = runner
+        self.label = label
+        self.id_property = id_property
+        self.cache_size = cache_size
+        self.batch_size = batch_size
+        self.name = name
+
+        self._neighbors_query = _format_query(query=NEIGHBORS_QUERY, label=label, id_property=id_property)
+        self._degree_query = _format_query(query=DEGREE_QUERY, label=label, id_property=id_property)
+        self._count_query = _format_query(query=COUNT_QUERY, label=label, id_property=id_property)
+
+        self._adjacency = OrderedDict()  # LRU cache of node -> neighbor array
+        self._degree = OrderedDict()  # LRU cache of node -> degree, filled alongside adjacency
+        self._missing = set()  # ids known not to be nodes
+        self.degree = _DegreeView(graph=self)
+
+    def __repr__(self):
+        """
+        Representation of Neo4jGraph object.
+
+        Returns:
+            str: Representation of Neo4jGraph object.
+        """
+        return f'<Neo4jGraph: name={self.name}, runner={repr(self.runner)}, label={self.label}, cached={len(self._adjacency)}>'
+
+    def __contains__(self, n: Any):
+        """
+        Whether n is a node in the database.
+
+        Args:
+            n (Any): Candidate node
+
+        Returns:
+            bool: True if n is a node of graph
+        """
+        if n in self._degree or n in self._adjacency:
+            return True
+        if n in self._missing:
+            return False
+        self._fetch_degrees(nodes=[n])
+        return n in self._degree
+
+    def _remember(self, cache: OrderedDict, n: Any, value: Any, max_size: int):
+        """
+        Inserts into an LRU cache and evicts the least recently used entries beyond max_size.
+        """
+        cache[n] = value
+        cache.move_to_end(n)
+        while len(cache) > max_size:
+            cache.popitem(last=False)
+
+    def _fetch_degrees(self, nodes: List[Any]):
+        """
+        Fetches degrees of nodes in batches of 'batch_size'.
+        """
+        for start in range(0, len(nodes), self.batch_size):
+            batch = nodes[start:start + self.batch_size]
+            found = set()
+            for record in self.runner.run(self._degree_query, {'ids': batch}):
+                found.add(record['node'])
+                self._remember(cache=self._degree, n=record['node'], value=record['degree'], max_size=self.cache_size * 16)
+            self._missing.update(n for n in batch if n not in found)
+
+    # ACCESSORS
+    def prefetch(self, nodes: Iterable[Any]):
+        """
+        Fetches neighbor lists, and the degree of every neighbor, for all uncached nodes in one round-trip per
+        'batch_size' nodes.
+
+        Args:
+            nodes (Iterable[Any]): Frontier about to be expanded
+        """
+        uncached = [n for n in dict.fromkeys(nodes) if n not in self._adjacency and n not in self._missing]
+        for start in range(0, len(uncached), self.batch_size):
+            batch = uncached[start:start + self.batch_size]
+            found = set()
+            for record in self.runner.run(self._neighbors_query, {'ids': batch}):
+                n = record['node']
+                pairs = [pair for pair in record['neighbors'] if pair[0] is not None]  # OPTIONAL MATCH yields [null, 0] for isolated nodes
+                found.add(n)
+                self._remember(cache=self._adjacency, n=n, value=np.asarray(a=[pair[0] for pair in pairs]), max_size=self.cache_size)
+                self._remember(cache=self._degree, n=n, value=len(pairs), max_size=self.cache_size * 16)
+                for m, m_degree in pairs:
+                    self._remember(cache=self._degree, n=m, value=m_degree, max_size=self.cache_size * 16)
+            self._missing.update(n for n in batch if n not in found)
+
+        if __debug__:
+            print(f'prefetch: {len(uncached)} uncached of frontier, cached={len(self._adjacency)}')
+
+    def neighbors(self, n: Any) -> np.ndarray:
+        """
+        Neighbors of a node, fetched on a cache miss.
+
+        Args:
+            n (Any): Node id
+
+        Raises:
+            ValueError: n is not a node of graph
+
+        Returns:
+            np.ndarray: Neighbor ids of n
+        """
+        if n not in self._adjacency:
+            self.prefetch(nodes=[n])
+        if n not in self._adjacency:
+            raise ValueError(f'Node {n} must exist inside network {self}')
+        self._adjacency.move_to_end(n)
+        return self._adjacency[n]
+
+    def get_degree(self, n: Any) -> int:
+        """
+        Degree of a node, fetched on a cache miss.
+
+        Args:
+            n (Any): Node id
+
+        Raises:
+            ValueError: n is not a node of graph
+
+        Returns:
+            int: Degree of n
+        """
+        if n not in self._degree:
+            self._fetch_degrees(nodes=[n])
+        if n not in self._degree:
+            raise ValueError(f'Node {n} must exist inside network {self}')
+        self._degree.move_to_end(n)
+        return self._degree[n]
+
+    def number_of_nodes(self) -> int:
+        """
+        Number of nodes in database.
+
+        Returns:
+            int: Number of nodes
+        """
+        return self.runner.run(self._count_query, dict())[0]['count']
+
+    def subgraph(self, nodes: Iterable[Any]) -> nx.Graph:
+        """
+        Induced subgraph over the given nodes, materialized as an in-memory nx.Graph.
+
+        Args:
+            nodes (Iterable[Any]): Node ids to keep
+
+        Returns:
+            nx.Graph: Induced subgraph
+        """
+        node_list = list(dict.fromkeys(nodes))
+        node_set = set(node_list)
+        self.prefetch(nodes=node_list)
+
+        sub = nx.Graph(name=self.name)
+        sub.add_nodes_from(node_list)
+        for n in node_list:
+            sub.add_edges_from((n, m) for m in self.neighbors(n=n) if m in node_set)
+        return sub
+
+    # MUTATORS
+    def clear_cache(self):
+        """
+        Drops every cached adjacency list and degree.
+        """
+        self._adjacency.clear()
+        self._degree.clear()
+        self._missing.clear()
+#endregion
+
+#region
+def _save_atomic(path: str, arr: np.ndarray):
+    """
+    Writes an array through a temporary file so that an interrupted export never leaves a truncated page behind.
+
+    Args:
+        path (str): Destination .npy path
+        arr (np.ndarray): Array to write
+    """
+    tmp_path = path + '.tmp.npy'
+    np.save(file=tmp_path, arr=arr)
+    os.replace(src=tmp_path, dst=path)
+
+def export_to_csr(runner: Any,
+                    path: str,
+                    page_size: int=10000,
+                    n_prefetch: int=2,
+                    label: str=None,
+                    id_property: str='id',
+                    name: str=None) -> CSRGraph:
+    """
+    Snapshots a graph from the database into an on-disk CSRGraph for offline sampling grids. Node ids are paged by
+    id range (keyset paging on 'id_property', which stays fast where SKIP would rescan), then edges are fetched per
+    node page while up to 'n_prefetch' later pages are already in flight, so fetching overlaps with translating and
+    writing earlier pages. Every finished page is written to 'path' and recorded in progress.json; calling again with
+    the same 'path' after an interruption resumes from the last finished page.
+
+    The original ids are stored in node_ids.npy next to the CSR arrays; CSR node i is node_ids[i].
+
+    Args:
+        runner (Any): Neo4jQueryRunner, LocalQueryRunner, or any object with a compatible 'run(query, parameters)'
+        path (str): Directory to write pages and the final graph into; created if absent
+        page_size (int, optional): Number of nodes per page. Defaults to 10000.
+        n_prefetch (int, optional): Number of edge pages fetched ahead concurrently. Defaults to 2.
+        label (str, optional): Node label to restrict to; all nodes if None. Defaults to None.
+        id_property (str, optional): Node property holding the node id. Defaults to 'id'.
+        name (str, optional): Name of exported graph. Defaults to None.
+
+    Raises:
+        ValueError: page_size or n_prefetch is not a positive integer
+
+    Returns:
+        CSRGraph: Memory-mapped snapshot
+    """
+    if page_size <= 0:
+        raise ValueError(f'page_size ({page_size}) is not a positive integer.')
+    elif n_prefetch <= 0:
+        raise ValueError(f'n_prefetch ({n_prefetch}) is not a positive integer.')
+
+    os.makedirs(name=path, exist_ok=True)
+    pages_path = os.path.join(path, 'pages')
+    os.makedirs(name=pages_path, exist_ok=True)
+    progress_path = os.path.join(path, 'progress.json')
+    node_page_query = _format_query(query=NODE_PAGE_QUERY, label=label, id_property=id_property)
+    edge_page_query = _format_query(query=EDGE_PAGE_QUERY, label=label, id_property=id_property)
+
+    progress = {'n_node_pages': 0, 'after': None, 'nodes_done': False}
+    if os.path.exists(path=progress_path):
+        with open(file=progress_path, mode='r') as f:
+            progress = json.load(fp=f)
+
+    def _checkpoint():
+        with open(file=progress_path + '.tmp', mode='w') as f:
+            json.dump(obj=progress, fp=f)
+        os.replace(src=progress_path + '.tmp', dst=progress_path)
+
+    node_page_path = lambda k: os.path.join(pages_path, f'nodes_{k:06d}.npy')
+    edge_page_path = lambda k: os.path.join(pages_path, f'edges_{k:06d}.npy')
+
+    # Phase 1: node ids by keyset paging
+    while not progress['nodes_done']:
+        records = runner.run(node_page_query, {'after': progress['after'], 'limit': page_size})
+        if len(records) == 0:
+            progress['nodes_done'] = True
+        else:
+            ids = np.asarray(a=[record['id'] for record in records])
+            _save_atomic(path=node_page_path(progress['n_node_pages']), arr=ids)
+            progress['n_node_pages'] += 1
+            progress['after'] = ids[-1].item()
+        _checkpoint()
+
+        if __debug__:
+            print(f'export_to_csr: node pages={progress["n_node_pages"]}, after={progress["after"]}')
+
+    n_pages = progress['n_node_pages']
+    node_ids = np.concatenate([np.load(file=node_page_path(k)) for k in range(n_pages)]) if n_pages > 0 else np.asarray(a=[], dtype=np.int64)
+    sorter = np.argsort(node_ids, kind='stable')
+    number_of_nodes = int(node_ids.shape[0])
+
+    def _to_index(ids: np.ndarray) -> np.ndarray:
+        return sorter[np.searchsorted(node_ids, ids, sorter=sorter)]
+
+    # Phase 2: edges per node page, fetched ahead in background threads while earlier pages are translated
+    def _fetch_edges(k: int):
+        records = runner.run(edge_page_query, {'ids': np.load(file=node_page_path(k)).tolist()})
+        return np.asarray(a=[record['src'] for record in records]), np.asarray(a=[record['dst'] for record in records])
+
+    todo = [k for k in range(n_pages) if not os.path.exists(path=edge_page_path(k))]
+    with ThreadPoolExecutor(max_workers=n_prefetch) as executor:
+        futures = {k: executor.submit(_fetch_edges, k) for k in todo[:n_prefetch]}
+        for idx, k in enumerate(todo):
+            if idx + n_prefetch < len(todo):
+                futures[todo[idx + n_prefetch]] = executor.submit(_fetch_edges, todo[idx + n_prefetch])
+            src, dst = futures.pop(k).result()
+            edges = np.empty(shape=(src.shape[0], 2), dtype=np.int64)
+            if src.shape[0] > 0:
+                edges[:, 0], edges[:, 1] = _to_index(ids=src), _to_index(ids=dst)
+            _save_atomic(path=edge_page_path(k), arr=edges)
+
+            if __debug__:
+                print(f'export_to_csr: edge page {k + 1}/{n_pages}, {edges.shape[0]} edges')
+
+    # Phase 3: out-of-core CSR build over the edge pages
+    def _edge_chunks():
+        for k in range(n_pages):
+            edges = np.load(file=edge_page_path(k), mmap_mode='r')
+            yield edges[:, 0], edges[:, 1]
+
+    graph = build_csr(edge_chunks=_edge_chunks, number_of_nodes=number_of_nodes, path=path, name=name)
+    np.save(file=os.path.join(path, 'node_ids.npy'), arr=node_ids)
+    return graph
+#endregion
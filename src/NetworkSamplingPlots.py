@@ -0,0 +1,224 @@
+
+import multiprocessing as mp
+import networkx as nx
+import numpy as np
+import os
+from typing import Any, Dict, Iterable, List, NamedTuple
+
+#region
+class FigureSpec(NamedTuple):
+    """
+    Everything needed to draw one figure, reduced to small arrays so it can be shipped to a worker process without the
+    sample graphs it was computed from.
+
+    Args:
+        kind (str): One of 'degree_distribution', 'degree_facet', 'sample_graph'
+        title (str): Figure title
+        path (str): Output file path
+        data (Dict[str, Any]): Arrays drawn by the renderer for this kind
+    """
+    kind: str
+    title: str
+    path: str
+    data: Dict[str, Any]
+
+    def __repr__(self):
+        """
+        Representation of FigureSpec object.
+
+        Returns:
+            str: Representation of FigureSpec object.
+        """
+        return f'<FigureSpec: kind={self.kind}, title={self.title}, path={self.path}>'
+#endregion
+
+#region
+def degree_histogram(graph: nx.Graph) -> np.ndarray:
+    """
+    Degree counts of a sample; entry d is the number of nodes with degree d inside the sample.
+
+    Args:
+        graph (nx.Graph): Sample of a network
+
+    Returns:
+        np.ndarray: Degree histogram
+    """
+    return np.bincount(np.fromiter((deg for _, deg in graph.degree), dtype=np.int64, count=graph.number_of_nodes()))
+
+def merge_histograms(hists: Iterable[np.ndarray]) -> np.ndarray:
+    """
+    Sums histograms of different lengths, eg. across trials.
+
+    Args:
+        hists (Iterable[np.ndarray]): Histograms
+
+    Returns:
+        np.ndarray: Combined histogram
+    """
+    hists = list(hists)
+    merged = np.zeros(shape=(max([h.size for h in hists] + [0]),), dtype=np.int64)
+    for h in hists:
+        merged[:h.size] += h
+    return merged
+
+def histogram_quantiles(hist: np.ndarray, n_quantiles: int=101) -> np.ndarray:
+    """
+    Evenly spaced quantiles of the values counted in a histogram, as used for QQ plots.
+
+    Args:
+        hist (np.ndarray): Histogram of integer values
+        n_quantiles (int, optional): Number of quantiles from 0 to 1. Defaults to 101.
+
+    Returns:
+        np.ndarray: Quantile values
+    """
+    cdf = np.cumsum(hist) / max([hist.sum(), 1])
+    return np.searchsorted(cdf, np.linspace(0.0, 1.0, n_quantiles).clip(min=1e-12), side='left').clip(max=max([hist.size - 1, 0])).astype(np.float64)
+
+def sample_edges(graph: nx.Graph) -> np.ndarray:
+    """
+    Sample reduced to its edge array, enough to lay out and draw it together with sample_nodes.
+
+    Args:
+        graph (nx.Graph): Sample of a network
+
+    Returns:
+        np.ndarray: (number_of_edges, 2) edge endpoints
+    """
+    edges = np.empty(shape=(graph.number_of_edges(), 2), dtype=object)  # filled per edge, so tuple node ids stay whole
+    for idx, edge in enumerate(graph.edges):
+        edges[idx] = edge
+    return edges
+
+def sample_nodes(graph: nx.Graph) -> np.ndarray:
+    """
+    Nodes of a sample, kept apart from sample_edges so that isolated nodes are drawn too.
+
+    Args:
+        graph (nx.Graph): Sample of a network
+
+    Returns:
+        np.ndarray: (number_of_nodes,) node ids
+    """
+    return np.fromiter(graph.nodes, dtype=object, count=graph.number_of_nodes())
+#endregion
+
+#region
+def degree_figure_specs(degree_hists: Dict[str, np.ndarray], graph_name: str, dir_path: str='./Output', reference: str=None) -> List[FigureSpec]:
+    """
+    Degree distribution figure per sampler and, with a reference sampler, one facet of QQ plots of every other sampler
+    against it; file names follow the Output/ directory convention.
+
+    Args:
+        degree_hists (Dict[str, np.ndarray]): Sampler name -> merged degree histogram over trials
+        graph_name (str): Name of sampled graph, eg. 'G1'
+        dir_path (str, optional): Output directory. Defaults to './Output'.
+        reference (str, optional): Sampler name the QQ facet compares against; no facet if None. Defaults to None.
+
+    Returns:
+        List[FigureSpec]: Figures to render
+    """
+    specs = [FigureSpec(kind='degree_distribution',
+                        title=f'{sampler_name} Degree Distribution ({graph_name})',
+                        path=os.path.join(dir_path, f'{sampler_name}_{graph_name}_degree_distribution.jpg'),
+                        data={'hist': hist})
+            for sampler_name, hist in degree_hists.items()]
+
+    if reference is not None:
+        ref_q = histogram_quantiles(hist=degree_hists[reference])
+        others = {name: histogram_quantiles(hist=hist) for name, hist in degree_hists.items() if name != reference}
+        specs.append(FigureSpec(kind='degree_facet',
+                                title=f'2-Sample QQ Plots Relative to {reference} ({graph_name})',
+                                path=os.path.join(dir_path, f'{reference}_{graph_name}_degree_facet.jpg'),
+                                data={'reference': ref_q, 'others': others}))
+    return specs
+
+def sample_graph_spec(graph: nx.Graph, title: str, path: str) -> FigureSpec:
+    """
+    Drawing of a sample graph, as saved under Graph Plots/.
+
+    Args:
+        graph (nx.Graph): Sample of a network
+        title (str): Figure title
+        path (str): Output file path
+
+    Returns:
+        FigureSpec: Figure to render
+    """
+    return FigureSpec(kind='sample_graph', title=title, path=path, data={'nodes': sample_nodes(graph=graph), 'edges': sample_edges(graph=graph)})
+
+def render_figure(spec: FigureSpec) -> str:
+    """
+    Draws one figure with the non-interactive Agg backend and writes it to spec.path.
+
+    Args:
+        spec (FigureSpec): Figure to draw
+
+    Raises:
+        ValueError: spec.kind is unknown
+
+    Returns:
+        str: Path written
+    """
+    import matplotlib
+    matplotlib.use('Agg', force=True)
+    import matplotlib.pyplot as plt
+
+    if spec.kind == 'degree_distribution':
+        hist = spec.data['hist']
+        height = hist / max([hist.sum(), 1])
+        fig, ax = plt.subplots()
+        ax.bar(x=np.arange(hist.size), height=height, width=1.0, color='magenta')
+        # Gaussian-smoothed density in place of a KDE over every sampled degree
+        kernel = np.exp(-0.5 * np.linspace(-3, 3, 13) ** 2)
+        ax.plot(np.arange(hist.size), np.convolve(height, kernel / kernel.sum(), mode='full')[kernel.size // 2:kernel.size // 2 + hist.size], color='green')
+        ax.set_xlabel('Degree')
+        ax.set_ylabel('Relative Frequency')
+        ax.tick_params(axis='x', labelsize=4)
+    elif spec.kind == 'degree_facet':
+        others = spec.data['others']
+        fig, axes = plt.subplots(nrows=1, ncols=max([len(others), 1]), sharex='all', sharey='all', figsize=(3 * max([len(others), 1]), 3), squeeze=False)
+        for ax, (sampler_name, q) in zip(axes[0], others.items()):
+            ax.scatter(spec.data['reference'], q, s=4)
+            lim = max([spec.data['reference'].max(initial=0), q.max(initial=0)])
+            ax.plot([0, lim], [0, lim], color='red', linewidth=0.8)
+            ax.set_title(sampler_name, fontsize=8)
+        fig.tight_layout(pad=0.5)
+    elif spec.kind == 'sample_graph':
+        g = nx.Graph()
+        g.add_nodes_from(spec.data['nodes'])
+        g.add_edges_from(map(tuple, spec.data['edges']))
+        fig, ax = plt.subplots()
+        nx.draw(G=g, pos=nx.spring_layout(G=g, seed=0), ax=ax, node_size=20)
+    else:
+        raise ValueError(f'Unknown figure kind \'{spec.kind}\'')
+
+    fig.suptitle(spec.title, fontsize=12)
+    os.makedirs(name=os.path.dirname(spec.path) or '.', exist_ok=True)
+    fig.savefig(spec.path, format='JPG', dpi=300)
+    plt.close(fig)
+    return spec.path
+
+def render_all(specs: Iterable[FigureSpec], n_jobs: int=None) -> List[str]:
+    """
+    Renders figures in a pool of worker processes. Workers only receive the compact arrays in each spec.
+
+    Args:
+        specs (Iterable[FigureSpec]): Figures to draw
+        n_jobs (int, optional): Number of worker processes; mp.cpu_count() if None. Defaults to None.
+
+    Returns:
+        List[str]: Paths written, in order of specs
+    """
+    specs = list(specs)
+    if n_jobs == 1 or len(specs) <= 1:
+        return [render_figure(spec=spec) for spec in specs]
+
+    with mp.Pool(processes=min([n_jobs or mp.cpu_count(), len(specs)])) as pool:
+        paths = pool.map(render_figure, specs)
+
+    if __debug__:
+        print(f'render_all: wrote {len(paths)} figures')
+
+    return paths
+#endregion
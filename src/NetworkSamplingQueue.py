@@ -0,0 +1,578 @@
+
+from contextlib import closing
+import os
+import pickle
+import socket
+import sqlite3
+import sys
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+#region
+class JobQueue:
+    """
+    Job queue kept in a single SQLite file, so any number of worker processes on one host can claim and complete jobs without a server.
+    Payloads and results are pickled. A job is claimed inside an exclusive write transaction, so no two workers get the same job; with a
+    lease, jobs whose worker has not completed them within 'lease' seconds (eg. because the worker died) are handed out again, and only
+    the worker currently holding a job can complete or fail it. SQLite's locking is unreliable on network filesystems, so keep the file
+    on a local disk and run all workers on the host that owns it; DirectoryJobQueue serves workers on several hosts.
+    """
+    def __init__(self, path: str, lease: float=None, timeout: float=60.0):
+        """
+        Opens the queue, creating its file and tables if needed.
+
+        Args:
+            path (str): Path of SQLite file
+            lease (float, optional): Seconds after which a claimed but uncompleted job can be claimed again; never if None. Defaults to None.
+            timeout (float, optional): Seconds to wait for another process's lock on the file. Defaults to 60.0.
+        """
+        self.path = path
+        self.lease = lease
+        self.timeout = timeout
+
+        with closing(self._connect()) as con:
+            con.execute('CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value BLOB)')
+            con.execute("""CREATE TABLE IF NOT EXISTS jobs (id INTEGER PRIMARY KEY AUTOINCREMENT,
+                                                            payload BLOB NOT NULL,
+                                                            status TEXT NOT NULL DEFAULT 'pending',
+                                                            worker TEXT,
+                                                            claimed_at REAL,
+                                                            attempts INTEGER NOT NULL DEFAULT 0,
+                                                            result BLOB,
+                                                            error TEXT)""")
+            con.execute('CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status)')
+
+    def __repr__(self):
+        """
+        Representation of JobQueue object.
+
+        Returns:
+            str: Representation of JobQueue object.
+        """
+        return f'<JobQueue: path={self.path}, lease={self.lease}, counts={self.counts()}>'
+
+    def __len__(self):
+        """
+        Number of jobs in any state.
+
+        Returns:
+            int: Number of jobs
+        """
+        return sum(self.counts().values())
+
+    def _connect(self) -> sqlite3.Connection:
+        """
+        New connection to the queue file; connections are not shared between processes.
+        """
+        return sqlite3.connect(database=self.path, timeout=self.timeout, isolation_level=None)
+
+    def set_meta(self, key: str, value: Any):
+        """
+        Stores a pickled value shared by all jobs, eg. the definition of a grid.
+
+        Args:
+            key (str): Name of value
+            value (Any): Picklable value
+        """
+        with closing(self._connect()) as con:
+            con.execute('INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)', (key, pickle.dumps(value)))
+
+    def get_meta(self, key: str) -> Any:
+        """
+        Value stored with set_meta.
+
+        Args:
+            key (str): Name of value
+
+        Raises:
+            KeyError: Nothing is stored under key
+
+        Returns:
+            Any: Unpickled value
+        """
+        with closing(self._connect()) as con:
+            row = con.execute('SELECT value FROM meta WHERE key = ?', (key,)).fetchone()
+        if row is None:
+            raise KeyError(f'No value stored under {key} in {self.path}')
+        return pickle.loads(row[0])
+
+    def put(self, payloads: Iterable[Any]) -> List[int]:
+        """
+        Adds pending jobs.
+
+        Args:
+            payloads (Iterable[Any]): Picklable description of each job
+
+        Returns:
+            List[int]: Id of each new job
+        """
+        ids = list()
+        con = self._connect()
+        try:
+            con.execute('BEGIN IMMEDIATE')
+            for payload in payloads:
+                ids.append(con.execute('INSERT INTO jobs (payload) VALUES (?)', (pickle.dumps(payload),)).lastrowid)
+            con.execute('COMMIT')
+        finally:
+            con.close()
+        return ids
+
+    def claim(self, worker: str) -> Optional[Tuple[int, Any]]:
+        """
+        Claims the oldest pending job, or the oldest job whose lease has expired.
+
+        Args:
+            worker (str): Name of claiming worker
+
+        Returns:
+            Optional[Tuple[int, Any]]: Job id and payload, or None if no job can be claimed
+        """
+        now = time.time()
+        con = self._connect()
+        try:
+            con.execute('BEGIN IMMEDIATE')
+            if self.lease is None:
+                row = con.execute("SELECT id, payload FROM jobs WHERE status = 'pending' ORDER BY id LIMIT 1").fetchone()
+            else:
+                row = con.execute("""SELECT id, payload FROM jobs WHERE status = 'pending' OR (status = 'running' AND claimed_at < ?)
+                                    ORDER BY id LIMIT 1""", (now - self.lease,)).fetchone()
+            if row is not None:
+                con.execute("UPDATE jobs SET status = 'running', worker = ?, claimed_at = ?, attempts = attempts + 1 WHERE id = ?",
+                            (worker, now, row[0]))
+            con.execute('COMMIT')
+        finally:
+            con.close()
+        return None if row is None else (row[0], pickle.loads(row[1]))
+
+    def complete(self, job_id: int, result: Any, worker: str) -> bool:
+        """
+        Stores the result of a job claimed by worker. Nothing is stored if the job has since been handed to another worker.
+
+        Args:
+            job_id (int): Id of job
+            result (Any): Picklable result
+            worker (str): Name of worker that claimed the job
+
+        Returns:
+            bool: Whether the result was stored
+        """
+        with closing(self._connect()) as con:
+            return con.execute("UPDATE jobs SET status = 'done', result = ?, error = NULL WHERE id = ? AND worker = ? AND status = 'running'",
+                                (pickle.dumps(result), job_id, worker)).rowcount == 1
+
+    def fail(self, job_id: int, error: str, worker: str) -> bool:
+        """
+        Marks a job claimed by worker as failed; failed jobs are not claimed again until requeued. Nothing is changed if the job has
+        since been handed to another worker.
+
+        Args:
+            job_id (int): Id of job
+            error (str): Description of error
+            worker (str): Name of worker that claimed the job
+
+        Returns:
+            bool: Whether the job was marked as failed
+        """
+        with closing(self._connect()) as con:
+            return con.execute("UPDATE jobs SET status = 'failed', error = ? WHERE id = ? AND worker = ? AND status = 'running'",
+                                (error, job_id, worker)).rowcount == 1
+
+    def requeue_failed(self) -> int:
+        """
+        Makes failed jobs pending again.
+
+        Returns:
+            int: Number of requeued jobs
+        """
+        with closing(self._connect()) as con:
+            return con.execute("UPDATE jobs SET status = 'pending', error = NULL WHERE status = 'failed'").rowcount
+
+    def requeue_running(self) -> int:
+        """
+        Makes running jobs pending again, eg. jobs left behind by workers that were killed. Only call when no worker is running.
+
+        Returns:
+            int: Number of requeued jobs
+        """
+        with closing(self._connect()) as con:
+            return con.execute("UPDATE jobs SET status = 'pending', worker = NULL, claimed_at = NULL WHERE status = 'running'").rowcount
+
+    def counts(self) -> Dict[str, int]:
+        """
+        Number of jobs per state ('pending', 'running', 'done', 'failed').
+
+        Returns:
+            Dict[str, int]: State -> number of jobs
+        """
+        counts = {'pending': 0, 'running': 0, 'done': 0, 'failed': 0}
+        with closing(self._connect()) as con:
+            for status, count in con.execute('SELECT status, COUNT(*) FROM jobs GROUP BY status'):
+                counts[status] = count
+        return counts
+
+    def results(self) -> List[Tuple[Any, Any]]:
+        """
+        Payload and result of every completed job, in job id order.
+
+        Returns:
+            List[Tuple[Any, Any]]: (payload, result) per completed job
+        """
+        with closing(self._connect()) as con:
+            rows = con.execute("SELECT payload, result FROM jobs WHERE status = 'done' ORDER BY id").fetchall()
+        return [(pickle.loads(payload), pickle.loads(result)) for payload, result in rows]
+
+    def errors(self) -> List[Tuple[Any, str]]:
+        """
+        Payload and error of every failed job, in job id order.
+
+        Returns:
+            List[Tuple[Any, str]]: (payload, error) per failed job
+        """
+        with closing(self._connect()) as con:
+            rows = con.execute("SELECT payload, error FROM jobs WHERE status = 'failed' ORDER BY id").fetchall()
+        return [(pickle.loads(payload), error) for payload, error in rows]
+#endregion
+
+#region
+JOB_STATES = ('pending', 'running', 'done', 'failed')
+
+class DirectoryJobQueue:
+    """
+    Job queue kept in a directory of lock files, with the interface of JobQueue, for workers on several hosts sharing a filesystem
+    such as NFS, where SQLite's locking cannot be trusted. Every job is a marker file in the subdirectory of its state, and every change
+    of state is a single os.rename of its marker, which the file server performs atomically: of several workers renaming the same
+    pending marker, exactly one succeeds, so no two workers get the same job. Job ids are reserved by creating a file with O_EXCL.
+    A running marker is named after the job and its worker, so complete and fail only succeed for the worker currently holding the job.
+    With a lease, jobs whose marker has not been touched within 'lease' seconds are handed out again; the clocks of all hosts must agree
+    to well within the lease.
+    """
+    def __init__(self, path: str, lease: float=None):
+        """
+        Opens the queue, creating its directories if needed.
+
+        Args:
+            path (str): Path of queue directory
+            lease (float, optional): Seconds after which a claimed but uncompleted job can be claimed again; never if None. Defaults to None.
+        """
+        self.path = path
+        self.lease = lease
+        for name in JOB_STATES + ('ids', 'payloads', 'results', 'errors', 'meta'):
+            os.makedirs(name=os.path.join(path, name), exist_ok=True)
+
+    def __repr__(self):
+        """
+        Representation of DirectoryJobQueue object.
+
+        Returns:
+            str: Representation of DirectoryJobQueue object.
+        """
+        return f'<DirectoryJobQueue: path={self.path}, lease={self.lease}, counts={self.counts()}>'
+
+    def __len__(self):
+        """
+        Number of jobs in any state.
+
+        Returns:
+            int: Number of jobs
+        """
+        return sum(self.counts().values())
+
+    def _markers(self, state: str) -> List[Tuple[int, str, str]]:
+        """
+        (job id, worker, file name) of every marker in a state directory, in job id order; worker is None for pending jobs.
+        """
+        markers = list()
+        for name in os.listdir(os.path.join(self.path, state)):
+            if name.startswith('.'):
+                continue  # temporary file of a write in progress
+            job_id, _, worker = name.partition('@')
+            markers.append((int(job_id), worker or None, name))
+        return sorted(markers)
+
+    def _write(self, path: str, data: bytes):
+        """
+        Writes a file through a temporary name in the same directory, so readers never see it partly written.
+        """
+        tmp_path = os.path.join(os.path.dirname(path), f'.{os.path.basename(path)}.{socket.gethostname()}.{os.getpid()}.tmp')
+        with open(file=tmp_path, mode='wb') as f:
+            f.write(data)
+        os.replace(src=tmp_path, dst=path)
+
+    def _move(self, src: str, dst: str) -> bool:
+        """
+        Renames a marker; False if another worker moved it first.
+        """
+        try:
+            os.rename(src=src, dst=dst)
+        except FileNotFoundError:
+            return False
+        return True
+
+    @staticmethod
+    def _marker(job_id: int, worker: str=None) -> str:
+        """
+        File name of the marker of a job, with the worker holding it; path separators in worker are replaced.
+        """
+        return f'{job_id:012d}' if worker is None else f'{job_id:012d}@{worker.replace(os.sep, "_")}'
+
+    def set_meta(self, key: str, value: Any):
+        """
+        Stores a pickled value shared by all jobs, eg. the definition of a grid.
+
+        Args:
+            key (str): Name of value
+            value (Any): Picklable value
+        """
+        self._write(path=os.path.join(self.path, 'meta', key.replace(os.sep, '_')), data=pickle.dumps(value))
+
+    def get_meta(self, key: str) -> Any:
+        """
+        Value stored with set_meta.
+
+        Args:
+            key (str): Name of value
+
+        Raises:
+            KeyError: Nothing is stored under key
+
+        Returns:
+            Any: Unpickled value
+        """
+        try:
+            with open(file=os.path.join(self.path, 'meta', key.replace(os.sep, '_')), mode='rb') as f:
+                return pickle.load(f)
+        except FileNotFoundError:
+            raise KeyError(f'No value stored under {key} in {self.path}')
+
+    def put(self, payloads: Iterable[Any]) -> List[int]:
+        """
+        Adds pending jobs.
+
+        Args:
+            payloads (Iterable[Any]): Picklable description of each job
+
+        Returns:
+            List[int]: Id of each new job
+        """
+        ids_path = os.path.join(self.path, 'ids')
+        job_id = max([int(name) for name in os.listdir(ids_path)], default=0)
+        ids = list()
+        for payload in payloads:
+            while True:
+                job_id += 1
+                try:
+                    os.close(os.open(os.path.join(ids_path, self._marker(job_id=job_id)), os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+                    break
+                except FileExistsError:
+                    continue  # reserved by a concurrent put
+            self._write(path=os.path.join(self.path, 'payloads', self._marker(job_id=job_id)), data=pickle.dumps(payload))
+            self._write(path=os.path.join(self.path, 'pending', self._marker(job_id=job_id)), data=b'')
+            ids.append(job_id)
+        return ids
+
+    def claim(self, worker: str) -> Optional[Tuple[int, Any]]:
+        """
+        Claims the oldest pending job, or the oldest job whose lease has expired.
+
+        Args:
+            worker (str): Name of claiming worker
+
+        Returns:
+            Optional[Tuple[int, Any]]: Job id and payload, or None if no job can be claimed
+        """
+        candidates = [('pending', job_id, name) for job_id, _, name in self._markers(state='pending')]
+        if self.lease is not None:
+            expired = time.time() - self.lease
+            running_path = os.path.join(self.path, 'running')
+            for job_id, _, name in self._markers(state='running'):
+                try:
+                    if os.stat(os.path.join(running_path, name)).st_mtime < expired:
+                        candidates.append(('running', job_id, name))
+                except FileNotFoundError:
+                    continue
+            candidates.sort(key=lambda candidate: candidate[1])
+
+        for state, job_id, name in candidates:
+            claimed_path = os.path.join(self.path, 'running', self._marker(job_id=job_id, worker=worker))
+            if self._move(src=os.path.join(self.path, state, name), dst=claimed_path):
+                os.utime(claimed_path)  # start of lease
+                with open(file=os.path.join(self.path, 'payloads', self._marker(job_id=job_id)), mode='rb') as f:
+                    return job_id, pickle.load(f)
+        return None
+
+    def complete(self, job_id: int, result: Any, worker: str) -> bool:
+        """
+        Stores the result of a job claimed by worker. Nothing is stored if the job has since been handed to another worker.
+
+        Args:
+            job_id (int): Id of job
+            result (Any): Picklable result
+            worker (str): Name of worker that claimed the job
+
+        Returns:
+            bool: Whether the result was stored
+        """
+        name = self._marker(job_id=job_id, worker=worker)
+        result_path = os.path.join(self.path, 'results', name)
+        self._write(path=result_path, data=pickle.dumps(result))  # named after the worker, so it never replaces another worker's result
+        if self._move(src=os.path.join(self.path, 'running', name), dst=os.path.join(self.path, 'done', name)):
+            return True
+        os.remove(result_path)
+        return False
+
+    def fail(self, job_id: int, error: str, worker: str) -> bool:
+        """
+        Marks a job claimed by worker as failed; failed jobs are not claimed again until requeued. Nothing is changed if the job has
+        since been handed to another worker.
+
+        Args:
+            job_id (int): Id of job
+            error (str): Description of error
+            worker (str): Name of worker that claimed the job
+
+        Returns:
+            bool: Whether the job was marked as failed
+        """
+        name = self._marker(job_id=job_id, worker=worker)
+        error_path = os.path.join(self.path, 'errors', name)
+        self._write(path=error_path, data=error.encode())
+        if self._move(src=os.path.join(self.path, 'running', name), dst=os.path.join(self.path, 'failed', name)):
+            return True
+        os.remove(error_path)
+        return False
+
+    def _requeue(self, state: str) -> int:
+        """
+        Moves every job of a state back to pending.
+        """
+        n_requeued = 0
+        for job_id, _, name in self._markers(state=state):
+            n_requeued += self._move(src=os.path.join(self.path, state, name), dst=os.path.join(self.path, 'pending', self._marker(job_id=job_id)))
+        return n_requeued
+
+    def requeue_failed(self) -> int:
+        """
+        Makes failed jobs pending again.
+
+        Returns:
+            int: Number of requeued jobs
+        """
+        return self._requeue(state='failed')
+
+    def requeue_running(self) -> int:
+        """
+        Makes running jobs pending again, eg. jobs left behind by workers that were killed. Only call when no worker is running.
+
+        Returns:
+            int: Number of requeued jobs
+        """
+        return self._requeue(state='running')
+
+    def counts(self) -> Dict[str, int]:
+        """
+        Number of jobs per state ('pending', 'running', 'done', 'failed').
+
+        Returns:
+            Dict[str, int]: State -> number of jobs
+        """
+        return {state: len(self._markers(state=state)) for state in JOB_STATES}
+
+    def results(self) -> List[Tuple[Any, Any]]:
+        """
+        Payload and result of every completed job, in job id order.
+
+        Returns:
+            List[Tuple[Any, Any]]: (payload, result) per completed job
+        """
+        retval = list()
+        for job_id, _, name in self._markers(state='done'):
+            with open(file=os.path.join(self.path, 'payloads', self._marker(job_id=job_id)), mode='rb') as f:
+                payload = pickle.load(f)
+            with open(file=os.path.join(self.path, 'results', name), mode='rb') as f:
+                retval.append((payload, pickle.load(f)))
+        return retval
+
+    def errors(self) -> List[Tuple[Any, str]]:
+        """
+        Payload and error of every failed job, in job id order.
+
+        Returns:
+            List[Tuple[Any, str]]: (payload, error) per failed job
+        """
+        retval = list()
+        for job_id, _, name in self._markers(state='failed'):
+            with open(file=os.path.join(self.path, 'payloads', self._marker(job_id=job_id)), mode='rb') as f:
+                payload = pickle.load(f)
+            with open(file=os.path.join(self.path, 'errors', name), mode='r') as f:
+                retval.append((payload, f.read()))
+        return retval
+#endregion
+
+def open_queue(path: str, lease: float=None) -> Union[JobQueue, DirectoryJobQueue]:
+    """
+    Opens the queue at path: a DirectoryJobQueue if path is an existing directory or ends with a path separator, for workers on several
+    hosts sharing a filesystem, and a SQLite JobQueue otherwise.
+
+    Args:
+        path (str): Path of queue file or directory
+        lease (float, optional): Seconds after which a claimed but uncompleted job can be claimed again; never if None. Defaults to None.
+
+    Returns:
+        Union[JobQueue, DirectoryJobQueue]: Queue
+    """
+    if os.path.isdir(path) or path.endswith(os.sep):
+        return DirectoryJobQueue(path=path, lease=lease)
+    return JobQueue(path=path, lease=lease)
+
+def run_worker(path: str, worker: str=None, max_jobs: int=None, lease: float=None, poll_interval: float=1.0) -> int:
+    """
+    Runs grid cells from a queue filled by NetworkSamplerGrid.enqueue until none are left to claim. Each job is one (graph, sampler,
+    scorer) cell; the worker loads the grid definition once and a graph only when a job needs a different graph than the last one, so
+    it holds one graph in memory at a time. With a lease, the worker keeps polling while other workers' jobs are running, so it can
+    take over jobs of workers that died. Start more workers with 'python NetworkSamplingQueue.py <path>', on the queue's host for a
+    SQLite queue, or on any host sharing the filesystem for a queue directory (see open_queue).
+
+    Args:
+        path (str): Path of queue file or directory
+        worker (str, optional): Name of worker recorded with its jobs; '<host>:<pid>' if None. Defaults to None.
+        max_jobs (int, optional): Number of jobs after which to stop; no limit if None. Defaults to None.
+        lease (float, optional): Seconds after which jobs claimed by other workers can be taken over; see JobQueue. Defaults to None.
+        poll_interval (float, optional): Seconds between polls while waiting on other workers' jobs. Defaults to 1.0.
+
+    Returns:
+        int: Number of jobs this worker completed
+    """
+    queue = open_queue(path=path, lease=lease)
+    worker = f'{socket.gethostname()}:{os.getpid()}' if worker is None else worker
+    grid = queue.get_meta(key='grid')
+    graph_idx, graph = None, None
+    n_done = 0
+
+    while max_jobs is None or n_done < max_jobs:
+        job = queue.claim(worker=worker)
+        if job is None:
+            if lease is not None and queue.counts()['running'] > 0:
+                time.sleep(poll_interval)
+                continue
+            break
+
+        job_id, cell = job
+        if cell['graph_idx'] != graph_idx:
+            graph_idx, graph = cell['graph_idx'], None  # drop the previous graph before loading the next
+            graph = queue.get_meta(key=f'graph/{graph_idx}')
+
+        if __debug__:
+            print(f'run_worker: {worker} claimed job {job_id}: {cell}')
+
+        try:
+            result = grid._sample_cell(graph=graph, row_idx=cell['row_idx'], col_idx=cell['col_idx'], start_node=cell['start_node'],
+                                        n_trials=cell['n_trials'])
+        except Exception as e:
+            queue.fail(job_id=job_id, error=repr(e), worker=worker)
+            continue
+        n_done += queue.complete(job_id=job_id, result=result, worker=worker)
+
+    return n_done
+
+if __name__ == '__main__':
+    run_worker(path=sys.argv[1])
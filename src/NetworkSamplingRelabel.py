@@ -0,0 +1,243 @@
+
+import networkx as nx
+import numpy as np
+from typing import Any, Hashable, Iterable, Union
+import weakref
+
+from NetworkSamplingCSR import CSRGraph, _index_dtype
+
+# Per-graph cache of RelabelIndex, dropped automatically once the graph itself is garbage collected
+_relabel_cache = weakref.WeakKeyDictionary()
+
+#region
+class RelabelIndex:
+    """
+    Two-way mapping between the node ids of a graph (strings, tuples, sparse integers, database keys) and the contiguous
+    integers 0..n-1 expected by littleballoffur samplers and CSRGraph. Integer i stands for ids[i]. Integer ids are
+    mapped back to integers by binary search over a sorted copy, so no dict of every node is kept; any other hashable
+    ids are kept as the original objects and looked up through a dict. Graphs whose nodes already are 0..n-1 get an
+    identity index that maps nothing.
+    """
+    def __init__(self, ids: np.ndarray, name: str=None):
+        """
+        Initializes an index over an array of distinct node ids.
+
+        Args:
+            ids (np.ndarray): Node id of each integer label, as an integer array or an object array of hashable ids;
+                identity index if it equals arange(len(ids))
+            name (str, optional): Name of indexed graph. Defaults to None.
+
+        Raises:
+            ValueError: ids contain duplicates
+        """
+        self.ids = ids
+        self.name = name
+        self.adjacency_size = None  # adjacency entries of the indexed graph, set by from_graph to detect edge edits
+        self._lookup = None
+        if np.issubdtype(ids.dtype, np.integer):
+            self._order = np.argsort(ids, kind='stable')
+            self._sorted_ids = ids[self._order]
+            duplicates = self._sorted_ids.size > 1 and np.any(self._sorted_ids[1:] == self._sorted_ids[:-1])
+        else:
+            self._lookup = {v: i for i, v in enumerate(ids.tolist())}
+            # Canonical order independent of insertion order (used by fingerprints); ids need not be mutually orderable
+            self._order = np.asarray(a=sorted(range(ids.size), key=lambda i: (str(ids[i]), type(ids[i]).__name__, repr(ids[i]))),
+                                    dtype=np.int64)
+            self._sorted_ids = ids[self._order]
+            duplicates = len(self._lookup) != ids.size
+        if duplicates:
+            raise ValueError('Node ids of a RelabelIndex must be distinct')
+        self.is_identity = self._lookup is None and np.array_equal(ids, np.arange(ids.size))
+        self._csr = None
+
+    def __repr__(self):
+        """
+        Representation of RelabelIndex object.
+
+        Returns:
+            str: Representation of RelabelIndex object.
+        """
+        return f'<RelabelIndex: name={self.name}, number_of_nodes={self.number_of_nodes()}, is_identity={self.is_identity}>'
+
+    def __len__(self):
+        """
+        Number of indexed nodes.
+
+        Returns:
+            int: Number of nodes
+        """
+        return self.number_of_nodes()
+
+    def __contains__(self, n: Any):
+        """
+        Whether n is an indexed node id.
+
+        Args:
+            n (Any): Node id
+
+        Returns:
+            bool: Whether n is in the index
+        """
+        if self._lookup is not None:
+            try:
+                return n in self._lookup
+            except TypeError:  # unhashable
+                return False
+        if not isinstance(n, (int, np.integer)) or isinstance(n, bool):
+            return False
+        pos = int(np.searchsorted(self._sorted_ids, n))
+        return pos < self._sorted_ids.size and self._sorted_ids[pos] == n
+
+    def number_of_nodes(self):
+        """
+        Number of indexed nodes.
+
+        Returns:
+            int: Number of nodes
+        """
+        return int(self.ids.size)
+
+    @classmethod
+    def from_graph(cls, graph: Union[nx.Graph, CSRGraph]):
+        """
+        Indexes the nodes of a graph. Integer node ids that are a permutation of 0..n-1 give an identity index.
+
+        Args:
+            graph (Union[nx.Graph, CSRGraph]): Graph to index
+
+        Returns:
+            RelabelIndex: Index over the nodes of graph
+        """
+        n = graph.number_of_nodes()
+        if isinstance(graph, CSRGraph):
+            index = cls(ids=np.arange(n), name=graph.name)
+        else:
+            nodes = list(graph.nodes)
+            if all(isinstance(v, (int, np.integer)) and not isinstance(v, bool) for v in nodes):
+                ids = np.asarray(a=nodes, dtype=np.int64)
+                if n > 0 and ids.min() == 0 and ids.max() == n - 1:
+                    ids = np.arange(n)
+            else:
+                # Original objects, so tuple ids stay single ids and come back unchanged
+                ids = np.fromiter(nodes, dtype=object, count=n)
+            index = cls(ids=ids, name=graph.name)
+        index.adjacency_size = _adjacency_size(graph=graph)
+        return index
+
+    def to_int(self, nodes: Union[Any, Iterable[Any]]) -> Union[int, np.ndarray]:
+        """
+        Integer labels of node ids. Any id in the index is a single node, and so is a tuple when ids are not integers
+        (eg. a missing grid coordinate); other iterables are lists of ids.
+
+        Args:
+            nodes (Union[Any, Iterable[Any]]): A single node id or an iterable of node ids
+
+        Raises:
+            KeyError: Some node id is not in the index
+
+        Returns:
+            Union[int, np.ndarray]: Integer label of a single id, or array of labels
+        """
+        single = nodes in self or isinstance(nodes, (str, bytes)) or not isinstance(nodes, Iterable) \
+            or (self._lookup is not None and isinstance(nodes, tuple))
+        keys = [nodes] if single else list(nodes)
+        if self._lookup is not None:
+            labels = np.fromiter((self._lookup.get(v, -1) if isinstance(v, Hashable) else -1 for v in keys), dtype=np.int64, count=len(keys))
+            missing = labels < 0
+        else:
+            key_array = np.asarray(a=keys)
+            if key_array.size > 0 and not np.issubdtype(key_array.dtype, np.integer):
+                labels, missing = np.zeros(shape=(len(keys),), dtype=np.int64), np.asarray(a=[v not in self for v in keys], dtype=bool)
+            elif self.is_identity:
+                labels = key_array.astype(np.int64)
+                missing = (labels < 0) | (labels >= self.ids.size)
+            else:
+                pos = np.searchsorted(self._sorted_ids, key_array).clip(max=max([self._sorted_ids.size - 1, 0]))
+                missing = self._sorted_ids[pos] != key_array if self._sorted_ids.size > 0 else np.ones(shape=key_array.shape, dtype=bool)
+                labels = self._order[pos]
+        if np.any(missing):
+            raise KeyError(f'Node ids not in index: {[v for v, m in zip(keys, missing) if m][:10]}')
+        return int(labels[0]) if single else labels
+
+    def to_ids(self, labels: Union[int, Iterable[int]]) -> Union[Any, np.ndarray]:
+        """
+        Node ids of integer labels.
+
+        Args:
+            labels (Union[int, Iterable[int]]): A single integer label or an iterable of labels
+
+        Returns:
+            Union[Any, np.ndarray]: Node id of a single label, or array of ids
+        """
+        if np.ndim(labels) == 0:
+            n = self.ids[int(labels)]
+            return n.item() if isinstance(n, np.generic) else n
+        return self.ids[np.asarray(a=list(labels), dtype=np.int64)]
+
+    def csr(self, graph: Union[nx.Graph, CSRGraph]) -> CSRGraph:
+        """
+        Integer-labeled CSR copy of the indexed graph, built once and kept on the index. A CSRGraph is returned as is.
+
+        Args:
+            graph (Union[nx.Graph, CSRGraph]): Graph this index was built from
+
+        Returns:
+            CSRGraph: Graph with nodes relabeled to 0..n-1
+        """
+        if isinstance(graph, CSRGraph):
+            return graph
+        if self._csr is None:
+            n = self.number_of_nodes()
+            edges = list(graph.edges)
+            src = self.to_int(nodes=[u for u, _ in edges]) if edges else np.asarray(a=[], dtype=np.int64)
+            dst = self.to_int(nodes=[v for _, v in edges]) if edges else np.asarray(a=[], dtype=np.int64)
+            dtype = _index_dtype(number_of_nodes=n)
+            self._csr = CSRGraph.from_edges(src=src.astype(dtype), dst=dst.astype(dtype), number_of_nodes=n, name=self.name)
+
+            if __debug__:
+                print(f'RelabelIndex.csr: built {repr(self._csr)}')
+
+        return self._csr
+
+    def relabel_sample(self, sample: nx.Graph) -> nx.Graph:
+        """
+        Maps an integer-labeled sample back to the original node ids. Only the sample is copied.
+
+        Args:
+            sample (nx.Graph): Sample whose nodes are integer labels of this index
+
+        Returns:
+            nx.Graph: Same sample with original node ids
+        """
+        if self.is_identity:
+            return sample
+        labels = list(sample.nodes)
+        return nx.relabel_nodes(G=sample, mapping=dict(zip(labels, self.to_ids(labels=labels).tolist())), copy=True)
+#endregion
+
+def _adjacency_size(graph: Union[nx.Graph, CSRGraph]) -> int:
+    """
+    Number of adjacency entries of graph, which changes with its number of edges. Summed over the adjacency dicts of an nx.Graph
+    directly, several times faster than nx.Graph.number_of_edges, since it runs on every sampling trial.
+    """
+    if isinstance(graph, CSRGraph):
+        return int(graph.indices.shape[0])
+    return sum(map(len, graph._adj.values()))
+
+def relabel_index(graph: Union[nx.Graph, CSRGraph]) -> RelabelIndex:
+    """
+    RelabelIndex of graph, computed once and cached next to the graph for as long as the graph is alive. The index
+    (and its CSR copy) is rebuilt if the graph's number of nodes or edges has changed since; call
+    NetworkSamplingDynamic.invalidate_graph_caches after edits that keep both.
+
+    Args:
+        graph (Union[nx.Graph, CSRGraph]): Graph to index
+
+    Returns:
+        RelabelIndex: Cached index over the nodes of graph
+    """
+    index = _relabel_cache.get(graph)
+    if index is None or index.number_of_nodes() != graph.number_of_nodes() or index.adjacency_size != _adjacency_size(graph=graph):
+        index = RelabelIndex.from_graph(graph=graph)
+        _relabel_cache[graph] = index
+    return index
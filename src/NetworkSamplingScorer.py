@@ -2,14 +2,57 @@
 from __future__ import annotations
 from collections import Counter
 import copy
-from joblib import Parallel, delayed
 import multiprocessing as mp
 import networkx as nx
 import numpy as np
 # import pdb
 import statistics
-from typing import Any, Callable, Dict, Iterable, Optional, Union
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+import weakref
 from NetworkSampling import NSMethod, NetworkSampler
+from NetworkSamplingFingerprint import parent_statistic
+from NetworkSamplingRelabel import RelabelIndex, relabel_index
+from NetworkSamplingStructure import clustering_summary, parent_clustering_summary, parent_spectrum, top_eigenvalues
+from NetworkSamplingVisitFrequency import expected_visit_frequencies, stationary_distribution
+
+# Visit frequencies of parent graphs keyed by (start_node, n_steps) as arrays over integer labels, kept with the RelabelIndex they were
+# computed over, so they are looked up again once relabel_index rebuilds the index after an edit of the parent
+_visit_frequency_cache = weakref.WeakKeyDictionary()
+
+def parent_visit_frequencies(parent: nx.Graph, start_node: int=None, n_steps: int=None) -> Tuple[RelabelIndex, np.ndarray]:
+    """
+    Random walk visit frequencies of a parent network as an array over its RelabelIndex, computed once per (network, start_node, n_steps)
+    and cached for every later trial (see parent_statistic): expected visits of an n_steps-step walk from start_node, or the stationary
+    distribution if n_steps is None.
+
+    Args:
+        parent (nx.Graph): Network samples are drawn from
+        start_node (int, optional): Start node of walk; required with n_steps. Defaults to None.
+        n_steps (int, optional): Number of steps of walk. Defaults to None.
+
+    Returns:
+        Tuple[RelabelIndex, np.ndarray]: Index of parent; visit frequency per integer label
+    """
+    index = relabel_index(graph=parent)
+    cached_index, parent_cache = _visit_frequency_cache.get(parent, (None, None))
+    if cached_index is not index:
+        parent_cache = dict()
+        _visit_frequency_cache[parent] = (index, parent_cache)
+    key = (start_node, n_steps)
+    if key not in parent_cache:
+        def _by_id():
+            csr = index.csr(graph=parent)
+            if n_steps is None:
+                freq = stationary_distribution(graph=csr)
+            else:
+                freq = expected_visit_frequencies(graph=csr, start_node=index.to_int(nodes=start_node), n_steps=n_steps)
+            return np.fromiter(freq.values(), dtype=np.float64, count=len(freq))[index._order]
+
+        # Shared in sorted node id order, which unlike integer labels does not depend on the node order of the parent
+        by_id = parent_statistic(parent=parent, kind='visit_frequencies', key=key, compute=_by_id)
+        parent_cache[key] = np.empty_like(by_id)
+        parent_cache[key][index._order] = by_id  # indexed by integer label
+    return index, parent_cache[key]
 
 def _append_to_list(li: List[Any], value: Any):
     """[summary]
@@ -53,7 +96,7 @@ class NetworkSamplingScorer:
             return f'<scorer: degree_sum({graph})>'
 
         # pdb.set_trace(header='NetworkSamplingScorer - degree_sum - Entering degree_sum')
-        degree_sum_score = np.sum(a=[deg for deg in nx.degree(G=graph)], axis=None)
+        degree_sum_score = np.sum(a=[deg for _, deg in nx.degree(G=graph)], axis=None)
         if __debug__:
             print(f'degree_sum_score: {degree_sum_score}')
 
@@ -182,3 +225,129 @@ class NetworkSamplingScorer:
             print(f'freq_cnt: {freq_cnt}')
 
         return freq_cnt
+
+    @staticmethod
+    def visit_frequency_coverage(graph: nx.Graph, parent: nx.Graph, start_node: int=None, n_steps: int=None):
+        """
+        Computes the share of random walk visits on the parent network that fall on nodes of the sample. With n_steps, visits are the
+        expected visit counts of an n_steps-step walk from start_node; without, the stationary distribution is used. Visit frequencies of
+        the parent are computed analytically by sparse power iteration once and cached for every later trial as an array over the parent's
+        RelabelIndex, so samples with any kind of node ids are scored by one array lookup. Sample nodes that are not in the parent have
+        no visits and are ignored.
+
+        Args:
+            graph (nx.Graph): Sample of a network
+            parent (nx.Graph): Network the sample was drawn from
+            start_node (int, optional): Start node of walk; required with n_steps. Defaults to None.
+            n_steps (int, optional): Number of steps of walk; stationary distribution if None. Defaults to None.
+
+        Returns:
+            float: Fraction of expected visits landing on sampled nodes
+        """
+        if n_steps is not None and start_node is None:
+            raise ValueError('start_node is required when n_steps is given')
+
+        index, freq = parent_visit_frequencies(parent=parent, start_node=start_node, n_steps=n_steps)
+        nodes = [n for n in graph.nodes if n in index]
+        coverage_score = freq[index.to_int(nodes=nodes)].sum() / freq.sum() if len(nodes) > 0 else 0.0
+        if __debug__:
+            print(f'coverage_score: {coverage_score}')
+
+        return coverage_score
+
+    @staticmethod
+    def clustering(graph: nx.Graph, parent: nx.Graph=None):
+        """
+        Computes the average clustering coefficient of a network sample from masked products of its sparse adjacency matrix. With a
+        parent network, the sample is scored by how closely it preserves the parent's coefficient, whose value is computed once and cached
+        for every later trial.
+
+        Args:
+            graph (nx.Graph): Sample of a network
+            parent (nx.Graph, optional): Network the sample was drawn from. Defaults to None.
+
+        Returns:
+            float: Average clustering coefficient of sample, or 1 - |sample coefficient - parent coefficient| with parent
+        """
+        clustering_score = clustering_summary(graph=graph)['average_clustering']
+        if parent is not None:
+            clustering_score = 1.0 - abs(clustering_score - parent_clustering_summary(parent=parent)['average_clustering'])
+        if __debug__:
+            print(f'clustering_score: {clustering_score}')
+
+        return clustering_score
+
+    @staticmethod
+    def transitivity(graph: nx.Graph, parent: nx.Graph=None):
+        """
+        Computes the transitivity (fraction of paths of length 2 closed into triangles) of a network sample from masked products of its
+        sparse adjacency matrix. With a parent network, the sample is scored by how closely it preserves the parent's transitivity, whose
+        value is computed once and cached for every later trial.
+
+        Args:
+            graph (nx.Graph): Sample of a network
+            parent (nx.Graph, optional): Network the sample was drawn from. Defaults to None.
+
+        Returns:
+            float: Transitivity of sample, or 1 - |sample transitivity - parent transitivity| with parent
+        """
+        transitivity_score = clustering_summary(graph=graph)['transitivity']
+        if parent is not None:
+            transitivity_score = 1.0 - abs(transitivity_score - parent_clustering_summary(parent=parent)['transitivity'])
+        if __debug__:
+            print(f'transitivity_score: {transitivity_score}')
+
+        return transitivity_score
+
+    @staticmethod
+    def triangle_count(graph: nx.Graph, parent: nx.Graph=None):
+        """
+        Counts the triangles of a network sample from masked products of its sparse adjacency matrix. With a parent network, the count is
+        divided by the parent's triangle count, computed once and cached for every later trial. Note that this metric is only useful when
+        comparing samples with the same size (number of nodes) sampled from the same network.
+
+        Args:
+            graph (nx.Graph): Sample of a network
+            parent (nx.Graph, optional): Network the sample was drawn from. Defaults to None.
+
+        Returns:
+            float: Number of triangles in sample, or the fraction of the parent's triangles kept in sample with parent
+        """
+        triangle_score = clustering_summary(graph=graph)['triangles']
+        if parent is not None:
+            parent_triangles = parent_clustering_summary(parent=parent)['triangles']
+            triangle_score = triangle_score / parent_triangles if parent_triangles > 0 else 0.0
+        if __debug__:
+            print(f'triangle_score: {triangle_score}')
+
+        return triangle_score
+
+    @staticmethod
+    def spectral_similarity(graph: nx.Graph, parent: nx.Graph, k: int=10, matrix: str='laplacian', normalize: bool=True):
+        """
+        Computes the similarity 1 / (1 + d) of a network sample and its parent network, where d is the Euclidean distance between the k
+        leading eigenvalues of their matrices, found with sparse Lanczos iteration. Like the other scorers, higher is better (1 for equal
+        spectra), so tuners maximizing the score pick the most faithful parameters. The parent's spectrum is computed once and cached for
+        every later trial. Eigenvalues of adjacency matrices and Laplacians grow with degree, so with normalize both spectra are divided
+        by their largest eigenvalue to compare their shapes; normalized Laplacian eigenvalues lie in [0, 2] for any size.
+
+        Args:
+            graph (nx.Graph): Sample of a network
+            parent (nx.Graph): Network the sample was drawn from
+            k (int, optional): Number of leading eigenvalues. Defaults to 10.
+            matrix (str, optional): 'adjacency', 'laplacian' or 'normalized_laplacian'. Defaults to 'laplacian'.
+            normalize (bool, optional): Whether to divide each spectrum by its largest eigenvalue. Defaults to True.
+
+        Returns:
+            float: Similarity of the spectra of sample and parent, in (0, 1]
+        """
+        sample_eigenvalues = top_eigenvalues(graph=graph, k=k, matrix=matrix)
+        parent_eigenvalues = parent_spectrum(parent=parent, k=k, matrix=matrix)
+        if normalize:
+            sample_eigenvalues = sample_eigenvalues / sample_eigenvalues[0] if sample_eigenvalues[0] > 0 else sample_eigenvalues
+            parent_eigenvalues = parent_eigenvalues / parent_eigenvalues[0] if parent_eigenvalues[0] > 0 else parent_eigenvalues
+        spectral_score = 1.0 / (1.0 + float(np.linalg.norm(sample_eigenvalues - parent_eigenvalues)))
+        if __debug__:
+            print(f'spectral_score: {spectral_score}')
+
+        return spectral_score
@@ -1,7 +1,6 @@
 
 from collections import Counter
 import copy
-from joblib import Parallel, delayed
 from inspect import signature
 import multiprocessing as mp
 import networkx as nx
@@ -89,6 +88,7 @@ class NetworkSamplingScorer:
         freq_cnt = Counter(transformed_nodes)
         freq_dist = np.empty(shape=(2,), dtype=(Union[int, float], int))
         update = lambda kv_pair : (freq_dist := np.append(arr=freq_dist, values=kv_pair))
+        from joblib import Parallel, delayed
         with Parallel(n_jobs=mp.cpu_count(), backend='multiprocessing') as parallel:
             parallel(delayed(function=update)(np.asarray(a=[k, v])) for k, v in freq_cnt.items())
         return freq_dist
@@ -0,0 +1,212 @@
+
+import numpy as np
+from typing import Dict, Tuple
+
+#region
+class CountMinSketch:
+    """
+    Count-Min sketch over integer keys. Estimates never undercount; with probability at least 1 - delta they overcount
+    by at most epsilon * total, where width = e / epsilon and depth = ln(1 / delta). Memory is depth x width counters
+    regardless of how many updates are made. Rows are hashed with multiply-shift hashing, so width is rounded up to a
+    power of two and every update is vectorized over a whole array of keys.
+    """
+    def __init__(self, width: int=2 ** 16, depth: int=5, seed: int=None):
+        """
+        Initializes an empty sketch.
+
+        Args:
+            width (int, optional): Counters per row; rounded up to a power of two. Defaults to 2 ** 16.
+            depth (int, optional): Number of independent rows. Defaults to 5.
+            seed (int, optional): Seed for the row hash functions. Defaults to None.
+
+        Raises:
+            ValueError: width or depth is not a positive integer
+        """
+        if width <= 0:
+            raise ValueError(f'width ({width}) is not a positive integer.')
+        elif depth <= 0:
+            raise ValueError(f'depth ({depth}) is not a positive integer.')
+
+        self.log_width = max([int(np.ceil(np.log2(width))), 1])
+        self.width = 2 ** self.log_width
+        self.depth = depth
+        self.total = 0
+
+        rng = np.random.default_rng(seed=seed)
+        self._a = rng.integers(low=1, high=2 ** 63, size=(depth, 1), dtype=np.uint64) * np.uint64(2) + np.uint64(1)  # odd multipliers
+        self._b = rng.integers(low=0, high=2 ** 63, size=(depth, 1), dtype=np.uint64)
+        self.table = np.zeros(shape=(depth, self.width), dtype=np.int64)
+
+    def __repr__(self):
+        """
+        Representation of CountMinSketch object.
+
+        Returns:
+            str: Representation of CountMinSketch object.
+        """
+        return f'<CountMinSketch: width={self.width}, depth={self.depth}, total={self.total}>'
+
+    @classmethod
+    def from_error(cls, epsilon: float, delta: float, seed: int=None):
+        """
+        Sizes a sketch for a target error bound.
+
+        Args:
+            epsilon (float): Maximum overcount as a fraction of total count
+            delta (float): Probability of exceeding epsilon
+            seed (int, optional): Seed for the row hash functions. Defaults to None.
+
+        Returns:
+            CountMinSketch: Empty sketch
+        """
+        return cls(width=int(np.ceil(np.e / epsilon)), depth=int(np.ceil(np.log(1.0 / delta))), seed=seed)
+
+    @property
+    def epsilon(self) -> float:
+        """
+        Overcount bound as a fraction of total count.
+
+        Returns:
+            float: e / width
+        """
+        return np.e / self.width
+
+    def _buckets(self, keys: np.ndarray) -> np.ndarray:
+        """
+        Bucket of every key in every row, shape (depth, len(keys)).
+        """
+        x = np.asarray(keys).astype(np.uint64, copy=False).reshape(1, -1)
+        return ((self._a * x + self._b) >> np.uint64(64 - self.log_width)).astype(np.int64)
+
+    def update(self, keys: np.ndarray, counts: np.ndarray=1):
+        """
+        Adds counts for an array of keys; repeated keys are accumulated.
+
+        Args:
+            keys (np.ndarray): Integer keys
+            counts (np.ndarray, optional): Count per key or a single count for all. Defaults to 1.
+        """
+        keys = np.asarray(keys)
+        counts = np.broadcast_to(np.asarray(counts, dtype=np.int64), keys.shape)
+        buckets = self._buckets(keys=keys)
+        for row in range(self.depth):
+            np.add.at(self.table[row], buckets[row], counts)
+        self.total += int(counts.sum())
+
+    def query(self, keys: np.ndarray) -> np.ndarray:
+        """
+        Estimated counts of an array of keys.
+
+        Args:
+            keys (np.ndarray): Integer keys
+
+        Returns:
+            np.ndarray: Upper-biased count estimates
+        """
+        buckets = self._buckets(keys=keys)
+        return self.table[np.arange(self.depth)[:, None], buckets].min(axis=0)
+#endregion
+
+#region
+class VisitSketch:
+    """
+    Approximate visit accounting for long random walks in bounded memory: a CountMinSketch answers visit-frequency
+    queries and a candidate set of at most 'k' nodes tracks the most visited nodes. After every batch of visits the
+    candidates and the batch's nodes are re-estimated together and the k largest kept, so memory stays
+    O(depth * width + k) no matter how many steps are taken.
+    """
+    def __init__(self, k: int=100, width: int=2 ** 16, depth: int=5, seed: int=None):
+        """
+        Initializes an empty visit sketch.
+
+        Args:
+            k (int, optional): Number of most visited nodes to track. Defaults to 100.
+            width (int, optional): Counters per row of sketch. Defaults to 2 ** 16.
+            depth (int, optional): Number of rows of sketch. Defaults to 5.
+            seed (int, optional): Seed for the row hash functions. Defaults to None.
+        """
+        self.k = k
+        self.cms = CountMinSketch(width=width, depth=depth, seed=seed)
+        self._top_nodes = np.asarray(a=[], dtype=np.int64)
+
+    def __repr__(self):
+        """
+        Representation of VisitSketch object.
+
+        Returns:
+            str: Representation of VisitSketch object.
+        """
+        return f'<VisitSketch: k={self.k}, cms={repr(self.cms)}>'
+
+    @property
+    def total(self) -> int:
+        """
+        Number of visits recorded.
+
+        Returns:
+            int: Total visits
+        """
+        return self.cms.total
+
+    def error_bound(self) -> float:
+        """
+        Maximum overcount of any estimate, holding with probability 1 - e^-depth.
+
+        Returns:
+            float: epsilon * total visits
+        """
+        return self.cms.epsilon * self.total
+
+    def update(self, nodes: np.ndarray):
+        """
+        Records one visit per entry of nodes, eg. the positions of all walkers after a step.
+
+        Args:
+            nodes (np.ndarray): Visited node ids
+        """
+        nodes = np.asarray(nodes, dtype=np.int64)
+        self.cms.update(keys=nodes)
+        candidates = np.union1d(self._top_nodes, nodes)
+        if candidates.size > self.k:
+            estimates = self.cms.query(keys=candidates)
+            candidates = candidates[np.argpartition(-estimates, self.k - 1)[:self.k]]
+        self._top_nodes = candidates
+
+    def estimate(self, nodes: np.ndarray) -> np.ndarray:
+        """
+        Approximate visit counts of nodes.
+
+        Args:
+            nodes (np.ndarray): Node ids
+
+        Returns:
+            np.ndarray: Estimated visits, never below the true count
+        """
+        return self.cms.query(keys=np.asarray(nodes, dtype=np.int64))
+
+    def frequency(self, nodes: np.ndarray) -> np.ndarray:
+        """
+        Approximate visit frequencies of nodes.
+
+        Args:
+            nodes (np.ndarray): Node ids
+
+        Returns:
+            np.ndarray: Estimated visits divided by total visits
+        """
+        return self.estimate(nodes=nodes) / max([self.total, 1])
+
+    def top(self, k: int=None) -> Dict[int, int]:
+        """
+        Most visited nodes with their estimated visit counts, highest first.
+
+        Args:
+            k (int, optional): Number of nodes to return, at most the tracked k. Defaults to None (all tracked).
+
+        Returns:
+            Dict[int, int]: Node id -> estimated visits
+        """
+        estimates = self.cms.query(keys=self._top_nodes) if self._top_nodes.size > 0 else np.asarray(a=[], dtype=np.int64)
+        order = np.argsort(-estimates, kind='stable')[:self.k if k is None else min([k, self.k])]
+        return dict(zip(self._top_nodes[order].tolist(), estimates[order].tolist()))
+#endregion
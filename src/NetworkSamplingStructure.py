@@ -0,0 +1,162 @@
+
+from __future__ import annotations
+import networkx as nx
+import numpy as np
+from typing import TYPE_CHECKING, Dict, Union
+
+# scipy.sparse is imported on first use, so importing NetworkSamplingScorer stays within the budget of
+# NetworkSamplingBenchmarks.check_import_budget
+if TYPE_CHECKING:
+    from scipy import sparse
+
+from NetworkSamplingCSR import CSRGraph
+from NetworkSamplingFingerprint import parent_statistic
+
+SPECTRUM_MATRICES = ('adjacency', 'laplacian', 'normalized_laplacian')
+
+def adjacency_matrix(graph: Union[nx.Graph, CSRGraph]) -> sparse.csr_matrix:
+    """
+    Binary symmetric adjacency matrix of graph without self-loops, rows / columns in node order of the graph.
+
+    Args:
+        graph (Union[nx.Graph, CSRGraph]): Network or sample
+
+    Returns:
+        sparse.csr_matrix: n x n adjacency matrix
+    """
+    from scipy import sparse
+
+    if isinstance(graph, CSRGraph):
+        A = graph.to_scipy()
+    elif graph.number_of_nodes() == 0:
+        A = sparse.csr_matrix((0, 0), dtype=np.float64)
+    else:
+        A = sparse.csr_matrix(nx.to_scipy_sparse_array(G=graph, weight=None, dtype=np.float64))
+    A = sparse.csr_matrix(sparse.triu(A, k=1) + sparse.tril(A, k=-1))  # new matrix, so buffers of a CSRGraph are never written
+    A.data[:] = 1.0
+    return A
+
+def triangle_counts(A: sparse.csr_matrix, chunk_size: int=4096) -> np.ndarray:
+    """
+    Number of triangles through every node: half the row sums of the masked product (A @ A) * A, ie. of the paths of length 2 that are
+    closed by an edge. Rows are multiplied chunk_size at a time, so only a slice of A @ A, which is much denser than A around hubs,
+    is held in memory.
+
+    Args:
+        A (sparse.csr_matrix): Binary symmetric adjacency matrix without self-loops
+        chunk_size (int, optional): Number of rows per product. Defaults to 4096.
+
+    Returns:
+        np.ndarray: Triangles per node
+    """
+    n = A.shape[0]
+    triangles = np.zeros(shape=(n,), dtype=np.float64)
+    for start in range(0, n, chunk_size):
+        rows = A[start:start + chunk_size]
+        triangles[start:start + chunk_size] = np.asarray((rows @ A).multiply(rows).sum(axis=1)).ravel() / 2.0
+    return triangles
+
+def clustering_summary(graph: Union[nx.Graph, CSRGraph]) -> Dict[str, float]:
+    """
+    Triangle count, average clustering coefficient and transitivity of graph from its sparse adjacency matrix, matching
+    nx.triangles, nx.average_clustering (nodes of degree below 2 count as 0) and nx.transitivity.
+
+    Args:
+        graph (Union[nx.Graph, CSRGraph]): Network or sample
+
+    Returns:
+        Dict[str, float]: 'triangles', 'average_clustering' and 'transitivity'
+    """
+    A = adjacency_matrix(graph=graph)
+    triangles = triangle_counts(A=A)
+    degree = np.diff(A.indptr).astype(np.float64)
+    pairs = degree * (degree - 1) / 2.0  # paths of length 2 centered on each node
+    local = np.divide(triangles, pairs, out=np.zeros_like(triangles), where=pairs > 0)
+    summary = {'triangles': float(triangles.sum() / 3.0),
+                'average_clustering': float(local.mean()) if local.size > 0 else 0.0,
+                'transitivity': float(triangles.sum() / pairs.sum()) if pairs.sum() > 0 else 0.0}
+
+    if __debug__:
+        print(f'clustering_summary: {summary}')
+
+    return summary
+
+def parent_clustering_summary(parent: Union[nx.Graph, CSRGraph]) -> Dict[str, float]:
+    """
+    clustering_summary of a parent network, computed once per network and cached for every later trial (see parent_statistic).
+
+    Args:
+        parent (Union[nx.Graph, CSRGraph]): Network samples are drawn from
+
+    Returns:
+        Dict[str, float]: 'triangles', 'average_clustering' and 'transitivity'
+    """
+    return parent_statistic(parent=parent, kind='clustering_summary', key=None, compute=lambda: clustering_summary(graph=parent))
+
+def spectrum_matrix(graph: Union[nx.Graph, CSRGraph], matrix: str='laplacian') -> sparse.csr_matrix:
+    """
+    Sparse adjacency matrix A, Laplacian D - A or normalized Laplacian I - D^-1/2 A D^-1/2 of graph; rows of isolated nodes of the
+    normalized Laplacian are 0, as in nx.normalized_laplacian_matrix.
+
+    Args:
+        graph (Union[nx.Graph, CSRGraph]): Network or sample
+        matrix (str, optional): One of SPECTRUM_MATRICES. Defaults to 'laplacian'.
+
+    Raises:
+        ValueError: matrix is not in SPECTRUM_MATRICES
+
+    Returns:
+        sparse.csr_matrix: Symmetric n x n matrix
+    """
+    from scipy import sparse
+
+    if matrix not in SPECTRUM_MATRICES:
+        raise ValueError(f'matrix ({matrix}) must be one of {list(SPECTRUM_MATRICES)}')
+
+    A = adjacency_matrix(graph=graph)
+    if matrix == 'adjacency':
+        return A
+    degree = np.diff(A.indptr).astype(np.float64)
+    if matrix == 'laplacian':
+        return sparse.csr_matrix(sparse.diags(degree) - A)
+    inv_sqrt = np.divide(1.0, np.sqrt(degree), out=np.zeros_like(degree), where=degree > 0)
+    return sparse.csr_matrix(sparse.diags((degree > 0).astype(np.float64)) - sparse.diags(inv_sqrt) @ A @ sparse.diags(inv_sqrt))
+
+def top_eigenvalues(graph: Union[nx.Graph, CSRGraph], k: int=10, matrix: str='laplacian') -> np.ndarray:
+    """
+    k largest eigenvalues of a matrix of graph (see spectrum_matrix) in descending order, by Lanczos iteration (ARPACK eigsh) from a
+    fixed start vector, so results are reproducible and the global random state used by samplers is left alone. Matrices of small
+    graphs, for which Lanczos has no advantage, are solved densely. Graphs with fewer than k nodes are padded with zeros.
+
+    Args:
+        graph (Union[nx.Graph, CSRGraph]): Network or sample
+        k (int, optional): Number of eigenvalues. Defaults to 10.
+        matrix (str, optional): One of SPECTRUM_MATRICES. Defaults to 'laplacian'.
+
+    Returns:
+        np.ndarray: k eigenvalues, largest first
+    """
+    from scipy.sparse.linalg import eigsh
+
+    M = spectrum_matrix(graph=graph, matrix=matrix)
+    n = M.shape[0]
+    if n <= max([4 * k, 256]):
+        eigenvalues = np.linalg.eigvalsh(M.toarray())[::-1][:k]
+    else:
+        v0 = np.random.default_rng(seed=0).random(size=(n,))
+        eigenvalues = np.sort(eigsh(M, k=k, which='LA', v0=v0, return_eigenvectors=False))[::-1]
+    return np.concatenate((eigenvalues, np.zeros(shape=(k - eigenvalues.size,))))
+
+def parent_spectrum(parent: Union[nx.Graph, CSRGraph], k: int=10, matrix: str='laplacian') -> np.ndarray:
+    """
+    top_eigenvalues of a parent network, computed once per (network, matrix, k) and cached for every later trial (see parent_statistic).
+
+    Args:
+        parent (Union[nx.Graph, CSRGraph]): Network samples are drawn from
+        k (int, optional): Number of eigenvalues. Defaults to 10.
+        matrix (str, optional): One of SPECTRUM_MATRICES. Defaults to 'laplacian'.
+
+    Returns:
+        np.ndarray: k eigenvalues, largest first
+    """
+    return parent_statistic(parent=parent, kind='spectrum', key=(matrix, k), compute=lambda: top_eigenvalues(graph=parent, k=k, matrix=matrix))
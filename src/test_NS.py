@@ -21,41 +21,36 @@ import tqdm
 from typing import *
 
 from NetworkSampling import NSMethod, NetworkSampler, NetworkSamplerTuner, NetworkSamplerGrid
+from NetworkSamplingBenchmarks import benchmark_graph
+from NetworkSamplingPlots import render_all, sample_graph_spec
 from NetworkSamplingFunctions import CaterpillarQuotaWalkSampler, CaterpillarQuotaBFSSampler
 from NetworkSamplingScorer import NetworkSamplingScorer
 
 def connect_all_components(G: nx.Graph):
       """
-      Connects each connected component of G with each other through a random;y chosen node in each component.
+      Connects each connected component of G with each other through a randomly chosen node in each component. The chosen nodes are linked
+      as a chain, adding one edge fewer than the number of components.
 
       Args:
             G (nx.Graph): Disconnected graph
       """
-      print(f'number of connected components (before): {nx.number_connected_components(G=G1)}')
+      print(f'number of connected components (before): {nx.number_connected_components(G=G)}')
 
       # Gather a random node from each connected component
       component_nodes = list()
-      for component in nx.connected_components(G=G1):
+      for component in nx.connected_components(G=G):
             rand_node = random.choice(seq=list(component))
             component_nodes.append(rand_node)
 
-      # Connecting each selected node and adding edge to link together all other connected components
-      for u, v in list(itertools.product(component_nodes, component_nodes)):
-            if u != v:
-                  G1.add_edge(u_of_edge=u, v_of_edge=v)
+      # Linking consecutive selected nodes joins all connected components together
+      for u, v in zip(component_nodes[:-1], component_nodes[1:]):
+            G.add_edge(u_of_edge=u, v_of_edge=v)
 
-      print(f'number of connected components (after): {nx.number_connected_components(G=G1)}')
+      print(f'number of connected components (after): {nx.number_connected_components(G=G)}')
 
 if __name__ == '__main__':
-      g = nx.random_lobster(n=20, p1=0.5, p2=0)
-      nx.draw(G=g, pos=nx.spring_layout(G=g))
-      plt.show(block=False)
-      plt.savefig(fname='./Output/caterpillar_tree.jpg', format='JPG', dpi=300)
-
-      g = nx.random_lobster(n=20, p1=0.5, p2=0.25)
-      nx.draw(G=g, pos=nx.spring_layout(G=g))
-      plt.show(block=False)
-      plt.savefig(fname='./Output/lobster_graph.jpg', format='JPG', dpi=300)
+      render_all(specs=[sample_graph_spec(graph=nx.random_lobster(n=20, p1=0.5, p2=0), title='Caterpillar Tree', path='./Output/caterpillar_tree.jpg'),
+                        sample_graph_spec(graph=nx.random_lobster(n=20, p1=0.5, p2=0.25), title='Lobster Graph', path='./Output/lobster_graph.jpg')])
 
 #       # Preliminary global data values used across all network samplings
 #       start_node = 0
@@ -63,11 +58,9 @@ if __name__ == '__main__':
 #       n_trials = 10  # Number of repeated scoring for each sampler and scoreing metric pair, which finalizes into a mean over all trials
 #       pool = mp.Pool(processes=mp.cpu_count() * n_trials)
 
-#       # Creates gnm random graphs and connects disconnected components together for each into strongly connected graphs
-#       G1 = nx.Graph(incoming_graph_data=nx.random_graphs.gnm_random_graph(n=1000, m=5000), name='G1')
-#       G2 = nx.Graph(incoming_graph_data=nx.random_graphs.gnm_random_graph(n=1000, m=50000), name='G2')
-#       connect_all_components(G=G1)
-#       connect_all_components(G=G2)
+#       # Creates gnm random graphs with all components connected, cached on disk after the first run
+#       G1 = benchmark_graph(model='gnm', params={'n': 1000, 'm': 5000}, seed=1, cache_dir='./Output/graphs', name='G1').to_networkx()
+#       G2 = benchmark_graph(model='gnm', params={'n': 1000, 'm': 50000}, seed=2, cache_dir='./Output/graphs', name='G2').to_networkx()
 #       assert 0 in G1
 #       assert 0 in G2
 #       assert nx.number_connected_components(G=G1) == 1
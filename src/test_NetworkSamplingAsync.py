@@ -0,0 +1,48 @@
+
+import networkx as nx
+import pytest
+
+from NetworkSamplingAsync import AsyncFrontierGraph, LatencyMockSource
+from NetworkSamplingFunctions import CaterpillarQuotaBFSSampler, CaterpillarQuotaWalkSampler
+
+SAMPLERS = [lambda: CaterpillarQuotaWalkSampler(number_of_nodes=200, q1=0.3, q2=0.6),
+            lambda: CaterpillarQuotaBFSSampler(number_of_nodes=200, q1=0.3)]
+
+@pytest.mark.parametrize('make_sampler', SAMPLERS, ids=['walk', 'bfs'])
+def test_sample_matches_in_memory_graph(make_sampler):
+    """
+    Sampling through the prefetching wrapper gives the same sample as sampling the graph in memory.
+    """
+    graph = nx.watts_strogatz_graph(n=1000, k=6, p=0.1, seed=0)
+    with AsyncFrontierGraph(source=LatencyMockSource(graph=graph, latency=0.001), concurrency=8) as remote:
+        sample = make_sampler().sample(graph=remote, start_node=0)
+    expected = make_sampler().sample(graph=graph, start_node=0)
+    assert set(sample.nodes) == set(expected.nodes)
+    assert set(map(frozenset, sample.edges)) == set(map(frozenset, expected.edges))
+
+def test_prefetch_overlaps_fetches_up_to_concurrency():
+    """
+    Prefetched nodes are fetched concurrently, never more than concurrency at a time, and each node only once.
+    """
+    graph = nx.watts_strogatz_graph(n=1000, k=6, p=0.1, seed=0)
+    source = LatencyMockSource(graph=graph, latency=0.01)
+    with AsyncFrontierGraph(source=source, concurrency=4) as remote:
+        remote.prefetch(nodes=range(40))
+        remote.prefetch(nodes=range(40))
+        for n in range(40):
+            assert set(remote.neighbors(n=n).tolist()) == set(graph.neighbors(n))
+            assert remote.degree[n] == graph.degree[n]
+    assert source.n_requests == 40
+    assert 1 < source.max_in_flight <= 4
+
+def test_unknown_node():
+    """
+    Ids that are not nodes are reported as absent and raise ValueError on access.
+    """
+    graph = nx.path_graph(n=10)
+    with AsyncFrontierGraph(source=LatencyMockSource(graph=graph, latency=0.0)) as remote:
+        assert -1 not in remote
+        with pytest.raises(ValueError):
+            remote.neighbors(n=-1)
+        with pytest.raises(ValueError):
+            remote.get_degree(n=-2)
@@ -0,0 +1,104 @@
+
+import networkx as nx
+import numpy as np
+import pytest
+
+from NetworkSamplingBenchmarks import GENERATORS, HEAVY_MODULES, benchmark_graph, check_import_budget, component_roots, import_cost, stitch_components
+
+MODELS = [('gnm', {'n': 2000, 'm': 1500}),
+            ('ba', {'n': 2000, 'm': 2}),
+            ('caterpillar', {'spine_length': 50, 'n_leaves': 500}),
+            ('lobster', {'spine_length': 50, 'n_branches': 100, 'n_leaves': 500})]
+
+def _forest() -> nx.Graph:
+    """
+    Sparse random graph with many components, isolated nodes among them.
+    """
+    graph = nx.gnm_random_graph(n=500, m=300, seed=0)
+    return nx.relabel_nodes(graph, dict(zip(range(500), np.random.default_rng(seed=0).permutation(500).tolist())))
+
+def test_component_roots_match_connected_components():
+    """
+    Every node's root is the smallest node of its connected component.
+    """
+    graph = _forest()
+    src, dst = (np.asarray(a=endpoints, dtype=np.int64) for endpoints in zip(*graph.edges))
+    roots = component_roots(src=src, dst=dst, number_of_nodes=graph.number_of_nodes())
+    for component in nx.connected_components(graph):
+        assert set(roots[list(component)].tolist()) == {min(component)}
+
+def test_stitch_components_connects_with_one_edge_per_component():
+    """
+    Stitching adds c - 1 edges for c components and leaves a connected graph.
+    """
+    graph = _forest()
+    src, dst = (np.asarray(a=endpoints, dtype=np.int64) for endpoints in zip(*graph.edges))
+    stitched_src, stitched_dst = stitch_components(src=src, dst=dst, number_of_nodes=graph.number_of_nodes())
+    assert stitched_src.size - src.size == nx.number_connected_components(graph) - 1
+
+    stitched = nx.empty_graph(n=graph.number_of_nodes())
+    stitched.add_edges_from(zip(stitched_src.tolist(), stitched_dst.tolist()))
+    assert nx.is_connected(stitched)
+
+@pytest.mark.parametrize('model, params', MODELS, ids=[model for model, _ in MODELS])
+def test_generated_graphs_are_simple_and_connected(model, params):
+    """
+    Generated graphs have the model's number of nodes, no self-loops or duplicate edges, and one component unless connect=False.
+    """
+    graph = benchmark_graph(model=model, params=params, seed=1).to_networkx()
+    assert graph.number_of_nodes() == GENERATORS[model][1](params)
+    assert nx.number_of_selfloops(graph) == 0
+    assert 2 * graph.number_of_edges() == sum(deg for _, deg in graph.degree)
+    assert nx.is_connected(graph)
+    if model == 'gnm':
+        assert not nx.is_connected(benchmark_graph(model=model, params=params, seed=1, connect=False).to_networkx())
+
+def test_benchmark_graph_reuses_cache(tmp_path, monkeypatch):
+    """
+    A cached graph is generated once, then memory-mapped from disk for equal arguments; other arguments get their own entry.
+    """
+    calls = list()
+    generator, count_nodes = GENERATORS['ba']
+    def _counted(**kwargs):
+        calls.append(kwargs)
+        return generator(**kwargs)
+    monkeypatch.setitem(GENERATORS, 'ba', (_counted, count_nodes))
+
+    cache_dir = str(tmp_path / 'cache')
+    first = benchmark_graph(model='ba', params={'n': 1000, 'm': 3}, seed=0, cache_dir=cache_dir)
+    second = benchmark_graph(model='ba', params={'n': 1000, 'm': 3}, seed=0, cache_dir=cache_dir)
+    assert len(calls) == 1
+    assert isinstance(second.indices, np.memmap)
+    assert np.array_equal(first.indptr, second.indptr) and np.array_equal(first.indices, second.indices)
+
+    benchmark_graph(model='ba', params={'n': 1000, 'm': 3}, seed=1, cache_dir=cache_dir)
+    assert len(calls) == 2
+    assert len(list((tmp_path / 'cache').iterdir())) == 2  # no temporary directories left behind
+    assert np.array_equal(second.indices, benchmark_graph(model='ba', params={'n': 1000, 'm': 3}, seed=0).indices)
+
+def test_unknown_model():
+    """
+    Models outside GENERATORS raise ValueError.
+    """
+    with pytest.raises(ValueError):
+        benchmark_graph(model='ws', params={'n': 10})
+
+def test_core_api_within_import_budget():
+    """
+    The core modules import within IMPORT_BUDGET in a fresh interpreter without loading any of HEAVY_MODULES.
+    """
+    costs = check_import_budget()
+    assert set(costs) == {'NetworkSampling', 'NetworkSamplingFunctions', 'NetworkSamplingScorer'}
+
+def test_import_budget_violations():
+    """
+    Slow imports, imports of heavy modules and failing imports raise ValueError.
+    """
+    with pytest.raises(ValueError, match='budget'):
+        check_import_budget(modules=['NetworkSamplingCSR'], budget=0.0)
+    seconds, loaded = import_cost(module='pandas', n_runs=1)
+    assert seconds > 0 and 'pandas' in loaded and set(loaded) <= set(HEAVY_MODULES)
+    with pytest.raises(ValueError, match='heavy'):
+        check_import_budget(modules=['pandas'], budget=60.0)
+    with pytest.raises(ValueError, match='failed'):
+        import_cost(module='NetworkSamplingMissing', n_runs=1)
@@ -0,0 +1,86 @@
+
+import networkx as nx
+import numpy as np
+import pytest
+
+from NetworkSamplingCSR import CSRGraph, as_csr, build_csr
+
+def _graph() -> nx.Graph:
+    """
+    Small-world graph with a few isolated nodes at the end.
+    """
+    graph = nx.watts_strogatz_graph(n=500, k=6, p=0.2, seed=0)
+    graph.add_nodes_from(range(500, 510))
+    graph.name = 'ws'
+    return graph
+
+def _edge_set(graph: nx.Graph) -> set:
+    """
+    Edges of graph as unordered node pairs.
+    """
+    return set(map(frozenset, graph.edges))
+
+def test_networkx_round_trip():
+    """
+    Converting to CSR and back gives the same nodes, edges, degrees and name.
+    """
+    graph = _graph()
+    csr = CSRGraph.from_networkx(graph=graph)
+    assert (csr.number_of_nodes(), csr.number_of_edges()) == (graph.number_of_nodes(), graph.number_of_edges())
+    assert all(csr.degree[n] == graph.degree[n] and set(csr.neighbors(n=n).tolist()) == set(graph.neighbors(n)) for n in graph)
+    back = csr.to_networkx()
+    assert set(back.nodes) == set(graph.nodes) and _edge_set(back) == _edge_set(graph)
+    assert back.name == 'ws' and as_csr(graph=csr) is csr
+    assert (csr.to_scipy() != nx.to_scipy_sparse_array(graph, nodelist=range(510), format='csr')).nnz == 0
+
+def test_save_load_round_trip(tmp_path):
+    """
+    A saved graph loads back memory-mapped with the same arrays and name, or fully in memory with mmap_mode=None.
+    """
+    csr = CSRGraph.from_networkx(graph=_graph())
+    loaded = csr.save(path=str(tmp_path / 'ws'))
+    assert isinstance(loaded.indices, np.memmap) and loaded.path == str(tmp_path / 'ws')
+    in_memory = CSRGraph.load(path=str(tmp_path / 'ws'), mmap_mode=None)
+    assert not isinstance(in_memory.indices, np.memmap)
+    for other in [loaded, in_memory]:
+        assert other.name == 'ws'
+        assert all(np.array_equal(getattr(other, attr), getattr(csr, attr)) for attr in ['indptr', 'indices', 'degree'])
+    with pytest.raises(ValueError):
+        CSRGraph.load(path=str(tmp_path))
+
+def test_build_csr_matches_from_edges(tmp_path):
+    """
+    Streaming edges in chunks builds the same graph on disk as converting it in memory.
+    """
+    graph = _graph()
+    edges = np.asarray(a=list(graph.edges), dtype=np.int64)
+    csr = build_csr(edge_chunks=lambda: ((chunk[:, 0], chunk[:, 1]) for chunk in np.array_split(edges, 7)),
+                    number_of_nodes=graph.number_of_nodes(), path=str(tmp_path / 'built'), name='ws')
+    assert csr.name == 'ws' and np.array_equal(csr.indptr, CSRGraph.from_networkx(graph=graph).indptr)
+    assert _edge_set(csr.to_networkx()) == _edge_set(graph)
+
+def test_subgraph_matches_networkx(tmp_path):
+    """
+    Induced subgraphs of an in-memory or memory-mapped CSR graph equal those of the nx.Graph, for nodes in any order or repeated.
+    """
+    graph = _graph()
+    csr = CSRGraph.from_networkx(graph=graph)
+    loaded = csr.save(path=str(tmp_path / 'ws'))
+    nodes = np.random.default_rng(seed=0).choice(510, size=120, replace=False).tolist()
+    expected = graph.subgraph(nodes)
+    for other in [csr, loaded]:
+        sub = other.subgraph(nodes=nodes + nodes[:10])
+        assert set(sub.nodes) == set(expected.nodes) and _edge_set(sub) == _edge_set(expected)
+
+def test_invalid_graphs():
+    """
+    Non-contiguous node ids, inconsistent arrays and unknown nodes raise ValueError.
+    """
+    with pytest.raises(ValueError):
+        CSRGraph.from_networkx(graph=nx.relabel_nodes(nx.path_graph(n=3), {0: 5}))
+    with pytest.raises(ValueError):
+        CSRGraph(indptr=np.asarray([0, 1, 3]), indices=np.asarray([1, 0]))
+    csr = CSRGraph.from_networkx(graph=nx.path_graph(n=3))
+    assert 3 not in csr and 1.0 not in csr and True not in csr
+    with pytest.raises(ValueError):
+        csr.neighbors(n=3)
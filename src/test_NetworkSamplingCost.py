@@ -0,0 +1,51 @@
+
+import networkx as nx
+import numpy as np
+import tracemalloc
+
+from NetworkSampling import NSMethod, NetworkSampler, NetworkSamplerGrid, _timed_rescore
+from NetworkSamplingFunctions import CaterpillarQuotaWalkSampler
+from NetworkSamplingScorer import NetworkSamplingScorer
+
+def _allocating_score(graph: nx.Graph, n_bytes: int) -> float:
+    """
+    Scorer that allocates n_bytes while scoring.
+    """
+    return float(np.ones(shape=(n_bytes // 8,)).sum()) + graph.number_of_nodes()
+
+def test_timed_rescore_measures_trial():
+    """
+    A trial records sampling and scoring time, the peak memory allocated while scoring and nodes per second, and leaves tracing off.
+    """
+    graph = nx.barabasi_albert_graph(n=2000, m=3, seed=0)
+    ns = NetworkSampler(sampler=CaterpillarQuotaWalkSampler(number_of_nodes=100), scorer=NSMethod(func=_allocating_score, params={'n_bytes': 16 * 2 ** 20}))
+    score, cost = _timed_rescore(ns=ns, graph=graph, start_node=0)
+    assert score == 2 * 2 ** 20 + ns.prev_sample.number_of_nodes()
+    assert cost['Sample Time (s)'] > 0 and cost['Score Time (s)'] > 0
+    assert 16 <= cost['Peak Memory (MB)'] < 32
+    assert cost['Nodes per Second'] == ns.prev_sample.number_of_nodes() / cost['Sample Time (s)']
+    assert not tracemalloc.is_tracing()
+
+    _, cost = _timed_rescore(ns=ns, graph=graph, start_node=0, trace_memory=False)
+    assert np.isnan(cost['Peak Memory (MB)']) and cost['Sample Time (s)'] > 0
+
+def test_grid_records_cost_columns():
+    """
+    Every scorer of sample_by_graph gets the cost columns after its score and tuned parameters, and tuning time counts only when tuning.
+    """
+    graph = nx.barabasi_albert_graph(n=500, m=3, seed=0)
+    grid = NetworkSamplerGrid(graph_group=[graph],
+                                sampler_group=[CaterpillarQuotaWalkSampler(number_of_nodes=50), CaterpillarQuotaWalkSampler(number_of_nodes=50)],
+                                scorer_group=[NSMethod(func=NetworkSamplingScorer.degree_sum, params={}),
+                                                NSMethod(func=_allocating_score, params={'n_bytes': 4 * 2 ** 20})],
+                                sampler_names=['tuned', 'fixed'],
+                                scorer_names=['degree_sum', 'allocating'])
+    grid.set_tuner(tuned_params=[{'q1': [0.2, 0.4]}, None])
+    df = grid.sample_by_graph(graph=graph, start_node=0, n_trials=3)
+
+    assert list(df.columns) == ['degree_sum', 'allocating', 'degree_sum Tuned Params', 'allocating Tuned Params'] \
+        + [f'{scorer} {column}' for scorer in ['degree_sum', 'allocating'] for column in NetworkSamplerGrid.COST_COLUMNS]
+    costs = df[[f'{scorer} {column}' for scorer in ['degree_sum', 'allocating'] for column in NetworkSamplerGrid.COST_COLUMNS]]
+    assert np.isfinite(costs.to_numpy(dtype=np.float64)).all() and (costs.to_numpy(dtype=np.float64) >= 0).all()
+    assert (df['allocating Peak Memory (MB)'] >= 4).all()
+    assert (df.loc['tuned', ['degree_sum Tune Time (s)', 'allocating Tune Time (s)']] > df.loc['fixed', ['degree_sum Tune Time (s)', 'allocating Tune Time (s)']].max()).all()
@@ -0,0 +1,46 @@
+
+import networkx as nx
+import numpy as np
+import pytest
+
+from NetworkSamplingDynamic import DynamicSample
+from NetworkSamplingFunctions import CaterpillarQuotaBFSSampler, CaterpillarQuotaWalkSampler
+
+SAMPLERS = [lambda: CaterpillarQuotaWalkSampler(number_of_nodes=200, q1=0.3, q2=0.6),
+            lambda: CaterpillarQuotaBFSSampler(number_of_nodes=200, q1=0.3)]
+
+@pytest.mark.parametrize('make_sampler', SAMPLERS, ids=['walk', 'bfs'])
+def test_repair_matches_full_resample(make_sampler):
+    """
+    A repaired sample equals a fresh sample of the updated graph after every random single-edge insertion or deletion.
+    """
+    rng = np.random.default_rng(seed=0)
+    graph = nx.watts_strogatz_graph(n=2000, k=6, p=0.1, seed=0)
+    dynamic = DynamicSample(sampler=make_sampler(), graph=graph, start_node=0, max_invalidated=1.0)
+    for _ in range(150):
+        sampled = list(dynamic.steps)
+        if rng.random() < 0.5:
+            u = sampled[int(rng.integers(len(sampled)))]
+            v = int(rng.integers(graph.number_of_nodes()))
+            update = {'added_edges': [(u, v)]} if u != v and not graph.has_edge(u, v) else {}
+        else:
+            u = sampled[int(rng.integers(len(sampled)))]
+            nbrs = [v for v in graph.neighbors(u) if graph.degree[v] > 1 and graph.degree[u] > 1]
+            update = {'removed_edges': [(u, nbrs[int(rng.integers(len(nbrs)))])]} if len(nbrs) > 0 else {}
+        repaired = dynamic.update(**update)
+        fresh = make_sampler().sample(graph=graph, start_node=0)
+        assert set(repaired.nodes) == set(fresh.nodes)
+        assert set(map(frozenset, repaired.edges)) == set(map(frozenset, fresh.edges))
+
+def test_resume_without_changes_reproduces_sample():
+    """
+    Resuming from any prefix of a trace with no edge changes reproduces the original sample.
+    """
+    graph = nx.watts_strogatz_graph(n=2000, k=6, p=0.1, seed=1)
+    for make_sampler in SAMPLERS:
+        trace = list()
+        full = make_sampler().sample(graph=graph, start_node=0, trace=trace)
+        for cut in range(1, max([s for _, s in trace]) + 1):
+            prefix = [(n, s) for n, s in trace if s < cut]
+            resumed = make_sampler().sample(graph=graph, start_node=0, trace=prefix)
+            assert set(resumed.nodes) == set(full.nodes)
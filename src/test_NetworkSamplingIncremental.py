@@ -0,0 +1,71 @@
+
+import networkx as nx
+import pytest
+
+from NetworkSampling import NSMethod, NetworkSamplerGrid
+from NetworkSamplingCSR import CSRGraph
+from NetworkSamplingFunctions import CaterpillarQuotaBFSSampler, CaterpillarQuotaWalkSampler
+from NetworkSamplingIncremental import RunningDegreeHistogram, RunningDegreeSum, sample_degree
+from NetworkSamplingScorer import NetworkSamplingScorer
+
+SAMPLERS = [lambda: CaterpillarQuotaWalkSampler(number_of_nodes=10, q1=0.3, q2=0.6),
+            lambda: CaterpillarQuotaBFSSampler(number_of_nodes=10, q1=0.3)]
+
+def _graph() -> nx.Graph:
+    """
+    Scale-free graph with a self-loop on every tenth node.
+    """
+    graph = nx.barabasi_albert_graph(n=400, m=2, seed=0)
+    graph.add_edges_from((n, n) for n in range(0, 400, 10))
+    return graph
+
+def _rescored_degree_sum(graph: nx.Graph):
+    """
+    degree_sum behind a wrapper, so incremental_scorer falls back to scoring every prefix subgraph in full.
+    """
+    return NetworkSamplingScorer.degree_sum(graph=graph)
+
+def _rescored_distribution(graph: nx.Graph, transform: NSMethod):
+    """
+    distribution behind a wrapper, so incremental_scorer falls back to scoring every prefix subgraph in full.
+    """
+    return NetworkSamplingScorer.distribution(graph=graph, transform=transform)
+
+def test_running_degrees_count_self_loops_twice():
+    """
+    A self-loop adds 2 to the running degree sum and histogram, as in nx.degree, for nx.Graph and CSRGraph parents alike.
+    """
+    graph = nx.path_graph(n=4)
+    graph.add_edge(2, 2)
+    for parent in [graph, CSRGraph.from_networkx(graph=graph)]:
+        degree_sum, histogram = RunningDegreeSum(parent=parent), RunningDegreeHistogram(parent=parent)
+        for score in (degree_sum, histogram):
+            score.add(nodes=range(4))
+        assert degree_sum.value() == NetworkSamplingScorer.degree_sum(graph=graph) == 8
+        assert histogram.value() == {1: 2, 2: 1, 4: 1}
+
+@pytest.mark.parametrize('make_sampler', SAMPLERS, ids=['walk', 'bfs'])
+def test_sweep_prefixes_match_full_rescores(make_sampler):
+    """
+    Running scores of sample_size_sweep equal the scores of every prefix subgraph recomputed in full.
+    """
+    graph = _graph()
+    degree = NSMethod(func=sample_degree, params={})
+    sizes = [1, 5, 20, 60]
+
+    def sweep(scorer_group):
+        grid = NetworkSamplerGrid(graph_group=[graph],
+                                    sampler_group=[make_sampler()],
+                                    scorer_group=scorer_group,
+                                    sampler_names=['sampler'],
+                                    scorer_names=['degree_sum', 'histogram'])
+        return grid.sample_size_sweep(graph=graph, sizes=sizes, start_node=0, n_trials=3, seed=0)
+
+    running = sweep([NSMethod(func=NetworkSamplingScorer.degree_sum, params={}),
+                        NSMethod(func=NetworkSamplingScorer.distribution, params={'transform': degree})])
+    rescored = sweep([NSMethod(func=_rescored_degree_sum, params={}),
+                        NSMethod(func=_rescored_distribution, params={'transform': degree})])
+    assert len(running) > 0
+    assert running['Size'].tolist() == rescored['Size'].tolist()
+    assert running['Score'].tolist() == rescored['Score'].tolist()
+    assert running['Trials'].tolist() == rescored['Trials'].tolist()
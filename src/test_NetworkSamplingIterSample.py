@@ -0,0 +1,60 @@
+
+from itertools import islice
+import networkx as nx
+import pytest
+
+from NetworkSampling import NetworkSampler
+from NetworkSamplingFunctions import CaterpillarQuotaBFSSampler, CaterpillarQuotaWalkSampler, MultiWalkerSampler
+
+SAMPLERS = [lambda: CaterpillarQuotaWalkSampler(number_of_nodes=150, q1=0.3, q2=0.6),
+            lambda: CaterpillarQuotaBFSSampler(number_of_nodes=150, q1=0.3),
+            lambda: MultiWalkerSampler(number_of_nodes=150, n_walkers=30, seed=0)]
+
+class _WholeSampler:
+    """
+    Sampler without iter_sample, taking the ego network of start_node.
+    """
+    def sample(self, graph: nx.Graph, start_node: int=None):
+        return graph.subgraph(nodes=[start_node] + list(graph.neighbors(start_node))).copy()
+
+def _graph() -> nx.Graph:
+    """
+    Small-world graph with string node ids.
+    """
+    graph = nx.watts_strogatz_graph(n=1000, k=6, p=0.1, seed=0)
+    return nx.relabel_nodes(graph, {n: f'n{n}' for n in graph})
+
+@pytest.mark.parametrize('make_sampler', SAMPLERS, ids=['walk', 'bfs', 'multiwalker'])
+def test_iter_sample_yields_sample_in_visit_order(make_sampler):
+    """
+    iter_sample yields distinct nodes with original ids, the start node first, and batches concatenate to the same order. 'sample' keeps
+    these nodes, or for the caterpillar walk the highest-degree ones among them.
+    """
+    graph = _graph()
+    nodes = list(NetworkSampler(sampler=make_sampler(), scorer=None).iter_sample(graph=graph, start_node='n0'))
+    batches = list(NetworkSampler(sampler=make_sampler(), scorer=None).iter_sample(graph=graph, start_node='n0', batch=True))
+    sample = NetworkSampler(sampler=make_sampler(), scorer=None).sample(graph=graph, start_node='n0')
+    assert nodes[0] == 'n0' and len(set(nodes)) == len(nodes)
+    assert set(sample.nodes) <= set(nodes) and len(sample) == min([len(nodes), 150])
+    assert [n for batch in batches for n in batch] == nodes and all(len(batch) > 0 for batch in batches)
+
+@pytest.mark.parametrize('make_sampler', SAMPLERS, ids=['walk', 'bfs', 'multiwalker'])
+def test_stopping_early_gives_prefix(make_sampler):
+    """
+    Stopping after k nodes yields the first k nodes of the full run.
+    """
+    graph = nx.watts_strogatz_graph(n=1000, k=6, p=0.1, seed=0)
+    nodes = list(make_sampler().iter_sample(graph=graph, start_node=0))
+    for k in [1, 10, 75]:
+        assert list(islice(make_sampler().iter_sample(graph=graph, start_node=0), k)) == nodes[:k]
+
+def test_samplers_without_iter_sample_are_sampled_whole():
+    """
+    Samplers without iter_sample yield the nodes of their full sample, in one batch with batch=True.
+    """
+    graph = _graph()
+    ns = NetworkSampler(sampler=_WholeSampler(), scorer=None)
+    expected = set(graph.neighbors('n5')) | {'n5'}
+    assert set(ns.iter_sample(graph=graph, start_node='n5')) == expected
+    batches = list(ns.iter_sample(graph=graph, start_node='n5', batch=True))
+    assert len(batches) == 1 and set(batches[0]) == expected
@@ -0,0 +1,80 @@
+
+import networkx as nx
+import numpy as np
+import pytest
+
+import NetworkSamplingKernels as kernels
+from NetworkSamplingCSR import CSRGraph
+from NetworkSamplingFunctions import CaterpillarQuotaBFSSampler, CaterpillarQuotaWalkSampler, MultiWalkerSampler
+
+# Numba is not needed here: with it missing, _jit leaves the kernels as plain Python, and setting JIT_ENABLED runs the samplers'
+# kernel paths through them.
+
+def _graph() -> nx.Graph:
+    """
+    Small-world graph with hubs, so degree ties and quota cuts both occur.
+    """
+    graph = nx.watts_strogatz_graph(n=1000, k=6, p=0.1, seed=0)
+    graph.add_edges_from((n, m) for n in range(0, 1000, 97) for m in range(n + 1, 1000, 13))
+    return graph
+
+def _sample_nodes(make_sampler, graph, monkeypatch, jit: bool) -> list:
+    """
+    Nodes yielded by iter_sample in visit order, with the kernel paths switched on or off.
+    """
+    monkeypatch.setattr(kernels, 'JIT_ENABLED', jit)
+    return list(make_sampler().iter_sample(graph=graph, start_node=0))
+
+def test_quota_select_kernel_matches_numpy():
+    """
+    The loop kernel of quota_select ranks neighbors and cuts the quotas as the NumPy version does.
+    """
+    csr = CSRGraph.from_networkx(graph=_graph())
+    rng = np.random.default_rng(seed=0)
+    for n in range(0, 1000, 7):
+        visited = rng.random(size=csr.number_of_nodes()) < 0.3
+        for q1, q2 in [(0.2, 0.7), (0.5, 0.5), (0.0, 1.0)]:
+            args = (csr.indptr, csr.indices, csr.degree, visited, n, q1, q2)
+            ranked, q1_index, q2_index = kernels._quota_select_jit(*args)
+            expected, q1_expected, q2_expected = kernels._quota_select_numpy(*args)
+            assert ranked.tolist() == expected.tolist()
+            assert (q1_index, q2_index) == (q1_expected, q2_expected)
+
+@pytest.mark.parametrize('make_sampler', [lambda: CaterpillarQuotaWalkSampler(number_of_nodes=300, q1=0.3, q2=0.6),
+                                            lambda: CaterpillarQuotaBFSSampler(number_of_nodes=300, q1=0.3)], ids=['walk', 'bfs'])
+def test_caterpillar_kernels_match_interpreted_paths(make_sampler, monkeypatch):
+    """
+    On a CSRGraph the kernel paths visit the same nodes in the same order as the NumPy / heapq paths.
+    """
+    csr = CSRGraph.from_networkx(graph=_graph())
+    expected = _sample_nodes(make_sampler=make_sampler, graph=csr, monkeypatch=monkeypatch, jit=False)
+    assert len(expected) > 200
+    assert _sample_nodes(make_sampler=make_sampler, graph=csr, monkeypatch=monkeypatch, jit=True) == expected
+
+def test_bfs_kernel_resumes_from_trace(monkeypatch):
+    """
+    The array heap of the BFS kernel path rebuilds from a trace prefix as the heapq path does.
+    """
+    csr = CSRGraph.from_networkx(graph=_graph())
+    results = list()
+    for jit in [False, True]:
+        monkeypatch.setattr(kernels, 'JIT_ENABLED', jit)
+        trace = list()
+        list(CaterpillarQuotaBFSSampler(number_of_nodes=100, q1=0.3).iter_sample(graph=csr, start_node=0, trace=trace))
+        resumed = list(CaterpillarQuotaBFSSampler(number_of_nodes=300, q1=0.3).iter_sample(graph=csr, start_node=0, trace=trace))
+        results.append((resumed, trace))
+    assert results[1] == results[0]
+
+@pytest.mark.parametrize('transition', MultiWalkerSampler.TRANSITIONS)
+def test_walk_step_kernel_matches_numpy(transition, monkeypatch):
+    """
+    The fused walk_step kernel moves every walker to the same node as the NumPy step, so walks and samples are identical.
+    """
+    csr = CSRGraph.from_networkx(graph=_graph())
+    results = list()
+    for jit in [False, True]:
+        monkeypatch.setattr(kernels, 'JIT_ENABLED', jit)
+        sampler = MultiWalkerSampler(number_of_nodes=300, n_walkers=50, transition=transition, seed=0)
+        counts = sampler.walk(graph=csr, start_node=0, n_steps=40).copy()
+        results.append((counts.tolist(), list(sampler.iter_sample(graph=csr, start_node=0))))
+    assert results[1] == results[0]
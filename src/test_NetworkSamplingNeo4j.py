@@ -0,0 +1,110 @@
+
+import networkx as nx
+import numpy as np
+import pytest
+
+from NetworkSamplingFunctions import CaterpillarQuotaBFSSampler, CaterpillarQuotaWalkSampler
+from NetworkSamplingNeo4j import LocalQueryRunner, Neo4jGraph, export_to_csr
+
+SAMPLERS = [lambda: CaterpillarQuotaWalkSampler(number_of_nodes=200, q1=0.3, q2=0.6),
+            lambda: CaterpillarQuotaBFSSampler(number_of_nodes=200, q1=0.3)]
+
+def _graph() -> nx.Graph:
+    """
+    Small-world graph whose node ids are shuffled, so database order differs from insertion order.
+    """
+    graph = nx.watts_strogatz_graph(n=1000, k=6, p=0.1, seed=0)
+    ids = np.random.default_rng(seed=0).permutation(10 * graph.number_of_nodes())[:graph.number_of_nodes()]
+    return nx.relabel_nodes(graph, {n: int(ids[n]) for n in graph})
+
+class _InterruptingRunner(LocalQueryRunner):
+    """
+    LocalQueryRunner that fails every edge page query after the first 'n_edge_pages', simulating a dropped connection.
+    """
+    def __init__(self, graph: nx.Graph, n_edge_pages: int):
+        super().__init__(graph=graph)
+        self.n_edge_pages = n_edge_pages
+
+    def run(self, query, parameters=None):
+        if query.startswith('// ns:edge_page'):
+            if self.n_edge_pages <= 0:
+                raise ConnectionError('connection dropped')
+            self.n_edge_pages -= 1
+        return super().run(query=query, parameters=parameters)
+
+@pytest.mark.parametrize('make_sampler', SAMPLERS, ids=['walk', 'bfs'])
+def test_sample_matches_in_memory_graph(make_sampler):
+    """
+    Sampling through the database backend gives the same sample as sampling the graph in memory.
+    """
+    graph = _graph()
+    start_node = next(iter(graph))
+    remote = Neo4jGraph(runner=LocalQueryRunner(graph=graph), batch_size=64)
+    sample = make_sampler().sample(graph=remote, start_node=start_node)
+    expected = make_sampler().sample(graph=graph, start_node=start_node)
+    assert set(sample.nodes) == set(expected.nodes)
+    assert set(map(frozenset, sample.edges)) == set(map(frozenset, expected.edges))
+
+def test_prefetch_batches_round_trips():
+    """
+    A frontier is fetched in one round-trip per batch_size nodes, and cached nodes are not fetched again.
+    """
+    graph = _graph()
+    runner = LocalQueryRunner(graph=graph)
+    remote = Neo4jGraph(runner=runner, batch_size=100)
+    frontier = list(graph)[:250]
+    remote.prefetch(nodes=frontier)
+    assert runner.n_queries == 3
+    remote.prefetch(nodes=frontier)
+    for n in frontier:
+        assert set(remote.neighbors(n=n).tolist()) == set(graph.neighbors(n))
+        assert remote.degree[n] == graph.degree[n]
+    assert runner.n_queries == 3
+
+def test_cache_evicts_least_recently_used():
+    """
+    At most cache_size adjacency lists are kept, and the least recently used one is evicted first.
+    """
+    graph = _graph()
+    runner = LocalQueryRunner(graph=graph)
+    remote = Neo4jGraph(runner=runner, cache_size=2)
+    a, b, c = list(graph)[:3]
+    remote.neighbors(n=a)
+    remote.neighbors(n=b)
+    remote.neighbors(n=a)
+    remote.neighbors(n=c)
+    n_queries = runner.n_queries
+    remote.neighbors(n=a)
+    assert runner.n_queries == n_queries
+    remote.neighbors(n=b)
+    assert runner.n_queries == n_queries + 1
+
+def test_unknown_node():
+    """
+    Ids that are not nodes are reported as absent and raise ValueError on access.
+    """
+    graph = _graph()
+    remote = Neo4jGraph(runner=LocalQueryRunner(graph=graph))
+    assert -1 not in remote
+    with pytest.raises(ValueError):
+        remote.neighbors(n=-1)
+    with pytest.raises(ValueError):
+        remote.get_degree(n=-1)
+
+def test_export_resumes_after_interruption(tmp_path):
+    """
+    An export interrupted between edge pages resumes from the last finished page and yields the graph itself.
+    """
+    graph = _graph()
+    path = str(tmp_path / 'export')
+    with pytest.raises(ConnectionError):
+        export_to_csr(runner=_InterruptingRunner(graph=graph, n_edge_pages=3), path=path, page_size=100, n_prefetch=1)
+
+    runner = LocalQueryRunner(graph=graph)
+    csr = export_to_csr(runner=runner, path=path, page_size=100, n_prefetch=2)
+    assert runner.n_queries == graph.number_of_nodes() // 100 - 3  # only the unfinished edge pages
+
+    node_ids = np.load(file=str(tmp_path / 'export' / 'node_ids.npy'))
+    exported = nx.relabel_nodes(csr.to_networkx(), {i: int(node_ids[i]) for i in range(node_ids.shape[0])})
+    assert set(exported.nodes) == set(graph.nodes)
+    assert set(map(frozenset, exported.edges)) == set(map(frozenset, graph.edges))
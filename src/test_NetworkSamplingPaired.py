@@ -0,0 +1,66 @@
+
+import networkx as nx
+import numpy as np
+import pytest
+from scipy.stats import t as t_dist
+
+from NetworkSampling import NSMethod, NetworkSamplerGrid, paired_confidence_interval
+from NetworkSamplingFunctions import CaterpillarQuotaWalkSampler, MultiWalkerSampler
+from NetworkSamplingScorer import NetworkSamplingScorer
+
+DEGREE_SUM = NSMethod(func=NetworkSamplingScorer.degree_sum, params={})
+
+def _grid(sampler_group: list) -> NetworkSamplerGrid:
+    """
+    Grid of samplers named 's0', 's1', ... on a scale-free graph.
+    """
+    graph = nx.barabasi_albert_graph(n=2000, m=3, seed=0)
+    return NetworkSamplerGrid(graph_group=[graph],
+                                sampler_group=sampler_group,
+                                scorer_group=[DEGREE_SUM],
+                                sampler_names=[f's{idx}' for idx in range(len(sampler_group))],
+                                scorer_names=['degree_sum'])
+
+def test_paired_confidence_interval():
+    """
+    The interval is the Student-t interval of the mean difference, and unbounded with fewer than 2 differences.
+    """
+    differences = [1.0, 2.5, 3.0, 4.0, 6.5]
+    mean, lower, upper = paired_confidence_interval(differences=differences, confidence=0.9)
+    expected = t_dist.interval(0.9, df=4, loc=np.mean(differences), scale=np.std(differences, ddof=1) / np.sqrt(5))
+    assert mean == pytest.approx(3.4) and (lower, upper) == pytest.approx(expected)
+    assert paired_confidence_interval(differences=[2.0]) == (2.0, -np.inf, np.inf)
+    assert np.isnan(paired_confidence_interval(differences=[])[0])
+
+def test_common_random_numbers_cancel():
+    """
+    Two copies of a seeded random sampler draw the same samples in every trial, so all paired differences are 0 and never resolve.
+    """
+    grid = _grid(sampler_group=[MultiWalkerSampler(number_of_nodes=100, n_walkers=20), MultiWalkerSampler(number_of_nodes=100, n_walkers=20)])
+    df = grid.compare_paired(graph=grid.graph_group[0], scorer=DEGREE_SUM, n_trials_min=3, n_trials_max=8, seed=1)
+    assert df.loc['s1', 'Mean Difference'] == 0.0 and df.loc['s1', 'Trials'] == 8 and not df.loc['s1', 'Resolved']
+    assert grid.sampler_group[0].seed is None  # trial seeds are set on copies only
+
+def test_clear_difference_resolves_early():
+    """
+    A sampler taking far larger samples resolves against the reference after n_trials_min trials, while a tie runs to n_trials_max.
+    """
+    grid = _grid(sampler_group=[CaterpillarQuotaWalkSampler(number_of_nodes=50),
+                                CaterpillarQuotaWalkSampler(number_of_nodes=400),
+                                CaterpillarQuotaWalkSampler(number_of_nodes=50)])
+    df = grid.compare_paired(graph=grid.graph_group[0], scorer=DEGREE_SUM, reference='s0', n_trials_min=4, n_trials_max=10)
+    assert list(df.index) == ['s1', 's2']
+    assert df.loc['s1', 'Resolved'] and df.loc['s1', 'Trials'] == 4 and df.loc['s1', 'CI Lower'] > 0
+    assert not df.loc['s2', 'Resolved'] and df.loc['s2', 'Trials'] == 10
+
+def test_invalid_arguments():
+    """
+    Unknown reference names and inconsistent trial bounds raise ValueError.
+    """
+    grid = _grid(sampler_group=[CaterpillarQuotaWalkSampler(number_of_nodes=50), CaterpillarQuotaWalkSampler(number_of_nodes=60)])
+    with pytest.raises(ValueError):
+        grid.compare_paired(graph=grid.graph_group[0], scorer=DEGREE_SUM, reference='missing')
+    with pytest.raises(ValueError):
+        grid.compare_paired(graph=grid.graph_group[0], scorer=DEGREE_SUM, n_trials_min=1)
+    with pytest.raises(ValueError):
+        grid.compare_paired(graph=grid.graph_group[0], scorer=DEGREE_SUM, n_trials_min=20, n_trials_max=10)
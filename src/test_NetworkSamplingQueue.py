@@ -0,0 +1,121 @@
+
+import multiprocessing as mp
+import networkx as nx
+import os
+import pytest
+
+from NetworkSampling import NSMethod, NetworkSamplerGrid
+from NetworkSamplingFunctions import CaterpillarQuotaBFSSampler, CaterpillarQuotaWalkSampler
+from NetworkSamplingQueue import DirectoryJobQueue, JobQueue, open_queue
+from NetworkSamplingScorer import NetworkSamplingScorer
+
+def _claim_all(path: str, worker: str, claimed):
+    """
+    Claims and completes jobs until none are left, reporting each claimed job id.
+    """
+    queue = open_queue(path=path)
+    while True:
+        job = queue.claim(worker=worker)
+        if job is None:
+            return
+        claimed.put((worker, job[0]))
+        queue.complete(job_id=job[0], result=job[1] * 2, worker=worker)
+
+# A SQLite queue file for workers on one host, and a queue directory for workers on several hosts sharing a filesystem
+BACKENDS = ['queue.sqlite', 'queue' + os.sep]
+
+def _grid() -> NetworkSamplerGrid:
+    """
+    Small grid of two networks, two samplers and two scorers.
+    """
+    graphs = [nx.barabasi_albert_graph(n=500, m=3, seed=seed) for seed in range(2)]
+    return NetworkSamplerGrid(graph_group=graphs,
+                                sampler_group=[CaterpillarQuotaWalkSampler(number_of_nodes=50), CaterpillarQuotaBFSSampler(number_of_nodes=50)],
+                                scorer_group=[NSMethod(func=NetworkSamplingScorer.degree_sum, params={}),
+                                                NSMethod(func=NetworkSamplingScorer.distance_variance, params={'start_node': 0})],
+                                sampler_names=['walk', 'bfs'],
+                                scorer_names=['degree_sum', 'distance_variance'])
+
+def test_open_queue_picks_backend(tmp_path):
+    """
+    Paths of directories open a DirectoryJobQueue, any other path a SQLite JobQueue.
+    """
+    assert type(open_queue(path=str(tmp_path / 'queue.sqlite'))) is JobQueue
+    assert type(open_queue(path=str(tmp_path / 'queue') + os.sep)) is DirectoryJobQueue
+    assert type(open_queue(path=str(tmp_path / 'queue'))) is DirectoryJobQueue  # now an existing directory
+
+@pytest.mark.parametrize('name', BACKENDS, ids=['sqlite', 'directory'])
+def test_each_job_claimed_once_across_processes(tmp_path, name):
+    """
+    Concurrent worker processes claim every job exactly once.
+    """
+    path = str(tmp_path / name)
+    queue = open_queue(path=path)
+    queue.put(payloads=range(200))
+    claimed = mp.Queue()
+    workers = [mp.Process(target=_claim_all, args=(path, f'worker-{idx}', claimed)) for idx in range(4)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    job_ids = [claimed.get()[1] for _ in range(200)]
+    assert sorted(job_ids) == list(range(1, 201))
+    assert claimed.empty()
+    assert queue.counts() == {'pending': 0, 'running': 0, 'done': 200, 'failed': 0}
+    assert sorted(result for _, result in queue.results()) == [2 * payload for payload in range(200)]
+
+@pytest.mark.parametrize('name', BACKENDS, ids=['sqlite', 'directory'])
+def test_only_current_owner_completes(tmp_path, name):
+    """
+    A worker whose lease was taken over can no longer complete or fail the job.
+    """
+    queue = open_queue(path=str(tmp_path / name), lease=0.0)
+    queue.put(payloads=['job'])
+    job_id, _ = queue.claim(worker='dead')
+    assert queue.claim(worker='alive')[0] == job_id  # lease of 'dead' has expired
+    assert not queue.complete(job_id=job_id, result='stale', worker='dead')
+    assert not queue.fail(job_id=job_id, error='stale', worker='dead')
+    assert queue.complete(job_id=job_id, result='fresh', worker='alive')
+    assert queue.results() == [('job', 'fresh')]
+
+@pytest.mark.parametrize('name', BACKENDS, ids=['sqlite', 'directory'])
+def test_queued_grid_matches_sample_by_graph(tmp_path, name):
+    """
+    Scores gathered from queue workers equal those of sample_by_graph.
+    """
+    grid = _grid()
+    results = grid.sample_all_graphs_queued(path=str(tmp_path / name), n_workers=3, start_node=0, n_trials=2)
+    columns = ['degree_sum', 'distance_variance', 'degree_sum Tuned Params', 'distance_variance Tuned Params']
+    for graph in grid.graph_group:
+        expected = grid.sample_by_graph(graph=graph, start_node=0, n_trials=2, trace_memory=False)
+        assert list(results[graph].columns) == list(expected.columns)
+        assert results[graph][columns].equals(expected[columns])
+
+@pytest.mark.parametrize('name', BACKENDS, ids=['sqlite', 'directory'])
+def test_resume_requeues_jobs_of_killed_workers(tmp_path, name):
+    """
+    Resuming a queue reruns jobs left running by a killed worker, so gather succeeds.
+    """
+    path = str(tmp_path / name)
+    grid = _grid()
+    queue = grid.enqueue(path=path, start_node=0)
+    queue.claim(worker='killed')  # left running forever without a lease
+    results = grid.sample_all_graphs_queued(path=path, n_workers=2, start_node=0)
+    assert queue.counts()['done'] == len(queue)
+    assert len(results) == len(grid.graph_group)
+
+def test_directory_queue_requeues_failed_jobs(tmp_path):
+    """
+    Failed jobs of a queue directory keep their error until requeued, and then run again.
+    """
+    queue = DirectoryJobQueue(path=str(tmp_path / 'queue'))
+    queue.put(payloads=['a', 'b'])
+    job_id, payload = queue.claim(worker='w')
+    assert queue.fail(job_id=job_id, error='boom', worker='w')
+    assert queue.errors() == [(payload, 'boom')]
+    assert queue.requeue_failed() == 1
+    assert queue.counts() == {'pending': 2, 'running': 0, 'done': 0, 'failed': 0}
+    while (job := queue.claim(worker='w')) is not None:
+        assert queue.complete(job_id=job[0], result=job[1].upper(), worker='w')
+    assert queue.results() == [('a', 'A'), ('b', 'B')]
@@ -0,0 +1,118 @@
+
+import json
+import networkx as nx
+import numpy as np
+import pytest
+
+import NetworkSampling
+from NetworkSampling import NSMethod, NetworkSampler, NetworkSamplerGrid, NetworkSamplerTuner, TunedSamplerRegistry, narrow_param_values
+from NetworkSamplingFunctions import CaterpillarQuotaBFSSampler, CaterpillarQuotaWalkSampler
+from NetworkSamplingScorer import NetworkSamplingScorer
+
+DEGREE_SUM = NSMethod(func=NetworkSamplingScorer.degree_sum, params={})
+
+def _shuffled_copy(graph: nx.Graph) -> nx.Graph:
+    """
+    Copy of graph with nodes and edges inserted in another order.
+    """
+    order = np.random.default_rng(seed=0).permutation(graph.number_of_nodes()).tolist()
+    copy = nx.Graph()
+    copy.add_nodes_from(order)
+    copy.add_edges_from((v, u) for u, v in reversed(list(graph.edges)))
+    return copy
+
+def test_registry_round_trip(tmp_path):
+    """
+    Records saved as JSON load back equal, with numpy values stored as builtins, and are found for any copy of the same network.
+    """
+    graph = nx.barabasi_albert_graph(n=300, m=3, seed=0)
+    path = str(tmp_path / 'registry' / 'tuned.json')
+    registry = TunedSamplerRegistry(path=path)
+    record = registry.put(sampler=CaterpillarQuotaWalkSampler(), graph=graph, scorer=DEGREE_SUM,
+                            params={'q1': np.float64(0.25), 'q2': 0.75}, score=np.int64(42))
+    with open(file=path, mode='r') as f:
+        assert json.load(fp=f)[0]['params'] == {'q1': 0.25, 'q2': 0.75}
+
+    loaded = TunedSamplerRegistry(path=path)
+    assert len(loaded) == 1
+    assert loaded.get(sampler=CaterpillarQuotaWalkSampler, graph=_shuffled_copy(graph=graph), scorer=DEGREE_SUM) == record
+    assert loaded.get(sampler=CaterpillarQuotaBFSSampler(), graph=graph, scorer=DEGREE_SUM) is None
+    assert loaded.get(sampler=CaterpillarQuotaWalkSampler(), graph=nx.barabasi_albert_graph(n=300, m=3, seed=1), scorer=DEGREE_SUM) is None
+    assert loaded.get(sampler=CaterpillarQuotaWalkSampler(), graph=graph,
+                        scorer=NSMethod(func=NetworkSamplingScorer.accuracy, params={'targets': [1, 2]})) is None
+
+    sampler = record.apply(sampler=CaterpillarQuotaWalkSampler(q1=0.5, q2=0.5))
+    assert (sampler.q1, sampler.q2) == (0.25, 0.75)
+    with pytest.raises(TypeError):
+        record.apply(sampler=CaterpillarQuotaBFSSampler())
+    with pytest.raises(ValueError):
+        TunedSamplerRegistry().save()
+
+def test_grid_reuses_registry_across_runs(tmp_path, monkeypatch):
+    """
+    A grid given a registry file from an earlier run applies its tuned values instead of tuning again.
+    """
+    graph = nx.barabasi_albert_graph(n=300, m=3, seed=0)
+    path = str(tmp_path / 'tuned.json')
+
+    def run(registry: TunedSamplerRegistry):
+        grid = NetworkSamplerGrid(graph_group=[graph],
+                                    sampler_group=[CaterpillarQuotaWalkSampler(number_of_nodes=40, q2=0.9)],
+                                    scorer_group=[DEGREE_SUM],
+                                    sampler_names=['walk'],
+                                    scorer_names=['degree_sum'],
+                                    registry=registry)
+        grid.set_tuner(tuned_params=[{'q1': [0.1, 0.3, 0.5]}])
+        return grid.sample_by_graph(graph=graph, start_node=0, trace_memory=False)
+
+    first = run(registry=TunedSamplerRegistry(path=path))
+    monkeypatch.setattr(NetworkSampling.NetworkSamplerTuner, 'tune_single', lambda *args, **kwargs: pytest.fail('re-tuned'))
+    second = run(registry=TunedSamplerRegistry(path=path))
+    assert second.loc['walk', 'degree_sum Tuned Params'] == first.loc['walk', 'degree_sum Tuned Params']
+    assert first.loc['walk', 'degree_sum Tuned Params']['q1'] in [0.1, 0.3, 0.5]
+
+def test_narrow_intervals():
+    """
+    Intervals shrink to span the priors plus a margin, within the original bounds, even for priors outside them.
+    """
+    assert narrow_param_values(param_values=(0.0, 1.0), priors=[0.4, 0.5]) == pytest.approx((0.15, 0.75))
+    assert narrow_param_values(param_values=(0.0, 1.0), priors=[0.95]) == pytest.approx((0.7, 1.0))
+    assert narrow_param_values(param_values=(0.2, 0.6), priors=[0.9, 1.5]) == pytest.approx((0.5, 0.6))
+    assert narrow_param_values(param_values=(0, 100), priors=[33], int_only=True) == (8, 58)
+    assert narrow_param_values(param_values=(0.0, 1.0), priors=[None]) == (0.0, 1.0)
+    lower, upper = narrow_param_values(param_values=(0.0, 1.0), priors=[0.5])  # registry values are builtins, and so are the bounds
+    assert type(lower) is float and type(upper) is float
+
+def test_narrow_discrete_values():
+    """
+    Discrete values keep the values nearest each prior and their neighbours; non-numeric values keep only the priors.
+    """
+    assert narrow_param_values(param_values=[0.9, 0.1, 0.5, 0.3, 0.7], priors=[0.32]) == [0.1, 0.3, 0.5]
+    assert narrow_param_values(param_values=[1, 2, 3, 4, 5, 6, 7, 8], priors=[1, 8]) == [1, 2, 7, 8]
+    assert narrow_param_values(param_values=['uniform', 'degree', 'non_backtracking'], priors=['degree']) == ['degree']
+    assert narrow_param_values(param_values=['uniform', 'degree'], priors=['other']) == ['uniform', 'degree']
+
+def test_warm_start_from_similar_networks():
+    """
+    Search regions narrow around values tuned on structurally similar networks for the same sampler class and metric, matching scorers
+    across parent networks, and stay unchanged without a similar record.
+    """
+    graph = nx.barabasi_albert_graph(n=1000, m=3, seed=0)
+    similar = nx.barabasi_albert_graph(n=1100, m=3, seed=1)
+    different = nx.path_graph(n=50)
+    clustering = lambda parent: NSMethod(func=NetworkSamplingScorer.clustering, params={'parent': parent})
+
+    registry = TunedSamplerRegistry()
+    registry.put(sampler=CaterpillarQuotaWalkSampler, graph=similar, scorer=clustering(parent=similar), params={'q1': 0.4}, score=1.0)
+    registry.put(sampler=CaterpillarQuotaWalkSampler, graph=different, scorer=clustering(parent=different), params={'q1': 0.9}, score=1.0)
+    registry.put(sampler=CaterpillarQuotaBFSSampler, graph=similar, scorer=clustering(parent=similar), params={'q1': 0.1}, score=1.0)
+    assert [tuned.params for tuned in registry.similar(sampler=CaterpillarQuotaWalkSampler(), graph=graph, scorer=clustering(parent=graph))] == [{'q1': 0.4}]
+
+    tuner = NetworkSamplerTuner(nssampler=NetworkSampler(sampler=CaterpillarQuotaWalkSampler(), scorer=clustering(parent=graph)),
+                                graph=graph, start_node=0, registry=registry)
+    assert tuner.warm_start_values(param_name='q1', param_values=(0.0, 1.0)) == pytest.approx((0.15, 0.65))
+    assert tuner.warm_start_values(param_name='q2', param_values=(0.0, 1.0)) == (0.0, 1.0)
+
+    tuner = NetworkSamplerTuner(nssampler=NetworkSampler(sampler=CaterpillarQuotaWalkSampler(), scorer=DEGREE_SUM),
+                                graph=graph, start_node=0, registry=registry)
+    assert tuner.warm_start_values(param_name='q1', param_values=(0.0, 1.0)) == (0.0, 1.0)
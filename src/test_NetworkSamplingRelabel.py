@@ -0,0 +1,73 @@
+
+import networkx as nx
+import numpy as np
+import pytest
+
+from NetworkSamplingCSR import CSRGraph
+from NetworkSamplingDynamic import invalidate_graph_caches
+from NetworkSamplingRelabel import RelabelIndex, relabel_index
+
+def _csr_edges(index: RelabelIndex, graph: nx.Graph) -> set:
+    """
+    Edges of the index's CSR copy of graph, mapped back to the original node ids.
+    """
+    edges = index.csr(graph=graph).to_networkx().edges
+    return set(frozenset(index.to_ids(labels=[u, v]).tolist()) for u, v in edges)
+
+@pytest.mark.parametrize('relabel', [lambda n: f'user-{n}', lambda n: 7 * n + 3, lambda n: (n % 10, n // 10)], ids=['str', 'sparse', 'tuple'])
+def test_round_trip(relabel):
+    """
+    Node ids map to 0..n-1 and back unchanged, and the CSR copy has the graph's edges.
+    """
+    graph = nx.relabel_nodes(nx.watts_strogatz_graph(n=300, k=4, p=0.2, seed=0), {n: relabel(n) for n in range(300)})
+    index = relabel_index(graph=graph)
+    assert not index.is_identity and relabel_index(graph=graph) is index
+    nodes = list(graph.nodes)
+    labels = index.to_int(nodes=nodes)
+    assert sorted(labels.tolist()) == list(range(300))
+    assert index.to_ids(labels=labels).tolist() == nodes
+    assert all(index.to_ids(labels=index.to_int(nodes=n)) == n for n in nodes[:20])
+    assert _csr_edges(index=index, graph=graph) == set(map(frozenset, graph.edges))
+    with pytest.raises(KeyError):
+        index.to_int(nodes=[nodes[0], relabel(1000)])
+
+def test_identity_index():
+    """
+    Graphs labeled 0..n-1 in any order, and CSR graphs, get an identity index whose CSR copy is the graph itself for a CSRGraph.
+    """
+    graph = nx.relabel_nodes(nx.path_graph(n=50), {n: 49 - n for n in range(50)})
+    assert relabel_index(graph=graph).is_identity
+    csr = CSRGraph.from_networkx(graph=nx.path_graph(n=50))
+    index = relabel_index(graph=csr)
+    assert index.is_identity and index.csr(graph=csr) is csr
+    with pytest.raises(ValueError):
+        RelabelIndex(ids=np.asarray([3, 1, 3]))
+
+def test_rebuilt_after_edge_edits():
+    """
+    The cached index and its CSR copy are rebuilt once edges are added or removed, and after invalidate_graph_caches for edits that
+    keep the number of edges.
+    """
+    graph = nx.relabel_nodes(nx.cycle_graph(n=100), {n: f'n{n}' for n in range(100)})
+    index = relabel_index(graph=graph)
+    index.csr(graph=graph)
+
+    graph.add_edge('n0', 'n50')
+    index = relabel_index(graph=graph)
+    assert _csr_edges(index=index, graph=graph) == set(map(frozenset, graph.edges))
+
+    graph.remove_edge('n0', 'n50')
+    graph.remove_edge('n1', 'n2')
+    index = relabel_index(graph=graph)
+    assert _csr_edges(index=index, graph=graph) == set(map(frozenset, graph.edges))
+
+    graph.add_node('new')
+    index = relabel_index(graph=graph)
+    assert 'new' in index and index.number_of_nodes() == 101
+
+    graph.remove_edge('n3', 'n4')
+    graph.add_edge('n3', 'n60')  # same number of edges: not detected until invalidated
+    assert relabel_index(graph=graph) is index
+    invalidate_graph_caches(graph=graph)
+    index = relabel_index(graph=graph)
+    assert _csr_edges(index=index, graph=graph) == set(map(frozenset, graph.edges))
@@ -0,0 +1,45 @@
+
+from collections import OrderedDict
+import networkx as nx
+
+import NetworkSamplingFingerprint
+import NetworkSamplingScorer as scorer_module
+import NetworkSamplingStructure
+from NetworkSampling import NSMethod, NetworkSamplerGrid
+from NetworkSamplingFunctions import CaterpillarQuotaWalkSampler
+from NetworkSamplingScorer import NetworkSamplingScorer
+
+def _counted(func, path: str, kind: str):
+    """
+    Wraps func so every call appends kind to a file, which pool workers forked from the test process share.
+    """
+    def wrapper(*args, **kwargs):
+        with open(file=path, mode='a') as f:
+            f.write(kind + '\n')
+        return func(*args, **kwargs)
+    return wrapper
+
+def test_parent_statistics_computed_once_across_pooled_trials(tmp_path, monkeypatch):
+    """
+    Every statistic of the parent network is computed once for all trials of a pooled grid run, not once per trial.
+    """
+    path = str(tmp_path / 'calls.txt')
+    monkeypatch.setattr(NetworkSamplingFingerprint, '_parent_statistics', OrderedDict())
+    monkeypatch.setattr(NetworkSamplingStructure, 'top_eigenvalues', _counted(NetworkSamplingStructure.top_eigenvalues, path, 'spectrum'))
+    monkeypatch.setattr(NetworkSamplingStructure, 'clustering_summary', _counted(NetworkSamplingStructure.clustering_summary, path, 'clustering'))
+    monkeypatch.setattr(scorer_module, 'stationary_distribution', _counted(scorer_module.stationary_distribution, path, 'visits'))
+
+    graph = nx.barabasi_albert_graph(n=600, m=3, seed=0)
+    grid = NetworkSamplerGrid(graph_group=[graph],
+                                sampler_group=[CaterpillarQuotaWalkSampler(number_of_nodes=60, q1=0.3, q2=0.6)],
+                                scorer_group=[NSMethod(func=NetworkSamplingScorer.spectral_similarity, params={'parent': graph, 'k': 5}),
+                                                NSMethod(func=NetworkSamplingScorer.clustering, params={'parent': graph}),
+                                                NSMethod(func=NetworkSamplingScorer.visit_frequency_coverage, params={'parent': graph})],
+                                sampler_names=['walk'],
+                                scorer_names=['spectral', 'clustering', 'coverage'])
+    df = grid.sample_by_graph(graph=graph, start_node=0, n_trials=6, trace_memory=False)
+
+    with open(file=path, mode='r') as f:
+        calls = f.read().split()
+    assert sorted(calls) == ['clustering', 'spectrum', 'visits']
+    assert 0.0 < df.loc['walk', 'spectral'] <= 1.0
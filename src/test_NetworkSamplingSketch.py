@@ -0,0 +1,71 @@
+
+import numpy as np
+import pytest
+
+from NetworkSamplingBenchmarks import benchmark_graph
+from NetworkSamplingFunctions import MultiWalkerSampler
+from NetworkSamplingSketch import CountMinSketch, VisitSketch
+
+def _zipf_keys(size: int, seed: int) -> np.ndarray:
+    """
+    Heavy-tailed keys, as visits of a random walk on a scale-free graph.
+    """
+    return np.random.default_rng(seed=seed).zipf(a=1.3, size=size) % 100000
+
+def test_count_min_error_bound():
+    """
+    Estimates never undercount, and overcount by more than epsilon * total for at most a delta share of keys.
+    """
+    epsilon, delta = 0.001, 0.01
+    cms = CountMinSketch.from_error(epsilon=epsilon, delta=delta, seed=0)
+    assert cms.epsilon <= epsilon and cms.depth >= np.log(1.0 / delta)
+
+    keys = _zipf_keys(size=200000, seed=0)
+    cms.update(keys=keys[:100000])
+    cms.update(keys=keys[100000:], counts=np.ones(shape=(100000,), dtype=np.int64))
+    assert cms.total == keys.size
+
+    distinct, counts = np.unique(keys, return_counts=True)
+    overcount = cms.query(keys=distinct) - counts
+    assert overcount.min() >= 0
+    assert np.mean(overcount > cms.epsilon * cms.total) <= delta
+
+def test_count_min_invalid_size():
+    """
+    Non-positive width or depth raises ValueError.
+    """
+    with pytest.raises(ValueError):
+        CountMinSketch(width=0)
+    with pytest.raises(ValueError):
+        CountMinSketch(depth=0)
+
+def test_visit_sketch_top_k():
+    """
+    The tracked top-k are the k most visited nodes up to the sketch error, ranked by estimate, and memory does not grow with the stream.
+    """
+    sketch = VisitSketch(k=20, width=2 ** 12, depth=5, seed=0)
+    keys = _zipf_keys(size=300000, seed=1)
+    for batch in np.array_split(keys, 300):
+        sketch.update(nodes=batch)
+    assert sketch.total == keys.size and sketch._top_nodes.size == 20
+
+    distinct, counts = np.unique(keys, return_counts=True)
+    true_counts = dict(zip(distinct.tolist(), counts.tolist()))
+    top = sketch.top()
+    assert list(top.values()) == sorted(top.values(), reverse=True)
+    assert all(true_counts[n] <= estimate <= true_counts[n] + sketch.error_bound() for n, estimate in top.items())
+    kth_count = np.sort(counts)[-20]
+    assert all(true_counts[n] >= kth_count - sketch.error_bound() for n in top)
+    assert list(sketch.top(k=5)) == list(top)[:5]
+    assert np.isclose(sketch.frequency(nodes=list(top)[:1])[0], top[list(top)[0]] / keys.size)
+
+def test_sketched_walk_matches_exact_counts():
+    """
+    MultiWalkerSampler with visit_accounting='sketch' finds the most visited nodes of the exact counts.
+    """
+    graph = benchmark_graph(model='ba', params={'n': 5000, 'm': 3}, seed=0)
+    exact = MultiWalkerSampler(n_walkers=200, seed=0).walk(graph=graph, start_node=0, n_steps=200)
+    sketch = MultiWalkerSampler(n_walkers=200, seed=0, visit_accounting='sketch', sketch_params={'k': 10}).walk(graph=graph, start_node=0, n_steps=200)
+    assert sketch.total == exact.sum()
+    assert all(exact[n] <= estimate <= exact[n] + sketch.error_bound() for n, estimate in sketch.top().items())
+    assert set(np.argsort(-exact)[:3].tolist()) <= set(sketch.top())
@@ -0,0 +1,24 @@
+
+import networkx as nx
+
+from NetworkSampling import NSMethod, NetworkSamplerGrid
+from NetworkSamplingFunctions import CaterpillarQuotaWalkSampler
+from NetworkSamplingScorer import NetworkSamplingScorer
+
+def test_grid_tunes_with_gp_search():
+    """
+    A grid set up with tune_method='gp' tunes every sampler within tune_budget and reports the tuned values.
+    """
+    graph = nx.barabasi_albert_graph(n=300, m=3, seed=0)
+    grid = NetworkSamplerGrid(graph_group=[graph],
+                                sampler_group=[CaterpillarQuotaWalkSampler(number_of_nodes=40)],
+                                scorer_group=[NSMethod(func=NetworkSamplingScorer.degree_sum, params={})],
+                                sampler_names=['walk'],
+                                scorer_names=['degree_sum'])
+    grid.set_tuner(tuned_params=[{'q1': (0.05, 0.5), 'q2': (0.1, 0.9)}], tune_method='gp', tune_budget=6)
+    assert grid.tune_method == 'gp' and grid.tune_budget == 6
+
+    df = grid.sample_by_graph(graph=graph, start_node=0, trace_memory=False)
+    params = df.loc['walk', 'degree_sum Tuned Params']
+    assert set(params) == {'q1', 'q2'}
+    assert 0.05 <= params['q1'] <= 0.5 and 0.1 <= params['q2'] <= 0.9